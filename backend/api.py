@@ -1,18 +1,47 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Body, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.routing import APIRoute
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 import json
 import os
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 import logging
+import sys
 import re
 import asyncio
-from typing import Dict, Any, List
+import base64
+import functools
+import hashlib
+import heapq
+import hmac
+import inspect
+import mmap
+import struct
+import time
+import tracemalloc
+import zlib
+from collections import deque
+from contextvars import ContextVar
+from array import array
+from bisect import bisect_left, bisect_right, insort
+import itertools
+import math
+from typing import Dict, Any, List, Optional, Tuple, Union
 import urllib.parse
 import requests
 from bs4 import BeautifulSoup
 import random  # Add random module import
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-worker lock, so every worker refreshes for itself
+    fcntl = None
+try:
+    import resource
+except ImportError:  # Windows: /admin/memory reports no peak RSS
+    resource = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +67,13 @@ UPSTREAM_DATA_BASE_URL = (
 ).rstrip("/")
 CURRENT_YEAR_SYNC_MAX_AGE_HOURS = int(os.getenv("CURRENT_YEAR_SYNC_MAX_AGE_HOURS", "6"))
 UPSTREAM_PROXY_TOKEN = os.getenv("UPSTREAM_PROXY_TOKEN", "").strip()
+# Prebuilt bundle written by build_data_bundle.py at deploy time. Missing or stale
+# segments fall back to parsing the raw feed files.
+DATA_BUNDLE_PATH = Path(os.getenv("DATA_BUNDLE_PATH", "data/bundle/menaxa.bundle"))
+# For multi-worker deployments: only the worker holding the lock file syncs upstream and
+# republishes the bundle; the others re-attach it read-only.
+SHARED_REFRESH = env_bool("SHARED_REFRESH", False)
+REFRESH_LEADER_LOCK_PATH = Path(os.getenv("REFRESH_LEADER_LOCK_PATH", str(DATA_BUNDLE_PATH.with_name("refresh.lock"))))
 
 
 def get_feed_root_dir() -> Path:
@@ -73,7 +109,9 @@ eol_cache: Dict[str, Any] = {
 leaks_cache: Dict[str, Any] = {
     "data": None,
     "last_updated": None,
-    "last_file": None
+    "last_file": None,
+    # file_version of the leak.json that data came from
+    "source_version": None
 }
 
 # Global cache for news data
@@ -90,6 +128,15 @@ phishing_cache: Dict[str, Any] = {
     "last_file": None
 }
 
+# Hosts from the scam DB, collected phishing URLs and leak records (see DomainTable)
+domain_reputation_cache: Dict[str, Any] = {
+    "table": None,
+    "last_updated": None,
+    "total_records": None,
+    "sources": {},
+    "source_tokens": None
+}
+
 # Global cache for CVE data
 cve_cache: Dict[str, Any] = {
     "data": None,
@@ -101,6 +148,14 @@ cve_cache: Dict[str, Any] = {
 cve_year_cache: Dict[str, List[Dict[str, Any]]] = {}
 cve_year_cache_order: List[str] = []
 MAX_CVE_YEARS_IN_MEMORY = 2
+# file_version() of each year file as it was when its parsed list was cached (either mode).
+cve_year_versions: Dict[str, Tuple[int, int]] = {}
+# Last synced copy of a year, for diffing the next sync: "version" is the file_version()
+# it was written as, "items" maps cve_id -> (lastModifiedDate, sort key).
+cve_year_snapshots: Dict[str, Dict[str, Any]] = {}
+
+# Per-year CVE rollups, mirrored on disk as cve/<year>.summary.json next to each year file.
+cve_summary_cache: Dict[str, Dict[str, Any]] = {}
 
 # Global cache for Web3 releases data
 web3_releases_cache: Dict[str, Any] = {
@@ -109,6 +164,293 @@ web3_releases_cache: Dict[str, Any] = {
     "last_file": None
 }
 
+# Memory-mapped prebuilt data bundle (see build_data_bundle.py)
+data_bundle: Dict[str, Any] = {
+    "mmap": None,
+    "header": None,
+    "file_version": None,
+    "disabled": False
+}
+
+DATA_BUNDLE_MAGIC = b"MNXBNDL1"
+DATA_BUNDLE_FORMAT_VERSION = 2
+# Trailer at the end of the bundle: header offset, header length, magic.
+DATA_BUNDLE_TRAILER = struct.Struct("<QI8s")
+# Bundles built by a different api.py are ignored, since normalization may have changed.
+DATA_BUNDLE_CODE_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label value, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self.series: Dict[str, List[float]] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        # Layout: one counter per bucket, then +Inf count, then sum.
+        series = self.series.get(label_value)
+        if series is None:
+            series = self.series[label_value] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_value, series in sorted(self.series.items()):
+            label = f'{self.label}="{prometheus_escape(label_value)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += int(count)
+                lines.append(f'{self.name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+            cumulative += int(series[-2])
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {series[-1]!r}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+
+def prometheus_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REQUEST_LATENCY = Histogram(
+    "menaxa_request_duration_seconds", "Request latency by route template.", "route",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSE_SIZE = Histogram(
+    "menaxa_response_size_bytes", "Response body size by route template.", "route",
+    (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+REFRESH_DURATION = Histogram(
+    "menaxa_refresh_duration_seconds", "Feed refresh duration.", "feed",
+    (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120),
+)
+# Last refresh per feed: records held afterwards and size of the source files it parsed.
+refresh_gauges: Dict[str, Dict[str, int]] = {}
+# (cache, event) -> count, event being hit / miss / eviction.
+cache_events: Dict[Tuple[str, str], int] = {}
+cve_year_bytes_parsed = {"total": 0}
+
+
+def count_cache_event(cache: str, event: str) -> None:
+    cache_events[(cache, event)] = cache_events.get((cache, event), 0) + 1
+
+
+def instrument_refresh(feed: str, cache: Dict[str, Any], source_files=None):
+    """
+    Time a refresh_* coroutine and record what it left in its cache.
+
+    Source size is taken from cache["last_file"] unless source_files() lists the files.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            spans: Dict[str, List[float]] = {}
+            token = current_trace.set(spans if TRACE_ENABLED else None)
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                current_trace.reset(token)
+                write_trace("refresh", feed, elapsed, spans)
+                REFRESH_DURATION.observe(feed, elapsed)
+                data = cache.get("data")
+                records = len(data) if isinstance(data, (list, dict)) and feed != "cves" else cache.get("total_records") or 0
+                try:
+                    files = source_files() if source_files else [cache["last_file"]] if cache.get("last_file") else []
+                    source_bytes = sum(Path(f).stat().st_size for f in files)
+                except (OSError, HTTPException):
+                    source_bytes = 0
+                refresh_gauges[feed] = {"records": records, "source_bytes": source_bytes}
+        return wrapper
+    return decorator
+
+
+def process_rss_bytes() -> Tuple[int, int]:
+    """Current and peak resident set size; current falls back to peak off Linux (0 without resource)."""
+    peak = 0
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"), peak
+    except (OSError, ValueError, IndexError):
+        return peak, peak
+
+
+class MetricsMiddleware:
+    """ASGI middleware observing latency and body size per matched route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = {"bytes": 0, "event_stream": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                content_type = dict(message.get("headers") or []).get(b"content-type", b"")
+                state["event_stream"] = content_type.startswith(b"text/event-stream")
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Long-lived SSE connections would only skew the latency histogram.
+            if not state["event_stream"]:
+                route = scope.get("route")
+                route_name = getattr(route, "path", None) or "unmatched"
+                REQUEST_LATENCY.observe(route_name, time.perf_counter() - started)
+                RESPONSE_SIZE.observe(route_name, state["bytes"])
+
+
+app.add_middleware(MetricsMiddleware)
+
+
+TRACE_ENABLED = env_bool("TRACE_ENABLED", True)
+# When set, every traced request and refresh is appended there as one JSON line.
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH")
+
+# Span name -> [total seconds, calls] for the request or refresh being handled.
+current_trace: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("current_trace", default=None)
+
+trace_logger = logging.getLogger(f"{__name__}.trace")
+if TRACE_LOG_PATH:
+    trace_handler = logging.FileHandler(TRACE_LOG_PATH, encoding="utf-8")
+    trace_handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_logger.addHandler(trace_handler)
+    trace_logger.setLevel(logging.INFO)
+    trace_logger.propagate = False
+
+
+class trace_span:
+    """Accumulate the duration of a block into the active trace; a no-op outside one."""
+
+    __slots__ = ("name", "trace", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = current_trace.get()
+        if self.trace is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.trace is not None:
+            entry = self.trace.get(self.name)
+            if entry is None:
+                entry = self.trace[self.name] = [0.0, 0]
+            entry[0] += time.perf_counter() - self.started
+            entry[1] += 1
+        return False
+
+
+def traced(name: str):
+    """Run a sync function inside trace_span(name)."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def write_trace(kind: str, name: str, total: float, spans: Dict[str, List[float]]) -> None:
+    if not TRACE_LOG_PATH:
+        return
+    trace_logger.info(json.dumps({
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "kind": kind,
+        "name": name,
+        "total_ms": round(total * 1000, 3),
+        "spans": {span: {"ms": round(d * 1000, 3), "calls": n} for span, (d, n) in spans.items()},
+    }, separators=(",", ":")))
+
+
+class TracedRoute(APIRoute):
+    """
+    Splits a request into the endpoint body and what FastAPI does around it.
+
+    "endpoint" covers the endpoint function, "route" also covers parameter parsing and
+    response serialization; the middleware reports the difference as "serialize".
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if TRACE_ENABLED and asyncio.iscoroutinefunction(endpoint):
+            original = endpoint
+
+            @functools.wraps(original)
+            async def endpoint(*args, **kw):
+                with trace_span("endpoint"):
+                    return await original(*args, **kw)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            with trace_span("route"):
+                return await handler(request)
+        return traced_handler
+
+
+app.router.route_class = TracedRoute
+
+
+class TracingMiddleware:
+    """ASGI middleware adding a Server-Timing header built from the request's spans."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        spans: Dict[str, List[float]] = {}
+        token = current_trace.set(spans)
+        started = time.perf_counter()
+        state = {"total": None}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                total = state["total"] = time.perf_counter() - started
+                timings = dict(spans)
+                if "route" in timings and "endpoint" in timings:
+                    timings["serialize"] = [max(0.0, timings.pop("route")[0] - timings["endpoint"][0]), 1]
+                timings["total"] = [total, 1]
+                header = ", ".join(f"{name};dur={d * 1000:.2f}" for name, (d, _) in timings.items())
+                message = {**message, "headers": list(message.get("headers") or []) + [(b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            route = scope.get("route")
+            if state["total"] is not None:
+                write_trace("request", getattr(route, "path", None) or scope.get("path", ""), state["total"], spans)
+
+
+app.add_middleware(TracingMiddleware)
+
 def parse_description(description):
     """Parse HTML description and extract specific sections"""
     if not description:
@@ -149,6 +491,702 @@ def parse_news_datetime(value: Any) -> datetime | None:
     except Exception:
         return None
 
+
+def encode_json(content: Any) -> bytes:
+    """Encode content exactly like FastAPI's default JSONResponse."""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def file_version(path: Path) -> Tuple[int, int]:
+    """Cheap change token for a source file: (mtime_ns, size)."""
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def get_data_bundle() -> Optional[Dict[str, Any]]:
+    """Return the memory-mapped bundle, (re)opening it when the file on disk changed."""
+    if data_bundle["disabled"]:
+        return None
+    try:
+        if not DATA_BUNDLE_PATH.exists():
+            data_bundle["mmap"] = None
+            data_bundle["header"] = None
+            data_bundle["file_version"] = None
+            return None
+
+        version = file_version(DATA_BUNDLE_PATH)
+        if data_bundle["file_version"] == version:
+            return data_bundle if data_bundle["mmap"] is not None else None
+
+        # Remember rejected files too, so an unusable bundle is only inspected once.
+        data_bundle["mmap"] = None
+        data_bundle["header"] = None
+        data_bundle["file_version"] = version
+
+        with open(DATA_BUNDLE_PATH, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        trailer_start = len(mm) - DATA_BUNDLE_TRAILER.size
+        if trailer_start < len(DATA_BUNDLE_MAGIC) or mm[:len(DATA_BUNDLE_MAGIC)] != DATA_BUNDLE_MAGIC:
+            logger.warning(f"Ignoring data bundle with invalid magic: {DATA_BUNDLE_PATH}")
+            return None
+        header_offset, header_length, magic = DATA_BUNDLE_TRAILER.unpack(mm[trailer_start:])
+        if magic != DATA_BUNDLE_MAGIC:
+            logger.warning(f"Ignoring truncated data bundle: {DATA_BUNDLE_PATH}")
+            return None
+
+        header = json.loads(mm[header_offset:header_offset + header_length])
+        if header.get("format") != DATA_BUNDLE_FORMAT_VERSION or header.get("code_version") != DATA_BUNDLE_CODE_VERSION:
+            logger.info("Data bundle was built by a different backend version; using raw feed files")
+            return None
+
+        # Old mappings are released once no cached view references them anymore.
+        data_bundle["mmap"] = mm
+        data_bundle["header"] = header
+        logger.info(
+            f"Attached data bundle {header.get('bundle_version')} "
+            f"({len(header.get('segments', {}))} segments, built {header.get('built_at')})"
+        )
+        return data_bundle
+    except Exception as e:
+        logger.warning(f"Could not open data bundle {DATA_BUNDLE_PATH}: {str(e)}")
+        return None
+
+
+def bundle_segment_info(name: str, source: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Segment metadata when the bundle holds it and it was built from the current source file."""
+    bundle = get_data_bundle()
+    if bundle is None:
+        return None
+    info = bundle["header"]["segments"].get(name)
+    if info is None:
+        return None
+    # Segments that drop future-dated items go stale once the first of them is due.
+    if info.get("fresh_until") is not None and time.time() >= info["fresh_until"]:
+        return None
+    if source is not None:
+        try:
+            if list(file_version(source)) != info.get("source_version"):
+                return None
+        except OSError:
+            return None
+    return info
+
+
+def bundle_segment(name: str, source: Optional[Path] = None) -> Optional[memoryview]:
+    """Zero-copy view of a fresh bundle segment, or None."""
+    info = bundle_segment_info(name, source)
+    if info is None:
+        return None
+    start = info["offset"]
+    return memoryview(data_bundle["mmap"])[start:start + info["length"]]
+
+
+class BundleRecords:
+    """
+    Read-only record list over encoded records in a bundle segment. Record i spans
+    buffer[offsets[i]:offsets[i + 1] - 1] (one separator byte follows every record)
+    and is decoded on access, so the records themselves stay in the shared mapping.
+    """
+
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, buffer: memoryview, offsets: memoryview):
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, position: int) -> memoryview:
+        return self.buffer[self.offsets[position]:self.offsets[position + 1] - 1]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("record position out of range")
+        return json.loads(bytes(self.raw(position)))
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+
+class BundleStrings:
+    """Read-only list of strings stored as one UTF-8 blob plus n + 1 start offsets."""
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        return str(self.blob[self.offsets[position]:self.offsets[position + 1]], "utf-8")
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+
+class BundlePostings:
+    """term -> posting list lookups over a sorted term list and one concatenated uint32 blob."""
+
+    __slots__ = ("terms", "starts", "postings")
+
+    def __init__(self, terms: BundleStrings, starts: memoryview, postings: memoryview):
+        self.terms = terms
+        self.starts = starts
+        self.postings = postings
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def get(self, term: str, default: Any = None) -> Any:
+        i = bisect_left(self.terms, term)
+        if i == len(self.terms) or self.terms[i] != term:
+            return default
+        return self.postings[self.starts[i]:self.starts[i + 1]]
+
+
+def bundle_array_tree(layout: Any, buffer: memoryview) -> Any:
+    """
+    Rebuild the structure written by bundle_array_layout as zero-copy views: leaves
+    ["I"|"d"|"Q"|"B", offset, count] become typed memoryviews, ["s", ...] leaves
+    BundleStrings, other lists tuples and dicts dicts.
+    """
+    if isinstance(layout, dict):
+        return {key: bundle_array_tree(value, buffer) for key, value in layout.items()}
+    if layout and isinstance(layout[0], str):
+        if layout[0] == "s":
+            _, blob_offset, blob_length, offsets_offset, count = layout
+            return BundleStrings(
+                buffer[blob_offset:blob_offset + blob_length],
+                buffer[offsets_offset:offsets_offset + 4 * (count + 1)].cast("I")
+            )
+        typecode, offset, count = layout
+        itemsize = array(typecode).itemsize
+        return buffer[offset:offset + itemsize * count].cast(typecode)
+    return tuple(bundle_array_tree(item, buffer) for item in layout)
+
+
+def bundle_array_layout(tree: Any, out: bytearray) -> Any:
+    """
+    Append every array of tree (dicts, tuples, arrays and lists of strings) to out,
+    8-byte aligned, and return the JSON layout bundle_array_tree reads back.
+    """
+    def align():
+        out.extend(b"\0" * (-len(out) % 8))
+
+    if isinstance(tree, dict):
+        return {str(key): bundle_array_layout(value, out) for key, value in tree.items()}
+    if isinstance(tree, tuple):
+        return [bundle_array_layout(item, out) for item in tree]
+    if isinstance(tree, (array, memoryview)):
+        values = tree if isinstance(tree, array) else array(tree.format, tree)
+        align()
+        leaf = [values.typecode, len(out), len(values)]
+        out.extend(values.tobytes())
+        return leaf
+    # Anything else is a sequence of strings.
+    encoded = [str(item).encode("utf-8") for item in tree]
+    offsets = array("I", [0])
+    for item in encoded:
+        offsets.append(offsets[-1] + len(item))
+    align()
+    blob_offset = len(out)
+    out.extend(b"".join(encoded))
+    align()
+    offsets_offset = len(out)
+    out.extend(offsets.tobytes())
+    return ["s", blob_offset, offsets[-1], offsets_offset, len(encoded)]
+
+
+def encode_bundle_records(records: Any, prefix: bytes, suffix: bytes) -> Tuple[bytes, array]:
+    """prefix + comma-joined encoded records + suffix, with BundleRecords offsets into it."""
+    parts = [encode_json(record) for record in records]
+    offsets = array("I")
+    position = len(prefix)
+    for part in parts:
+        offsets.append(position)
+        position += len(part) + 1
+    offsets.append(position)
+    return prefix + b",".join(parts) + suffix, offsets
+
+
+def encode_bundle_feed(head: Dict[str, Any], records: Any) -> Tuple[bytes, array]:
+    """Full-feed response body ({**head, "data": [...]}) with record offsets."""
+    return encode_bundle_records(records, encode_json(head)[:-1] + b',"data":[', b"]}")
+
+
+def bundle_derived(name: str, source: Optional[Path] = None) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Precomputed structures of segment name (see build_data_bundle) and their JSON metadata."""
+    derived = bundle_segment(f"{name}/derived", source)
+    if derived is None:
+        return None
+    info = data_bundle["header"]["segments"][f"{name}/derived"]
+    return bundle_array_tree(info["layout"], derived), info.get("meta", {})
+
+
+def bundle_feed(name: str, source: Path) -> Optional[Dict[str, Any]]:
+    """
+    A list feed straight from the bundle: the pre-encoded full response, lazily
+    decoded records and every precomputed structure, all backed by the mapping.
+    """
+    body = bundle_segment(name, source)
+    derived = bundle_derived(name, source)
+    if body is None or derived is None:
+        return None
+    tree, meta = derived
+    records = BundleRecords(body, tree.pop("offsets"))
+    feed = {"body": body, "records": records, "meta": meta, **tree}
+    if "search" in tree:
+        feed["search"] = bundle_search_index(tree["search"], records)
+    return feed
+
+
+def bundle_postings(tree: Dict[str, Any]) -> BundlePostings:
+    return BundlePostings(tree["terms"], tree["starts"], tree["postings"])
+
+
+def bundle_search_index(tree: Dict[str, Any], records: Any) -> Dict[str, Any]:
+    return {
+        "postings": bundle_postings(tree),
+        "terms": tree["terms"],
+        "count": len(records),
+        "records": records,
+    }
+
+
+def postings_arrays(postings: Dict[str, array]) -> Dict[str, Any]:
+    """term -> posting list mapping in the shape bundle_postings reads back."""
+    terms = sorted(postings)
+    starts = array("I", [0])
+    concatenated = array("I")
+    for term in terms:
+        concatenated.extend(postings[term])
+        starts.append(len(concatenated))
+    return {"terms": terms, "starts": starts, "postings": concatenated}
+
+
+def feed_digest_arrays(feed: str) -> Dict[str, Any]:
+    """Change-feed keys and digests of the last refresh, one per record position."""
+    digests = feed_changes[feed]["digests"] or {}
+    return {"keys": list(digests), "digests": array("B", b"".join(digests.values()))}
+
+
+def feed_response_body(cache: Dict[str, Any], total_records: Optional[int] = None) -> Union[bytes, memoryview]:
+    """Full-feed response body, encoded once per refresh (or a zero-copy view into the bundle)."""
+    body = cache.get("encoded")
+    count_cache_event("encoded_response", "hit" if body is not None else "miss")
+    if body is None:
+        body = encode_json({
+            "last_updated": cache["last_updated"],
+            "total_records": cache["total_records"] if total_records is None else total_records,
+            "data": cache["data"]
+        })
+        cache["encoded"] = body
+    return body
+
+
+def encoded_feed_response(cache: Dict[str, Any], total_records: Optional[int] = None) -> Response:
+    return Response(content=feed_response_body(cache, total_records), media_type="application/json")
+
+
+def bundle_phishing_index() -> Optional[Tuple[memoryview, memoryview]]:
+    """Sorted, newline-joined phishing domains plus their uint32 start offsets."""
+    try:
+        source = get_phishing_file()
+    except HTTPException:
+        return None
+    domains = bundle_segment("phishing/domains", source)
+    offsets = bundle_segment("phishing/offsets", source)
+    if domains is None or offsets is None:
+        return None
+    return domains, offsets.cast("I")
+
+
+def bundle_phishing_domain(index: Tuple[memoryview, memoryview], position: int) -> bytes:
+    domains, offsets = index
+    # Every entry is followed by a newline separator, including the last one.
+    return bytes(domains[offsets[position]:offsets[position + 1] - 1])
+
+
+def bundle_phishing_contains(index: Tuple[memoryview, memoryview], domain: str) -> bool:
+    """Binary search the memory-mapped domain list without loading it."""
+    needle = domain.strip().lower().encode("utf-8")
+    lo, hi = 0, len(index[1]) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if bundle_phishing_domain(index, mid) < needle:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo < len(index[1]) - 1 and bundle_phishing_domain(index, lo) == needle
+
+
+def text_sort_key(field: str):
+    def key(record: Dict[str, Any]):
+        value = record.get(field)
+        return value.lower() if isinstance(value, str) and value else None
+    return key
+
+
+def number_sort_key(field: str):
+    def key(record: Dict[str, Any]):
+        value = record.get(field)
+        return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+    return key
+
+
+# Sortable fields per list endpoint; orders are precomputed on every refresh.
+REKT_SORT_FIELDS = {
+    "date": text_sort_key("date"),
+    "funds_lost": number_sort_key("funds_lost"),
+    "project_name": text_sort_key("project_name"),
+    "chain": text_sort_key("chain"),
+    "scam_type": text_sort_key("scam_type"),
+}
+LEAKS_SORT_FIELDS = {
+    "breach_date": text_sort_key("breach_date"),
+    "leak_count": number_sort_key("leak_count"),
+    "domain": text_sort_key("domain"),
+    "name": text_sort_key("name"),
+}
+# pubDate order comes from the news time index instead of a key function.
+NEWS_SORT_FIELDS = {
+    "title": text_sort_key("title"),
+    "source": text_sort_key("source"),
+}
+WEB3_RELEASES_SORT_FIELDS = {
+    "created_at": text_sort_key("created_at"),
+    "name": text_sort_key("name"),
+    "author": text_sort_key("author"),
+}
+# EOL pages over (product, cycles) pairs.
+EOL_SORT_FIELDS = {
+    "product": lambda pair: pair[0].lower(),
+}
+
+
+@traced("sort_index")
+def build_sort_orders(records: List[Any], sort_fields: Dict[str, Any]) -> Dict[str, Tuple[array, array]]:
+    """
+    Presorted record positions per sortable field as (ascending positions, positions
+    without a value). Records without a value come last in both directions.
+    """
+    orders = {}
+    for field, key in sort_fields.items():
+        keyed = []
+        missing = array("I")
+        for position, record in enumerate(records):
+            value = key(record)
+            if value is None:
+                missing.append(position)
+            else:
+                keyed.append((value, position))
+        keyed.sort()
+        orders[field] = (array("I", (position for _, position in keyed)), missing)
+    return orders
+
+
+def parse_fields_param(fields: Optional[str]) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    if not selected:
+        raise HTTPException(status_code=400, detail="fields must list at least one field name")
+    return selected
+
+
+def project_record(record: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if fields is None or not isinstance(record, dict):
+        return record
+    return {field: record.get(field) for field in fields}
+
+
+@traced("paginate")
+def paginate_records(
+    records: List[Any],
+    sort_orders: Dict[str, Tuple[array, array]],
+    page: Optional[int],
+    page_size: Optional[int],
+    sort: Optional[str],
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Slice one page out of records, optionally in a presorted order ("field" or "-field").
+    Without page/page_size the whole (sorted) list is returned as a single page.
+    """
+    total_records = len(records)
+    if page is None and page_size is None:
+        page, page_size = 1, max(total_records, 1)
+    else:
+        page = 1 if page is None else page
+        page_size = 100 if page_size is None else page_size
+        if page < 1:
+            raise HTTPException(status_code=400, detail="Page number must be greater than 0")
+        if page_size < 1 or page_size > 1000:
+            raise HTTPException(status_code=400, detail="Page size must be between 1 and 1000")
+
+    total_pages = (total_records + page_size - 1) // page_size
+    if total_pages and page > total_pages:
+        raise HTTPException(status_code=400, detail=f"Page {page} does not exist. Total pages: {total_pages}")
+
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total_records)
+
+    if sort:
+        descending = sort.startswith("-")
+        field = sort.lstrip("-+")
+        if field not in sort_orders:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot sort by '{field}'. Sortable fields: {', '.join(sort_orders)}"
+            )
+        keyed, missing = sort_orders[field]
+        selected = []
+        for position in range(start, stop):
+            if position < len(keyed):
+                selected.append(records[keyed[len(keyed) - 1 - position] if descending else keyed[position]])
+            else:
+                selected.append(records[missing[position - len(keyed)]])
+    else:
+        selected = records[start:stop]
+
+    return selected, {
+        "total_records": total_records,
+        "total_pages": total_pages,
+        "current_page": page,
+        "page_size": page_size,
+        "sort": sort,
+    }
+
+
+def restrict_sort_orders(
+    sort_orders: Dict[str, Tuple[array, array]],
+    positions: List[int],
+    sort: Optional[str],
+) -> Dict[str, Tuple[array, array]]:
+    """Presorted order of the requested field, limited to positions and renumbered to match them."""
+    field = (sort or "").lstrip("-+")
+    if field not in sort_orders:
+        return {name: (array("I"), array("I")) for name in sort_orders}
+    rank = {position: i for i, position in enumerate(positions)}
+    keyed, missing = sort_orders[field]
+    return {field: (
+        array("I", (rank[p] for p in keyed if p in rank)),
+        array("I", (rank[p] for p in missing if p in rank))
+    )}
+
+
+class PositionRecords:
+    """records limited to positions; only the records of the page served are read."""
+
+    __slots__ = ("records", "positions")
+
+    def __init__(self, records: Any, positions: List[int]):
+        self.records = records
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.records[p] for p in self.positions[i]]
+        return self.records[self.positions[i]]
+
+
+def feed_page_response(
+    cache: Dict[str, Any],
+    page: Optional[int],
+    page_size: Optional[int],
+    fields: Optional[str],
+    sort: Optional[str],
+    positions: Optional[List[int]] = None,
+) -> Response:
+    """Paged, sorted and projected slice of a list feed, optionally limited to record positions."""
+    selected_fields = parse_fields_param(fields)
+    records, sort_orders = cache["data"], cache.get("sort_orders", {})
+    if positions is not None:
+        records = PositionRecords(records, positions)
+        sort_orders = restrict_sort_orders(sort_orders, positions, sort)
+    selected, meta = paginate_records(records, sort_orders, page, page_size, sort)
+    return Response(
+        content=encode_json({
+            "last_updated": cache["last_updated"],
+            **meta,
+            "data": [project_record(record, selected_fields) for record in selected]
+        }),
+        media_type="application/json"
+    )
+
+
+def eol_product_pairs(data: Any) -> List[Tuple[str, Any]]:
+    """(product, cycles) pairs for both the upstream dict shape and generate_eol.py's list shape."""
+    if isinstance(data, dict):
+        return list(data.items())
+    if isinstance(data, list):
+        return [
+            (str(item.get("product")), item.get("versions", []))
+            for item in data if isinstance(item, dict)
+        ]
+    return []
+
+
+def normalize_product_name(name: Any) -> str:
+    """Case and punctuation insensitive product key ("Akeneo PIM" == "akeneo-pim")."""
+    return re.sub(r"[^a-z0-9]+", "", str(name).lower())
+
+
+def parse_eol_date(value: Any) -> Optional[date]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+@traced("index")
+def build_eol_index(pairs: List[Tuple[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], List[str], List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Product index keyed by normalized name, plus all dated cycles sorted by EOL date
+    (ISO strings, so bisect works on them directly) with their (product, cycle) refs.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    dated = []
+    for product, cycles in pairs:
+        if not isinstance(cycles, list):
+            continue
+        cycles = [cycle for cycle in cycles if isinstance(cycle, dict)]
+        index[normalize_product_name(product)] = {"product": product, "cycles": cycles}
+        for cycle in cycles:
+            eol_date = parse_eol_date(cycle.get("eol"))
+            if eol_date is not None:
+                dated.append((eol_date.isoformat(), product, cycle))
+    dated.sort(key=lambda entry: entry[0])
+    return index, [entry[0] for entry in dated], [(entry[1], entry[2]) for entry in dated]
+
+
+def eol_cycle_status(cycle: Dict[str, Any], today: date) -> Tuple[str, Optional[int]]:
+    """
+    Status computed at query time: eol is either a date or a boolean flag.
+    A cycle stays active through its EOL date and is expired from the next day.
+    """
+    eol = cycle.get("eol")
+    if isinstance(eol, bool):
+        return ("expired" if eol else "active"), None
+    eol_date = parse_eol_date(eol)
+    if eol_date is None:
+        return "unknown", None
+    days_left = (eol_date - today).days
+    return ("expired" if days_left < 0 else "active"), days_left
+
+
+def eol_cycle_view(product: str, cycle: Dict[str, Any], today: date) -> Dict[str, Any]:
+    status, days_left = eol_cycle_status(cycle, today)
+    # Ignore any status baked into the feed at generation time.
+    view = {k: v for k, v in cycle.items() if k != "status"}
+    view.update({"product": product, "status": status, "days_left": days_left})
+    return view
+
+
+def lookup_eol_product(product: str) -> Optional[Dict[str, Any]]:
+    key = normalize_product_name(product)
+    key = eol_cache.get("product_aliases", {}).get(key, key)
+    return eol_cache.get("index", {}).get(key)
+
+
+# Vendor prefixes that inventories often omit ("Kafka" for "Apache Kafka").
+EOL_VENDOR_PREFIXES = ("apache", "amazon", "aws", "azure", "microsoft", "google", "oracle", "redhat", "ibm")
+
+
+def normalize_cycle(value: Any) -> str:
+    cycle = str(value).strip().lower()
+    return cycle[1:] if cycle.startswith("v") and cycle[1:2].isdigit() else cycle
+
+
+def build_eol_inventory_index(index: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, str], Dict[Tuple[str, str], Dict[str, Any]]]:
+    """
+    Alias table for fuzzy product names and a hashed (product, cycle) lookup table.
+    Aliases that would be ambiguous between products are dropped.
+    """
+    candidates: Dict[str, set] = {}
+    for key in index:
+        for prefix in EOL_VENDOR_PREFIXES:
+            if key.startswith(prefix) and len(key) > len(prefix) + 2:
+                candidates.setdefault(key[len(prefix):], set()).add(key)
+    aliases = {
+        alias: next(iter(keys)) for alias, keys in candidates.items()
+        if len(keys) == 1 and alias not in index
+    }
+
+    cycle_index: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for key, entry in index.items():
+        for cycle in entry["cycles"]:
+            if cycle.get("cycle") is not None:
+                cycle_index.setdefault((key, normalize_cycle(cycle["cycle"])), cycle)
+    return aliases, cycle_index
+
+
+def match_inventory_row(row: Any, today: date) -> Dict[str, Any]:
+    """Resolve one inventory row; full versions fall back to their release cycle (3.11.4 -> 3.11 -> 3)."""
+    if not isinstance(row, dict):
+        return {"found": False, "error": "row must be an object with product and cycle"}
+    product = row.get("product")
+    version = row.get("cycle", row.get("version"))
+    result: Dict[str, Any] = {"product": product, "cycle": version, "found": False}
+    if not product:
+        result["error"] = "missing product"
+        return result
+
+    entry = lookup_eol_product(product)
+    if entry is None:
+        return result
+    result["matched_product"] = entry["product"]
+
+    key = normalize_product_name(entry["product"])
+    cycle = None
+    if version is not None:
+        parts = normalize_cycle(version).split(".")
+        for size in range(len(parts), 0, -1):
+            cycle = eol_cache["cycle_index"].get((key, ".".join(parts[:size])))
+            if cycle is not None:
+                break
+    elif entry["cycles"]:
+        cycle = entry["cycles"][0]
+    if cycle is None:
+        return result
+
+    status, days_left = eol_cycle_status(cycle, today)
+    result.update({
+        "found": True,
+        "matched_cycle": cycle.get("cycle"),
+        "status": status,
+        "eol": cycle.get("eol"),
+        "days_left": days_left,
+        "latest": cycle.get("latest"),
+        "latestReleaseDate": cycle.get("latestReleaseDate"),
+    })
+    return result
+
 def get_latest_rekt_file():
     """Get the most recent rekt database JSON file"""
     try:
@@ -238,6 +1276,7 @@ def get_phishing_file():
         logger.error(f"Error in get_phishing_file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error finding phishing file: {str(e)}")
 
+@traced("glob")
 def get_cve_files(year: str = None):
     """Get CVE data JSON files for a specific year or all years"""
     try:
@@ -250,12 +1289,13 @@ def get_cve_files(year: str = None):
         
         # Get JSON files based on year parameter
         if year:
-            json_files = list(cve_dir.glob(f"{year}.json"))
+            json_files = [f for f in cve_dir.glob(f"{year}.json") if f.stem.isdigit()]
             if not json_files:
                 logger.error(f"No CVE data found for year {year}")
                 raise HTTPException(status_code=404, detail=f"No CVE data found for year {year}")
         else:
-            json_files = list(cve_dir.glob("*.json"))
+            # Year files only; derived cve/<year>.summary.json files live alongside them.
+            json_files = [f for f in cve_dir.glob("*.json") if f.stem.isdigit()]
             if not json_files:
                 logger.error("No JSON files found in CVE directory")
                 raise HTTPException(status_code=404, detail="No CVE data files found")
@@ -277,6 +1317,9 @@ def sync_cve_year_file(year: int, force: bool = False) -> bool:
         if not UPSTREAM_DATA_BASE_URL:
             logger.info("UPSTREAM_DATA_BASE_URL not configured; skipping upstream CVE sync")
             return False
+        if not is_refresh_leader():
+            # Followers pick the new file up through its file_version instead.
+            return False
 
         cve_dir = get_feed_root_dir() / "cve"
         cve_dir.mkdir(parents=True, exist_ok=True)
@@ -300,8 +1343,21 @@ def sync_cve_year_file(year: int, force: bool = False) -> bool:
         if not isinstance(parsed, list):
             parsed = [parsed]
 
-        with open(target, "w", encoding="utf-8") as f:
-            json.dump(parsed, f, ensure_ascii=False)
+        # Other tools (external_feed_sync.py) rewrite year files too; the diff is only
+        # valid against the exact file this write replaces.
+        replaced_version = file_version(target) if target.exists() else None
+        # Readers in other workers must never see a half-written year file.
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(parsed, f, ensure_ascii=False)
+            os.replace(tmp_path, target)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        # Only the synced year goes stale; apply just what changed when its list is held.
+        delta = merge_cve_year_update(str(year), target, parsed, replaced_version)
+        reindex_cve_search_year(str(year), target, replaced_version, delta)
 
         logger.info(f"Synced CVE year file from upstream: {target}")
         return True
@@ -404,57 +1460,627 @@ def sanitize_description(description: str, domain: str = None) -> Dict[str, Any]
         "references": references
     }
 
+@instrument_refresh("rekt", rekt_cache)
 async def refresh_rekt_data():
     """Refresh the rekt data cache"""
     try:
         latest_file = get_latest_rekt_file()
         logger.info(f"Refreshing cache from file: {latest_file}")
-        
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not data or not isinstance(data, dict):
-            logger.error("Invalid rekt JSON format: expected object")
-            return
-
-        # Support both formats:
-        # 1) Legacy puller: {"items":[...]}
-        # 2) Normalized snapshots: {"data":[...]}
-        records = data.get("items")
-        if not isinstance(records, list):
-            records = data.get("data")
-        if not isinstance(records, list):
-            logger.error("Invalid rekt JSON format: missing 'items' or 'data' array")
-            return
 
-        # Filter the records to only include specified fields
-        filtered_records = []
-        for record in records:
-            filtered_record = filter_record(record)
-            if filtered_record:
-                filtered_records.append(filtered_record)
-        
-        # Sort records by date in descending order (newest first)
-        filtered_records.sort(key=sort_key, reverse=True)
+        bundled = bundle_feed("rekt", latest_file)
+        if bundled is not None:
+            # Records, orders and indexes stay in the shared mapping.
+            filtered_records = bundled["records"]
+            rekt_cache["encoded"] = bundled["body"]
+            rekt_cache["sort_orders"] = bundled["sort"]
+            rekt_cache["stats"] = bundled["meta"]["stats"]
+            rekt_cache["indexes"] = {param: bundle_postings(tree) for param, tree in bundled["indexes"].items()}
+            rekt_cache["date_keys"] = bundled["date_keys"]
+            search_indexes["web3-threats"] = bundled["search"]
+            logger.info("Loaded normalized rekt records from data bundle")
+        else:
+            filtered_records = load_rekt_records(latest_file)
+            if filtered_records is None:
+                return
+            rekt_cache["encoded"] = None
+            rekt_cache["sort_orders"] = build_sort_orders(filtered_records, REKT_SORT_FIELDS)
+            rekt_cache["stats"] = build_rekt_stats(filtered_records)
+            rekt_cache["indexes"], rekt_cache["date_keys"] = build_rekt_indexes(filtered_records)
+            update_search_index("web3-threats", filtered_records)
         
         # Update cache
         rekt_cache["data"] = filtered_records
         rekt_cache["last_updated"] = datetime.fromtimestamp(latest_file.stat().st_mtime).isoformat()
         rekt_cache["last_file"] = latest_file
         rekt_cache["total_records"] = len(filtered_records)
+        record_feed_changes("web3-threats", filtered_records, bundled)
         
         logger.info(f"Cache refreshed with {len(filtered_records)} records")
     except Exception as e:
         logger.error(f"Error refreshing cache: {str(e)}")
+        raise
+
+def load_rekt_records(latest_file: Path) -> Optional[List[Dict[str, Any]]]:
+    """Parse and normalize a raw rekt snapshot (newest first)"""
+    with open(latest_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if not data or not isinstance(data, dict):
+        logger.error("Invalid rekt JSON format: expected object")
+        return None
+
+    # Support both formats:
+    # 1) Legacy puller: {"items":[...]}
+    # 2) Normalized snapshots: {"data":[...]}
+    records = data.get("items")
+    if not isinstance(records, list):
+        records = data.get("data")
+    if not isinstance(records, list):
+        logger.error("Invalid rekt JSON format: missing 'items' or 'data' array")
+        return None
+
+    # Filter the records to only include specified fields
+    filtered_records = []
+    for record in records:
+        filtered_record = filter_record(record)
+        if filtered_record:
+            filtered_records.append(filtered_record)
+    
+    # Sort records by date in descending order (newest first)
+    filtered_records.sort(key=sort_key, reverse=True)
+    return filtered_records
+
+CHANGE_LOG_MAX_ENTRIES = int(os.getenv("CHANGE_LOG_MAX_ENTRIES", "64"))
+# A single refresh touching more keys than this is not logged; clients resync instead.
+CHANGE_LOG_MAX_KEYS = int(os.getenv("CHANGE_LOG_MAX_KEYS", "5000"))
+
+# Record key of each feed tracked by /changes; phishing domains are only exported in bulk.
+CHANGE_FEED_KEYS = {
+    "web3-threats": lambda r: f"{r.get('project_name')}|{r.get('date')}",
+    "eol": lambda r: f"{r.get('product')}|{r.get('cycle')}",
+    "leaks": lambda r: r.get("name") or r.get("domain"),
+    "news": lambda r: r.get("link") or r.get("title"),
+    "web3-releases": lambda r: r.get("html_url") or r.get("name"),
+    "cves": lambda r: r.get("cve_id"),
+}
+
+# Per feed: current version, oldest version the log can serve from, bounded log of
+# {"version", "added", "changed", "removed"} entries and record digests of the last refresh.
+feed_changes: Dict[str, Dict[str, Any]] = {
+    feed: {"version": 0, "base_version": 0, "log": deque(maxlen=CHANGE_LOG_MAX_ENTRIES), "digests": None}
+    for feed in CHANGE_FEED_KEYS
+}
+
+
+def next_feed_version(state: Dict[str, Any]) -> int:
+    """Millisecond clock, bumped past the previous version so versions survive restarts monotonic."""
+    return max(state["version"] + 1, int(time.time() * 1000))
+
+
+def reset_feed_changes(feed: str) -> int:
+    """Start a new version with an empty log; every older client has to resync."""
+    state = feed_changes[feed]
+    state["version"] = state["base_version"] = next_feed_version(state)
+    state["log"].clear()
+    return state["version"]
+
+
+def log_feed_changes(
+    feed: str,
+    added: Dict[str, Any],
+    changed: Dict[str, Any],
+    removed: List[str],
+) -> Optional[int]:
+    """Append one refresh's delta under a new version; returns it, or None when nothing changed."""
+    if not (added or changed or removed):
+        return None
+    if len(added) + len(changed) + len(removed) > CHANGE_LOG_MAX_KEYS:
+        version = reset_feed_changes(feed)
+    else:
+        state = feed_changes[feed]
+        version = next_feed_version(state)
+        log = state["log"]
+        if len(log) == log.maxlen:
+            # Clients at or past the evicted entry still only need what follows it.
+            state["base_version"] = log[0]["version"]
+        log.append({"version": version, "added": added, "changed": changed, "removed": removed})
+        state["version"] = version
+    if added:
+        publish_stream_event(feed, version, list(added))
+    return version
+
+
+STREAM_CLIENT_QUEUE_SIZE = int(os.getenv("STREAM_CLIENT_QUEUE_SIZE", "32"))
+STREAM_REPLAY_EVENTS = int(os.getenv("STREAM_REPLAY_EVENTS", "256"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+STREAM_EVENT_MAX_KEYS = 20
+STREAM_RETRY_MS = 5000
+
+# SSE broker. Events are encoded once and shared by every client queue; the ring keeps
+# the latest ones for Last-Event-ID replay. Ids below "floor" may have been missed
+# (evicted from the ring or published by a previous process), so those clients resync.
+stream_state: Dict[str, Any] = {
+    "last_id": 0,
+    "floor": int(time.time() * 1000),
+    "ring": deque(maxlen=STREAM_REPLAY_EVENTS),
+    "clients": set(),
+}
+
+
+class StreamClient:
+    """One /stream connection: its feed filter and a bounded queue of encoded events."""
+
+    def __init__(self, feeds: Optional[set]):
+        self.feeds = feeds
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_CLIENT_QUEUE_SIZE)
+        self.overflowed = False
+
+    def offer(self, feed: str, payload: bytes) -> None:
+        if self.overflowed or (self.feeds is not None and feed not in self.feeds):
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A client that cannot keep up is cut off and resumes via Last-Event-ID,
+            # instead of letting its backlog grow without bound.
+            self.overflowed = True
+
+
+def publish_stream_event(feed: str, version: int, keys: List[str]) -> None:
+    """Broadcast a compact "new records" event for a feed to every matching SSE client."""
+    event_id = max(stream_state["last_id"] + 1, int(time.time() * 1000))
+    stream_state["last_id"] = event_id
+    data = encode_json({
+        "feed": feed,
+        "version": version,
+        "new_records": len(keys),
+        "keys": keys[:STREAM_EVENT_MAX_KEYS],
+    })
+    payload = f"id: {event_id}\nevent: {feed}\ndata: ".encode("utf-8") + data + b"\n\n"
+
+    ring = stream_state["ring"]
+    if len(ring) == ring.maxlen:
+        stream_state["floor"] = ring[0][0]
+    ring.append((event_id, feed, payload))
+    for client in stream_state["clients"]:
+        client.offer(feed, payload)
+
+
+def record_feed_changes(feed: str, records: Any, precomputed: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    """
+    Diff a refreshed feed against the previous refresh by record key and content digest.
+    precomputed holds the bundle's per-position keys and 8-byte digests (see
+    feed_digest_arrays); then only added or changed records are decoded.
+    """
+    if precomputed is None:
+        key_fn = CHANGE_FEED_KEYS[feed]
+        digests: Dict[str, bytes] = {}
+        by_key: Dict[str, Any] = {}
+        for record in records:
+            key = str(key_fn(record))
+            if key in digests:
+                suffix = 2
+                while f"{key}#{suffix}" in digests:
+                    suffix += 1
+                key = f"{key}#{suffix}"
+            digests[key] = hashlib.blake2b(encode_json(record), digest_size=8).digest()
+            by_key[key] = record
+        record_for = by_key.__getitem__
+    else:
+        blob = precomputed["digests"]
+        positions = {key: i for i, key in enumerate(precomputed["keys"])}
+        digests = {key: bytes(blob[8 * i:8 * i + 8]) for key, i in positions.items()}
+        record_for = lambda key: records[positions[key]]
+
+    state = feed_changes[feed]
+    previous, state["digests"] = state["digests"], digests
+    if previous is None:
+        return reset_feed_changes(feed)
+    return log_feed_changes(
+        feed,
+        added={k: record_for(k) for k in digests if k not in previous},
+        changed={k: record_for(k) for k, d in digests.items() if k in previous and previous[k] != d},
+        removed=[k for k in previous if k not in digests],
+    )
+
+
+def eol_cycle_records(data: Any):
+    """Flatten the EOL feed into one {"product", **cycle} record per release cycle."""
+    for product, cycles in eol_product_pairs(data):
+        for cycle in cycles if isinstance(cycles, list) else []:
+            yield {"product": product, **cycle} if isinstance(cycle, dict) else {"product": product, "cycle": cycle}
+
+
+def normalize_token_address(address: Any) -> Optional[str]:
+    """EVM addresses are case-insensitive; other chains (e.g. base58) keep their case."""
+    if not isinstance(address, str) or not address.strip():
+        return None
+    address = address.strip()
+    return address.lower() if address[:2].lower() == "0x" else address
+
+
+def normalize_label(value: Any) -> Optional[str]:
+    return value.strip().lower() if isinstance(value, str) and value.strip() else None
+
+
+# Normalizers of the rekt hash/inverted indexes, keyed by query parameter.
+REKT_INDEX_FIELDS = {
+    "token_address": ("token_address", normalize_token_address),
+    "project": ("project_name", lambda v: normalize_product_name(v) if isinstance(v, str) and v.strip() else None),
+    "chain": ("chain", normalize_label),
+    "scam_type": ("scam_type", normalize_label),
+}
+
+
+@traced("index")
+def build_rekt_indexes(records: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, array]], List[str]]:
+    """
+    Posting lists (ascending record positions) per normalized value for every field
+    in REKT_INDEX_FIELDS, plus the records' ISO dates in their newest-first order.
+    """
+    indexes: Dict[str, Dict[str, array]] = {param: {} for param in REKT_INDEX_FIELDS}
+    for position, record in enumerate(records):
+        for param, (field, normalize) in REKT_INDEX_FIELDS.items():
+            key = normalize(record.get(field))
+            if key is not None:
+                indexes[param].setdefault(key, array("I")).append(position)
+    date_keys = [(r.get("date") or "")[:10] if isinstance(r.get("date"), str) else "" for r in records]
+    return indexes, date_keys
+
+
+def rekt_date_range(date_keys: List[str], date_from: Optional[str], date_to: Optional[str]) -> Tuple[int, int]:
+    """Position range of records dated within [date_from, date_to]; keys are sorted descending."""
+    def first_below(bound: str, inclusive: bool) -> int:
+        lo, hi = 0, len(date_keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if date_keys[mid] > bound or (inclusive and date_keys[mid] == bound):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    start = first_below(date_to, inclusive=False) if date_to else 0
+    # Undated records ("") sort last and never match a date filter.
+    stop = first_below(date_from, inclusive=True) if date_from else first_below("", inclusive=False)
+    return start, max(start, stop)
+
+
+def query_rekt_index(filters: Dict[str, Optional[str]], date_from: Optional[str], date_to: Optional[str]) -> List[int]:
+    """Intersect posting lists, smallest first, within the date range of the newest-first records."""
+    if date_from or date_to:
+        for value in (date_from, date_to):
+            if value is not None and parse_eol_date(value) is None:
+                raise HTTPException(status_code=400, detail="date_from and date_to must be YYYY-MM-DD dates")
+        start, stop = rekt_date_range(rekt_cache["date_keys"], date_from, date_to)
+    else:
+        start, stop = 0, len(rekt_cache["data"])
+
+    postings = []
+    for param, value in filters.items():
+        if value is None:
+            continue
+        key = REKT_INDEX_FIELDS[param][1](value)
+        postings.append(rekt_cache["indexes"][param].get(key, array("I")) if key is not None else array("I"))
+    if not postings:
+        return list(range(start, stop))
+
+    postings.sort(key=len)
+    smallest, others = postings[0], postings[1:]
+    matches = []
+    for position in smallest[bisect_left(smallest, start):bisect_left(smallest, stop)]:
+        if all(_sorted_contains(other, position) for other in others):
+            matches.append(position)
+    return matches
+
+
+def _sorted_contains(positions: array, position: int) -> bool:
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
+
+
+# Cross-feed search (/search/all). Low-memory mode indexes only the newest CVE years.
+SEARCH_CVE_YEARS = int(os.getenv("SEARCH_CVE_YEARS", "2"))
+SEARCH_MAX_PREFIX_TERMS = 50
+SEARCH_PRIMARY_WEIGHT = 2.0
+SEARCH_SNIPPET_CHARS = 160
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+SEARCH_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "via", "was", "which", "with"
+})
+# Feed -> (title-like fields, other indexed fields, fields returned with each hit)
+SEARCH_FIELDS = {
+    "cves": (("cve_id",), ("description",), ("cve_id", "description", "score", "severity_en", "publishedDate")),
+    "leaks": (("domain",), ("data_leaked",), ("domain", "breach_date", "data_leaked", "leak_count")),
+    "news": (("title",), ("source",), ("title", "link", "pubDate", "source")),
+    "web3-threats": (
+        ("project_name", "token_name"),
+        ("scam_type", "root_cause", "name_categories"),
+        ("project_name", "scam_type", "root_cause", "date", "funds_lost")
+    ),
+    "web3-releases": (("name",), ("author",), ("name", "author", "created_at", "html_url")),
+}
+
+# Index name ("leaks", "cves/2025", ...) -> {"postings", "terms", "count", and "records" or "rows"}
+search_indexes: Dict[str, Dict[str, Any]] = {}
+
+
+def search_terms(text: str) -> List[str]:
+    return [t for t in SEARCH_TOKEN_RE.findall(text.lower()) if t not in SEARCH_STOPWORDS]
+
+
+@traced("search_index")
+def build_search_index(records: List[Any], primary: Tuple[str, ...], secondary: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Inverted index over one record list. Each posting is position * 2 + 1 when the
+    term occurs in a primary field, position * 2 otherwise, so lists stay sorted.
+    """
+    postings: Dict[str, array] = {}
+    for position, record in enumerate(records):
+        for term, flag in search_record_terms(record, primary, secondary).items():
+            postings.setdefault(term, array("I")).append(position * 2 + flag)
+    return {"postings": postings, "terms": sorted(postings), "count": len(records)}
+
+
+def search_record_terms(record: Any, primary: Tuple[str, ...], secondary: Tuple[str, ...]) -> Dict[str, int]:
+    """Terms of one record, flagged 1 when the term occurs in a primary field."""
+    flags: Dict[str, int] = {}
+    if not isinstance(record, dict):
+        return flags
+    for flag, fields in ((1, primary), (0, secondary)):
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, list):
+                value = " ".join(str(v) for v in value)
+            if value is None:
+                continue
+            for term in search_terms(str(value)):
+                if flags.get(term, -1) < flag:
+                    flags[term] = flag
+    return flags
+
 
+def update_search_index(feed: str, records: List[Any]) -> None:
+    """Swap in fresh postings for a feed whose records stay resident in its cache."""
+    primary, secondary, _ = SEARCH_FIELDS[feed]
+    index = build_search_index(records, primary, secondary)
+    index["records"] = records
+    search_indexes[feed] = index
+
+
+def search_cve_years() -> List[str]:
+    years = cve_cache.get("available_years") or []
+    return years if not LOW_MEMORY_MODE else years[:SEARCH_CVE_YEARS]
+
+
+def cve_search_row(record: Any) -> Tuple[Any, ...]:
+    """Shown fields of a CVE search hit, with the description cut to a snippet."""
+    shown = SEARCH_FIELDS["cves"][2]
+    snippet = shown.index("description")
+    row = [record.get(field) if isinstance(record, dict) else None for field in shown]
+    if isinstance(row[snippet], str) and len(row[snippet]) > SEARCH_SNIPPET_CHARS:
+        row[snippet] = row[snippet][:SEARCH_SNIPPET_CHARS].rstrip() + "..."
+    return tuple(row)
+
+
+def update_cve_search_year(year: str, records: List[Dict[str, Any]]) -> None:
+    """Index one CVE year, keeping compact result rows since the year may not stay loaded."""
+    primary, secondary, _ = SEARCH_FIELDS["cves"]
+    index = build_search_index(records, primary, secondary)
+    index["rows"] = [cve_search_row(record) for record in records]
+    search_indexes[f"cves/{year}"] = index
+
+
+def load_cve_search_year(year: str, cve_file: Path, records: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Index a CVE year from its bundle postings when fresh, else from records (read if not
+    given). A year already indexed from the current version of its file is left alone.
+    """
+    version = file_version(cve_file)
+    current = search_indexes.get(f"cves/{year}")
+    if current is not None and current.get("version") == version:
+        return
+    bundled = bundle_cve_year(cve_file)
+    if bundled is not None:
+        tree = bundle_derived(f"cve/{year}", cve_file)[0]
+        search_indexes[f"cves/{year}"] = bundle_search_index(tree["search"], bundled)
+    else:
+        update_cve_search_year(year, records if records is not None else read_cve_year_file(cve_file))
+    search_indexes[f"cves/{year}"]["version"] = version
+
+
+def update_cve_search_delta(
+    year: str,
+    cve_file: Path,
+    replaced_version: Optional[Tuple[int, int]],
+    added: List[Dict[str, Any]],
+    removed: List[str],
+) -> bool:
+    """
+    Apply a merged sync to the year's index in place: removed CVEs become dead slots and
+    inserted ones get new slots at the end. Returns False when the index does not match
+    the replaced file (or is read-only, or mostly dead slots) and has to be rebuilt.
+    """
+    index = search_indexes.get(f"cves/{year}")
+    if (index is None or "rows" not in index or replaced_version is None
+            or index.get("version") != tuple(replaced_version)):
+        return False
+    primary, secondary, shown = SEARCH_FIELDS["cves"]
+    rows, postings = index["rows"], index["postings"]
+    if "slots" not in index:
+        id_field = shown.index("cve_id")
+        index["slots"] = {row[id_field]: slot for slot, row in enumerate(rows) if row is not None}
+    slots = index["slots"]
+    dead = index.setdefault("dead", set())
+
+    for cve_id in removed + [item["cve_id"] for item in added]:
+        slot = slots.pop(cve_id, None)
+        if slot is not None:
+            rows[slot] = None
+            dead.add(slot)
+    for item in added:
+        slot = len(rows)
+        rows.append(cve_search_row(item))
+        slots[item["cve_id"]] = slot
+        for term, flag in search_record_terms(item, primary, secondary).items():
+            entries = postings.get(term)
+            if entries is None:
+                entries = postings[term] = array("I")
+                insort(index["terms"], term)
+            entries.append(slot * 2 + flag)
+
+    index["count"] = len(rows) - len(dead)
+    index["version"] = file_version(cve_file)
+    return len(dead) <= index["count"]
+
+
+def prune_cve_search_years() -> None:
+    keep = {f"cves/{year}" for year in search_cve_years()}
+    for name in [n for n in search_indexes if n.startswith("cves/") and n not in keep]:
+        del search_indexes[name]
+
+
+def reindex_cve_search_year(
+    year: str,
+    cve_file: Path,
+    replaced_version: Optional[Tuple[int, int]] = None,
+    delta: Optional[Tuple[List[Dict[str, Any]], List[str]]] = None,
+) -> None:
+    """
+    Re-index a year whose file just changed, if it is one of the searchable years: only
+    the CVEs in delta (see merge_cve_year_update) when possible, else the whole year.
+    """
+    if year not in search_cve_years():
+        return
+    if delta is not None and update_cve_search_delta(year, cve_file, replaced_version, *delta):
+        return
+    search_indexes.pop(f"cves/{year}", None)
+    load_cve_search_year(year, cve_file, held_cve_year_list(year))
+
+
+def search_index_matches(index: Dict[str, Any], terms: List[str], prefix: Optional[str]) -> Dict[int, float]:
+    """
+    Positions holding every term (and some term starting with prefix), scored by the
+    sum of each term's idf, doubled for hits in a primary field.
+    """
+    groups = [[term] for term in terms]
+    if prefix is not None:
+        start = bisect_left(index["terms"], prefix)
+        groups.append([t for t in index["terms"][start:start + SEARCH_MAX_PREFIX_TERMS] if t.startswith(prefix)])
+    postings = index["postings"]
+    # Slots of CVEs removed by an in-place update (see update_cve_search_delta).
+    dead = index.get("dead")
+    # Rarest group first, so later groups only check positions still in the running.
+    groups.sort(key=lambda group: sum(len(postings.get(t, ())) for t in group))
+
+    scores: Optional[Dict[int, float]] = None
+    for group in groups:
+        group_scores: Dict[int, float] = {}
+        for term in group:
+            entries = postings.get(term)
+            if not entries:
+                continue
+            idf = math.log(1 + index["count"] / len(entries))
+            for entry in entries:
+                position = entry >> 1
+                if scores is not None and position not in scores:
+                    continue
+                if dead and position in dead:
+                    continue
+                score = idf * SEARCH_PRIMARY_WEIGHT if entry & 1 else idf
+                if score > group_scores.get(position, 0.0):
+                    group_scores[position] = score
+        scores = group_scores if scores is None else {p: scores[p] + v for p, v in group_scores.items()}
+        if not scores:
+            return {}
+    return scores or {}
+
+
+def search_hit(name: str, index: Dict[str, Any], position: int) -> Dict[str, Any]:
+    feed = name.split("/", 1)[0]
+    shown = SEARCH_FIELDS[feed][2]
+    if "rows" in index:
+        return dict(zip(shown, index["rows"][position]))
+    if feed == "cves":
+        return dict(zip(shown, cve_search_row(index["records"][position])))
+    return project_record(index["records"][position], list(shown))
+
+
+REKT_STATS_TOP_MAX = 100
+
+
+@traced("stats")
+def build_rekt_stats(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Loss rollups for one rekt snapshot: totals, groupings by chain, year, scam type
+    and root cause, the largest incidents and a monthly series.
+    """
+    groups: Dict[str, Dict[str, Dict[str, Any]]] = {
+        "by_chain": {}, "by_year": {}, "by_scam_type": {}, "by_root_cause": {}
+    }
+    monthly: Dict[str, Dict[str, Any]] = {}
+    total_lost = 0
+    with_amount = 0
+
+    for record in records:
+        lost = record.get("funds_lost")
+        amount = lost if isinstance(lost, (int, float)) and not isinstance(lost, bool) else 0
+        if amount:
+            with_amount += 1
+            total_lost += amount
+
+        record_date = record.get("date") if isinstance(record.get("date"), str) else ""
+        keys = {
+            "by_chain": record.get("chain"),
+            "by_year": record_date[:4] or None,
+            "by_scam_type": record.get("scam_type"),
+            "by_root_cause": record.get("root_cause"),
+        }
+        for group, key in keys.items():
+            bucket = groups[group].setdefault(str(key) if key else "unknown", {"funds_lost": 0, "count": 0})
+            bucket["funds_lost"] += amount
+            bucket["count"] += 1
+
+        if len(record_date) >= 7:
+            bucket = monthly.setdefault(record_date[:7], {"funds_lost": 0, "count": 0})
+            bucket["funds_lost"] += amount
+            bucket["count"] += 1
+
+    ranked = sorted(
+        (r for r in records if isinstance(r.get("funds_lost"), (int, float)) and not isinstance(r.get("funds_lost"), bool)),
+        key=lambda r: r["funds_lost"],
+        reverse=True
+    )[:REKT_STATS_TOP_MAX]
+
+    stats: Dict[str, Any] = {
+        "total": {"funds_lost": total_lost, "count": len(records), "with_amount": with_amount},
+        "top_projects": [
+            {k: r.get(k) for k in ("project_name", "funds_lost", "date", "chain", "scam_type", "root_cause")}
+            for r in ranked
+        ],
+        "monthly": [{"month": month, **values} for month, values in sorted(monthly.items())],
+    }
+    for group, buckets in groups.items():
+        ordered = sorted(buckets.items(), key=lambda item: item[0]) if group == "by_year" else \
+            sorted(buckets.items(), key=lambda item: (-item[1]["funds_lost"], item[0]))
+        stats[group] = [{"key": key, **values} for key, values in ordered]
+    return stats
+
+@instrument_refresh("eol", eol_cache)
 async def refresh_eol_data():
     """Refresh the EOL data cache"""
     try:
         eol_file = get_latest_eol_file()
         logger.info(f"Refreshing EOL cache from file: {eol_file}")
-        
-        with open(eol_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+
+        bundled = bundle_segment("eol", eol_file)
+        derived = bundle_derived("eol", eol_file) if bundled is not None else None
+        if bundled is not None:
+            data = json.loads(bytes(bundled))["data"]
+        else:
+            with open(eol_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         if not data:
             logger.error("Invalid data format in EOL JSON file")
@@ -465,93 +2091,373 @@ async def refresh_eol_data():
         eol_cache["last_updated"] = datetime.fromtimestamp(eol_file.stat().st_mtime).isoformat()
         eol_cache["last_file"] = eol_file
         eol_cache["total_records"] = len(data) if isinstance(data, list) else 1
+        eol_cache["encoded"] = bundled
+        eol_cache["products"] = eol_product_pairs(data)
+        if derived is not None:
+            eol_cache["sort_orders"] = derived[0]["sort"]
+        else:
+            eol_cache["sort_orders"] = build_sort_orders(eol_cache["products"], EOL_SORT_FIELDS)
+        eol_cache["index"], eol_cache["eol_dates"], eol_cache["eol_date_refs"] = build_eol_index(eol_cache["products"])
+        eol_cache["product_aliases"], eol_cache["cycle_index"] = build_eol_inventory_index(eol_cache["index"])
+        if derived is not None:
+            record_feed_changes("eol", list(eol_cycle_records(data)), derived[0])
+        else:
+            record_feed_changes("eol", eol_cycle_records(data))
         
         logger.info(f"EOL cache refreshed with {eol_cache['total_records']} records")
     except Exception as e:
         logger.error(f"Error refreshing EOL cache: {str(e)}")
+        raise
 
+@instrument_refresh("leaks", leaks_cache)
 async def refresh_leaks_data():
     """Refresh the leaks data cache"""
     try:
         leaks_file = get_leaks_file()
         logger.info(f"Refreshing leaks cache from file: {leaks_file}")
-        
-        with open(leaks_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not data:
-            logger.error("Invalid data format in leaks JSON file")
-            return
-        
-        # Process each leak record to remove _pl fields and sanitize descriptions
-        cleaned_data = []
-        for item in data:
-            # Remove _pl fields
-            cleaned_item = {k: v for k, v in item.items() if not k.endswith('_pl')}
-            
-            # Sanitize description
-            if "description" in cleaned_item:
-                sanitized = sanitize_description(cleaned_item["description"], cleaned_item.get("domain"))
-                cleaned_item["description"] = sanitized["text"]
-                if sanitized["references"]:
-                    cleaned_item["references"] = sanitized["references"]
-            
-            cleaned_data.append(cleaned_item)
+        # Taken before reading, so a rewrite during the read shows up as a newer version.
+        source_version = list(file_version(leaks_file))
+
+        bundled = bundle_feed("leaks", leaks_file)
+        if bundled is not None:
+            cleaned_data = bundled["records"]
+            leaks_cache["encoded"] = bundled["body"]
+            leaks_cache["sort_orders"] = bundled["sort"]
+            search_indexes["leaks"] = bundled["search"]
+            logger.info("Loaded sanitized leaks records from data bundle")
+        else:
+            cleaned_data = load_leaks_records(leaks_file)
+            if cleaned_data is None:
+                return
+            leaks_cache["encoded"] = None
+            leaks_cache["sort_orders"] = build_sort_orders(cleaned_data, LEAKS_SORT_FIELDS)
+            update_search_index("leaks", cleaned_data)
         
         # Update cache
         leaks_cache["data"] = cleaned_data
         leaks_cache["last_updated"] = datetime.fromtimestamp(leaks_file.stat().st_mtime).isoformat()
         leaks_cache["last_file"] = leaks_file
+        leaks_cache["source_version"] = source_version
         leaks_cache["total_records"] = len(cleaned_data)
+        record_feed_changes("leaks", cleaned_data, bundled)
         
         logger.info(f"Leaks cache refreshed with {leaks_cache['total_records']} records")
     except Exception as e:
         logger.error(f"Error refreshing leaks cache: {str(e)}")
+        raise
 
+def load_leaks_records(leaks_file: Path) -> Optional[List[Dict[str, Any]]]:
+    """Parse raw leaks and sanitize their HTML descriptions"""
+    with open(leaks_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if not data:
+        logger.error("Invalid data format in leaks JSON file")
+        return None
+    
+    # Process each leak record to remove _pl fields and sanitize descriptions
+    cleaned_data = []
+    for item in data:
+        # Remove _pl fields
+        cleaned_item = {k: v for k, v in item.items() if not k.endswith('_pl')}
+        
+        # Sanitize description
+        if "description" in cleaned_item:
+            sanitized = sanitize_description(cleaned_item["description"], cleaned_item.get("domain"))
+            cleaned_item["description"] = sanitized["text"]
+            if sanitized["references"]:
+                cleaned_item["references"] = sanitized["references"]
+        
+        cleaned_data.append(cleaned_item)
+    return cleaned_data
+
+@instrument_refresh("news", news_cache)
 async def refresh_news_data():
     """Refresh the news data cache"""
     try:
         news_file = get_news_file()
         logger.info(f"Refreshing news cache from file: {news_file}")
+
+        # The bundle holds the filtered, collapsed and indexed items; its segment goes
+        # stale once a dropped future-dated item falls due.
+        bundled = bundle_feed("news", news_file)
+        if bundled is not None:
+            filtered_items = bundled["records"]
+            dropped_future, collapsed = bundled["meta"]["dropped_future"], bundled["meta"]["collapsed"]
+            news_cache["encoded"] = bundled["body"]
+            news_cache["time_index"] = bundled["time_index"]
+            news_cache["sort_orders"] = bundled["sort"]
+            news_cache["fresh_until"] = data_bundle["header"]["segments"]["news"].get("fresh_until")
+            search_indexes["news"] = bundled["search"]
+        else:
+            # Parsing and near-duplicate clustering are CPU-bound; keep them off the event loop.
+            loaded = await asyncio.to_thread(load_news_items, news_file)
+            if loaded is None:
+                return
+            filtered_items, time_index, dropped_future, collapsed, first_due = loaded
+
+            news_cache["encoded"] = None
+            news_cache["time_index"] = time_index
+            news_cache["fresh_until"] = first_due
+            news_cache["sort_orders"] = build_sort_orders(filtered_items, NEWS_SORT_FIELDS)
+            # Items are already newest first, so the pubDate order falls out of the time index.
+            dated = len(time_index["all"][0])
+            news_cache["sort_orders"]["pubDate"] = (
+                array("I", range(dated - 1, -1, -1)),
+                array("I", range(dated, len(filtered_items)))
+            )
+            update_search_index("news", filtered_items)
+
+        # Update cache
+        news_cache["data"] = filtered_items
+        news_cache["last_updated"] = datetime.fromtimestamp(news_file.stat().st_mtime).isoformat()
+        news_cache["last_file"] = news_file
+        news_cache["total_records"] = len(filtered_items)
+        news_cache["collapse_stats"] = {"dropped_future": dropped_future, "collapsed": collapsed}
+        record_feed_changes("news", filtered_items, bundled)
         
-        with open(news_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        if not data:
-            logger.error("Invalid data format in news JSON file")
-            return
+        logger.info(
+            f"News cache refreshed with {news_cache['total_records']} records "
+            f"(dropped {dropped_future} future-dated entries, collapsed {collapsed} near-duplicates)"
+        )
+    except Exception as e:
+        logger.error(f"Error refreshing news cache: {str(e)}")
+        raise
+
+def load_news_items(news_file: Path) -> Optional[Tuple[List[Any], Dict[str, Any], int, int, Optional[float]]]:
+    """
+    Parse a raw news file, drop future-dated posts, collapse near-duplicates and index
+    the rest by time: (items, time_index, dropped_future, collapsed, first_due).
+    """
+    with open(news_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if not data:
+        logger.error("Invalid data format in news JSON file")
+        return None
+
+    items = data.get("data") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        logger.error("Unexpected news data format: expected a list")
+        return None
+
+    items, timestamps, dropped_future, first_due = drop_future_news(items)
+    items, timestamps, collapsed = collapse_duplicate_news(items, timestamps)
+    items, time_index = build_news_time_index(items, timestamps)
+    return items, time_index, dropped_future, collapsed, first_due
+
+
+def drop_future_news(items: List[Any]) -> Tuple[List[Any], List[Optional[float]], int, Optional[float]]:
+    """
+    Drop obviously future-dated posts (scheduled events/feed anomalies).
+    Returns the kept items with their parsed UTC timestamps, so dates are parsed once,
+    plus the epoch time at which the first dropped post would be kept (or None).
+    """
+    now_utc = datetime.now(timezone.utc)
+    future_cutoff = now_utc + timedelta(hours=24)
+    filtered_items = []
+    timestamps: List[Optional[float]] = []
+    dropped_future = 0
+    first_due: Optional[float] = None
+
+    for item in items:
+        pub_dt = parse_news_datetime(item.get("pubDate")) if isinstance(item, dict) else None
+        if pub_dt and pub_dt > future_cutoff:
+            dropped_future += 1
+            due = (pub_dt - timedelta(hours=24)).timestamp()
+            first_due = due if first_due is None else min(first_due, due)
+            continue
+        filtered_items.append(item)
+        timestamps.append(pub_dt.timestamp() if pub_dt else None)
+    return filtered_items, timestamps, dropped_future, first_due
+
+
+# MinHash/LSH parameters for near-duplicate titles: 16 lanes of one blake2b digest per
+# shingle, split into 8 bands of 2 rows; candidates are confirmed by exact Jaccard.
+NEWS_MINHASH_LANES = struct.Struct("<16I")
+NEWS_LSH_ROWS = 2
+NEWS_DEDUP_THRESHOLD = float(os.getenv("NEWS_DEDUP_THRESHOLD", "0.7"))
+# Campaign parameters that do not change which article a link points to.
+NEWS_TRACKING_PARAM_RE = re.compile(r"utm_\w+|fbclid|gclid|mc_cid|mc_eid")
+
+# Raw title -> (shingles, numbers, MinHash signature) and raw link -> normalized link,
+# kept from the previous refresh so only titles and links new to the feed are processed.
+news_title_features: Dict[Any, Tuple[set, frozenset, Optional[Tuple[int, ...]]]] = {}
+news_link_keys: Dict[Any, Optional[str]] = {}
+
+
+def normalize_news_title(title: Any) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", str(title or "").lower())).strip()
+
+
+def normalize_news_link(link: Any) -> Optional[str]:
+    """Host (without www.), path and query of a link; the query often names the article."""
+    if not isinstance(link, str) or not link.strip():
+        return None
+    parsed = urllib.parse.urlsplit(link.strip())
+    host = parsed.netloc.lower()
+    host = host[4:] if host.startswith("www.") else host
+    query = urllib.parse.urlencode([
+        (key, value) for key, value in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+        if not NEWS_TRACKING_PARAM_RE.fullmatch(key.lower())
+    ])
+    return host + parsed.path.lower().rstrip("/") + ("?" + query if query else "")
 
-        items = data.get("data") if isinstance(data, dict) else data
-        if not isinstance(items, list):
-            logger.error("Unexpected news data format: expected a list")
-            return
 
-        # Drop obviously future-dated posts (scheduled events/feed anomalies).
-        now_utc = datetime.now(timezone.utc)
-        future_cutoff = now_utc + timedelta(hours=24)
-        filtered_items = []
-        dropped_future = 0
+def news_title_shingles(title: str) -> set:
+    """Word unigrams and bigrams; outlet suffixes and reworded tails only shift a few."""
+    words = title.split()
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def news_minhash(shingles: set, lane_cache: Dict[str, Tuple[int, ...]]) -> Tuple[int, ...]:
+    """Signature from one 64-byte digest per shingle; zip/min keep the lane minimums in C."""
+    lanes = []
+    for shingle in shingles:
+        lane = lane_cache.get(shingle)
+        if lane is None:
+            lane = NEWS_MINHASH_LANES.unpack(hashlib.blake2b(shingle.encode("utf-8"), digest_size=64).digest())
+            lane_cache[shingle] = lane
+        lanes.append(lane)
+    return tuple(map(min, zip(*lanes)))
+
+
+@traced("dedup")
+def collapse_duplicate_news(items: List[Any], timestamps: List[Optional[float]]) -> Tuple[List[Any], List[Optional[float]], int]:
+    """
+    Cluster items that share a normalized link or have near-identical titles and keep
+    one representative per story: the earliest published item, annotated with
+    cluster_size and the other members as aliases.
+    """
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
-        for item in items:
-            pub_dt = parse_news_datetime(item.get("pubDate")) if isinstance(item, dict) else None
-            if pub_dt and pub_dt > future_cutoff:
-                dropped_future += 1
+    def union(a: int, b: int):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    shingle_sets: List[set] = []
+    lane_cache: Dict[str, Tuple[int, ...]] = {}
+    features: Dict[Any, Tuple[set, frozenset, Optional[Tuple[int, ...]]]] = {}
+    link_keys: Dict[Any, Optional[str]] = {}
+    links: Dict[str, int] = {}
+    # Bucket hash -> first member, or a list once several items share it. Plain ints keep
+    # the ~8 buckets per item out of the garbage collector's way; a hash collision only
+    # adds a candidate that the exact Jaccard check rejects.
+    buckets: Dict[int, Union[int, List[int]]] = {}
+    for i, item in enumerate(items):
+        record = item if isinstance(item, dict) else {}
+        raw_link = record.get("link")
+        raw_link = raw_link if isinstance(raw_link, str) else None
+        if raw_link not in link_keys:
+            link_keys[raw_link] = news_link_keys[raw_link] if raw_link in news_link_keys else normalize_news_link(raw_link)
+        link = link_keys[raw_link]
+        if link:
+            if link in links:
+                union(links[link], i)
+            else:
+                links[link] = i
+
+        raw_title = record.get("title")
+        raw_title = raw_title if isinstance(raw_title, str) else str(raw_title or "")
+        feature = features.get(raw_title) or news_title_features.get(raw_title)
+        if feature is None:
+            title = normalize_news_title(raw_title)
+            shingles = news_title_shingles(title)
+            # Titles that only differ in a number ("Annual Review 2019/2020") are different stories.
+            numbers = frozenset(word for word in title.split() if word.isdigit())
+            feature = (shingles, numbers, news_minhash(shingles, lane_cache) if shingles else None)
+        features[raw_title] = feature
+        shingles, numbers, signature = feature
+        shingle_sets.append(shingles)
+        if signature is None:
+            continue
+        # The number set is part of every bucket key, so only items that may merge share one.
+        compared = set()
+        for band in range(0, len(signature), NEWS_LSH_ROWS):
+            key = hash((band, signature[band:band + NEWS_LSH_ROWS], numbers))
+            members = buckets.get(key)
+            if members is None:
+                buckets[key] = i
                 continue
-            filtered_items.append(item)
+            if isinstance(members, int):
+                members = buckets[key] = [members]
+            for other in members:
+                if other in compared or find(other) == find(i):
+                    continue
+                compared.add(other)
+                other_shingles = shingle_sets[other]
+                overlap = len(shingles & other_shingles)
+                if overlap / (len(shingles) + len(other_shingles) - overlap) >= NEWS_DEDUP_THRESHOLD:
+                    union(other, i)
+            members.append(i)
 
-        # Update cache
-        news_cache["data"] = filtered_items
-        news_cache["last_updated"] = datetime.fromtimestamp(news_file.stat().st_mtime).isoformat()
-        news_cache["last_file"] = news_file
-        news_cache["total_records"] = len(filtered_items)
-        
-        logger.info(
-            f"News cache refreshed with {news_cache['total_records']} records "
-            f"(dropped {dropped_future} future-dated entries)"
-        )
-    except Exception as e:
-        logger.error(f"Error refreshing news cache: {str(e)}")
+    news_title_features.clear()
+    news_title_features.update(features)
+    news_link_keys.clear()
+    news_link_keys.update(link_keys)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(items)):
+        clusters.setdefault(find(i), []).append(i)
+
+    kept_items: List[Any] = []
+    kept_timestamps: List[Optional[float]] = []
+    for members in clusters.values():
+        members.sort(key=lambda i: timestamps[i] if timestamps[i] is not None else float("inf"))
+        head = members[0]
+        item = items[head]
+        if isinstance(item, dict):
+            item = {
+                **item,
+                "cluster_size": len(members),
+                "aliases": [
+                    {key: items[i].get(key) for key in ("title", "link", "source", "pubDate")}
+                    for i in members[1:] if isinstance(items[i], dict)
+                ]
+            }
+        kept_items.append(item)
+        kept_timestamps.append(timestamps[head])
+
+    return kept_items, kept_timestamps, len(items) - len(kept_items)
+
+
+@traced("time_index")
+def build_news_time_index(items: List[Any], timestamps: List[Optional[float]]) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Sort items newest first (undated ones last) and index them by time.
+
+    The index stores negated timestamps in ascending order together with item
+    positions, overall and per lowercased source, so "newer than T" is one bisect.
+    """
+    order = sorted(range(len(items)), key=lambda i: -timestamps[i] if timestamps[i] is not None else float("inf"))
+    sorted_items = [items[i] for i in order]
+
+    all_keys = array("d")
+    sources: Dict[str, Tuple[array, array]] = {}
+    for position, i in enumerate(order):
+        ts = timestamps[i]
+        if ts is None:
+            break
+        all_keys.append(-ts)
+        source = items[i].get("source")
+        if isinstance(source, str) and source:
+            keys, positions = sources.setdefault(source.lower(), (array("d"), array("I")))
+            keys.append(-ts)
+            positions.append(position)
+
+    return sorted_items, {
+        "all": (all_keys, array("I", range(len(all_keys)))),
+        "sources": sources,
+    }
 
+@instrument_refresh("phishing", phishing_cache)
 async def refresh_phishing_data():
     """Refresh the phishing data cache"""
     try:
@@ -582,10 +2488,188 @@ async def refresh_phishing_data():
         logger.info(f"Phishing cache refreshed with {phishing_cache['total_records']} records")
     except Exception as e:
         logger.error(f"Error refreshing phishing cache: {str(e)}")
+        raise
+
+# Bit i of a DomainTable mask means the host appears in DOMAIN_SOURCES[i].
+DOMAIN_SOURCES = ("scam_db", "phishing_urls", "leaks")
+PHISHING_URL_FILES = (Path("data/phishing_urls/urls.txt"), Path("data/phishing_url_collector.txt"))
+DOMAIN_HASH_BITS = 0xFFFFFFFFFFFFFF00
+DOMAIN_HOST_RE = re.compile(r"[a-z0-9_-]+(\.[a-z0-9_-]+)+")
+# Platforms whose own host serves content of many unrelated users: a phishing URL on
+# them lists that URL, never the host. Subdomains (evil.github.io) are still hosts.
+DOMAIN_SHARED_HOSTS = frozenset({
+    "google.com", "docs.google.com", "drive.google.com", "sites.google.com", "forms.gle",
+    "storage.googleapis.com", "firebasestorage.googleapis.com", "ipfs.io", "cloudflare-ipfs.com",
+    "dweb.link", "t.co", "bit.ly", "tinyurl.com", "github.com", "github.io",
+    "raw.githubusercontent.com", "dropbox.com", "onedrive.live.com", "1drv.ms", "notion.site",
+    "pages.dev", "workers.dev", "vercel.app", "netlify.app", "web.app", "firebaseapp.com",
+    "herokuapp.com", "wixsite.com", "weebly.com", "blogspot.com", "linktr.ee", "telegra.ph",
+}) | {host.strip().lower() for host in os.getenv("DOMAIN_SHARED_HOSTS", "").split(",") if host.strip()}
+
+
+def normalize_host(value: Any) -> Optional[str]:
+    """Lowercase ASCII host of a URL or bare domain, without port, trailing dot or leading www."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        host = urllib.parse.urlsplit(value if "://" in value else "//" + value).hostname
+    except ValueError:
+        return None
+    if not host:
+        return None
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            return None
+    return host if DOMAIN_HOST_RE.fullmatch(host) else None
+
+
+def normalize_url_key(value: Any) -> Optional[str]:
+    """
+    host + path of a URL on a shared host, the key its URL-level listing is stored
+    under; None for other hosts or a bare host without a path.
+    """
+    host = normalize_host(value)
+    if host is None or host not in DOMAIN_SHARED_HOSTS:
+        return None
+    value = value.strip()
+    path = urllib.parse.urlsplit(value if "://" in value else "//" + value).path.rstrip("/")
+    return host + path if path else None
+
+
+def domain_key(host: str) -> int:
+    return int.from_bytes(hashlib.blake2b(host.encode("utf-8"), digest_size=8).digest(), "little") & DOMAIN_HASH_BITS
+
+
+class DomainTable:
+    """
+    Open-addressing hash table of hosts in one array("Q"): each slot holds the top 56
+    bits of the host's blake2b hash and an 8-bit source mask (0 marks an empty slot).
+    About 16 bytes per host; a false hit needs a 56-bit hash collision. URL-level
+    listings on shared hosts are keyed by host + path (see normalize_url_key).
+    """
+
+    def __init__(self, slots: Any = None, count: int = 0):
+        # A table mapped from the data bundle is read-only.
+        self.slots = array("Q", bytes(8 * 1024)) if slots is None else slots
+        self.count = count
+
+    def _find(self, key: int) -> int:
+        slots = self.slots
+        wrap = len(slots) - 1
+        i = (key >> 8) & wrap
+        while slots[i] and slots[i] & DOMAIN_HASH_BITS != key:
+            i = (i + 1) & wrap
+        return i
+
+    def add(self, host: str, bits: int) -> None:
+        if (self.count + 1) * 2 > len(self.slots):
+            old = self.slots
+            self.slots = array("Q", bytes(16 * len(old)))
+            for entry in old:
+                if entry:
+                    self.slots[self._find(entry & DOMAIN_HASH_BITS)] = entry
+        key = domain_key(host)
+        i = self._find(key)
+        if not self.slots[i]:
+            self.count += 1
+        self.slots[i] |= key | bits
+
+    def get(self, host: str) -> int:
+        """Source mask of host, 0 when absent."""
+        return self.slots[self._find(domain_key(host))] & 0xFF
+
+
+def domain_source_values() -> Dict[str, Any]:
+    """Iterables of raw hosts/URLs per source; sources without data are left out."""
+    sources: Dict[str, Any] = {}
+    index = bundle_phishing_index()
+    if index is not None:
+        sources["scam_db"] = bytes(index[0]).decode("utf-8").split("\n")
+    elif phishing_cache["data"] is not None:
+        sources["scam_db"] = phishing_cache["data"]
+    else:
+        try:
+            sources["scam_db"] = load_phishing_domains_from_disk()
+        except HTTPException:
+            pass
+
+    def url_lines():
+        for url_file in PHISHING_URL_FILES:
+            if url_file.exists():
+                with open(url_file, "r", encoding="utf-8", errors="replace") as f:
+                    yield from f
+    sources["phishing_urls"] = url_lines()
+
+    if leaks_cache["data"] is not None:
+        sources["leaks"] = (record.get("domain") for record in leaks_cache["data"] if isinstance(record, dict))
+    return sources
+
 
+def domain_source_tokens() -> List[Any]:
+    """Cheap change token over the files the reputation table is built from, leak.json last."""
+    tokens: List[Any] = []
+    for path in PHISHING_URL_FILES + (Path("data/phishing-scam-db.json"), get_feed_root_dir() / "leak.json"):
+        try:
+            tokens.append(list(file_version(path)))
+        except OSError:
+            tokens.append(None)
+    return tokens
+
+
+@instrument_refresh("domains", domain_reputation_cache)
+async def refresh_domain_reputation():
+    """Rebuild the domain reputation table when any of its sources changed"""
+    try:
+        # Leak hosts come from leaks_cache, which can still hold an older leak.json than
+        # the one on disk (a leaks job may be running alongside this one). The token
+        # names the version actually read, so the next refresh sees the difference.
+        tokens = domain_source_tokens()[:-1] + [leaks_cache["source_version"] if leaks_cache["data"] is not None else None]
+        if domain_reputation_cache["table"] is not None and tokens == domain_reputation_cache["source_tokens"]:
+            return
+
+        bundled = bundle_segment("domains")
+        meta = data_bundle["header"]["segments"]["domains"]["meta"] if bundled is not None else None
+        if meta is not None and meta["source_tokens"] == tokens:
+            table = DomainTable(bundled.cast("Q"), data_bundle["header"]["segments"]["domains"]["count"])
+            counts = meta["sources"]
+        else:
+            table = DomainTable()
+            counts = {}
+            for name, values in domain_source_values().items():
+                bit = 1 << DOMAIN_SOURCES.index(name)
+                counts[name] = 0
+                for value in values:
+                    host = normalize_host(value)
+                    if host is not None and name == "phishing_urls" and host in DOMAIN_SHARED_HOSTS:
+                        # One bad document must not flag docs.google.com for everyone.
+                        host = normalize_url_key(value)
+                    if host is not None:
+                        table.add(host, bit)
+                        counts[name] += 1
+
+        domain_reputation_cache["table"] = table
+        domain_reputation_cache["last_updated"] = datetime.now().isoformat()
+        domain_reputation_cache["total_records"] = table.count
+        domain_reputation_cache["sources"] = counts
+        domain_reputation_cache["source_tokens"] = tokens
+        logger.info(f"Domain reputation table rebuilt with {table.count} hosts ({counts})")
+    except Exception as e:
+        logger.error(f"Error refreshing domain reputation table: {str(e)}")
+        raise
+
+@instrument_refresh("cves", cve_cache, source_files=lambda: get_cve_files())
 async def refresh_cve_data():
     """Refresh the CVE data cache"""
     try:
+        if not feed_changes["cves"]["version"]:
+            # CVE deltas come from sync_cve_year_file diffs; start their log empty.
+            reset_feed_changes("cves")
         if LOW_MEMORY_MODE:
             # Keep only metadata; load CVEs per-request by year.
             cve_files = get_cve_files()
@@ -597,6 +2681,12 @@ async def refresh_cve_data():
             cve_cache["available_years"] = years
             cve_year_cache.clear()
             cve_year_cache_order.clear()
+            cve_year_versions.clear()
+            prune_cve_search_years()
+            # Searchable years are parsed one at a time and only their postings are kept.
+            for cve_file in cve_files:
+                if cve_file.stem in search_cve_years():
+                    load_cve_search_year(cve_file.stem, cve_file)
             logger.info(f"CVE metadata refreshed in low-memory mode across {len(years)} years")
             return
 
@@ -604,39 +2694,16 @@ async def refresh_cve_data():
         logger.info(f"Refreshing CVE cache from {len(cve_files)} files")
         
         all_cve_data = {}
+        versions = {}
+        year_files = {}
         for cve_file in cve_files:
             year = cve_file.stem  # Get year from filename (e.g., "2024" from "2024.json")
-            with open(cve_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Convert single object to list if needed
-                if not isinstance(data, list):
-                    data = [data]
-                
-                # Filter out rejected CVEs
-                filtered_data = []
-                for item in data:
-                    # Skip if description contains "Rejected reason"
-                    if "description" in item and isinstance(item["description"], str) and "Rejected reason" in item["description"]:
-                        continue
-                    
-                    # Skip if severity is "brak" or "none"
-                    if item.get("severity") in ["brak", "none"] or item.get("severity_en") in ["brak", "none"]:
-                        continue
-                    
-                    # Skip if score is null and severity is not set
-                    if item.get("score") is None and not item.get("severity"):
-                        continue
-                    
-                    filtered_data.append(item)
-                
-                if filtered_data:
-                    # Sort by publishedDate in descending order (newest first)
-                    filtered_data.sort(
-                        key=lambda x: x.get("publishedDate", ""),
-                        reverse=True
-                    )
-                    all_cve_data[year] = filtered_data
+            versions[year] = file_version(cve_file)
+            year_files[year] = cve_file
+            filtered_data = read_cve_year_file(cve_file)
+            ensure_cve_year_summary(cve_file, filtered_data)
+            if filtered_data:
+                all_cve_data[year] = filtered_data
         
         if not all_cve_data:
             logger.error("No valid CVE data found in files")
@@ -652,10 +2719,16 @@ async def refresh_cve_data():
         cve_cache["last_file"] = cve_files[-1]  # Use the last modified file
         cve_cache["total_records"] = sum(len(data) for data in sorted_data.values())
         cve_cache["available_years"] = sorted_years
+        cve_year_versions.clear()
+        cve_year_versions.update(versions)
+        prune_cve_search_years()
+        for year, year_data in sorted_data.items():
+            load_cve_search_year(year, year_files[year], year_data)
         
         logger.info(f"CVE cache refreshed with {cve_cache['total_records']} records across {len(sorted_data)} years")
     except Exception as e:
         logger.error(f"Error refreshing CVE cache: {str(e)}")
+        raise
 
 
 def load_phishing_domains_from_disk() -> List[str]:
@@ -667,6 +2740,7 @@ def load_phishing_domains_from_disk() -> List[str]:
     return data
 
 
+@traced("filter")
 def _filter_cve_items(data: Any) -> List[Dict[str, Any]]:
     if not isinstance(data, list):
         data = [data]
@@ -681,27 +2755,401 @@ def _filter_cve_items(data: Any) -> List[Dict[str, Any]]:
             continue
         filtered_data.append(item)
 
-    filtered_data.sort(key=lambda x: x.get("publishedDate", ""), reverse=True)
+    filtered_data.sort(key=cve_sort_key, reverse=True)
     return filtered_data
 
 
-def load_cve_year_data(year: str) -> List[Dict[str, Any]]:
+def cve_sort_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    """Total order of CVEs within a year; cve_id breaks publishedDate ties."""
+    return item.get("publishedDate") or "", item.get("cve_id") or ""
+
+
+def cve_resume_index(year_data: List[Dict[str, Any]], key: Tuple[str, str]) -> int:
+    """Binary search the newest-first list for the first record sorting after key."""
+    lo, hi = 0, len(year_data)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if cve_sort_key(year_data[mid]) >= key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def encode_cve_cursor(year: str, item: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just after item."""
+    raw = json.dumps([year, *cve_sort_key(item)], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cve_cursor(cursor: str) -> Tuple[str, Tuple[str, str]]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        year, published, cve_id = json.loads(raw)
+        if not all(isinstance(v, str) for v in (year, published, cve_id)):
+            raise ValueError("cursor parts must be strings")
+        return year, (published, cve_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@traced("load")
+def bundle_cve_year(cve_file: Path) -> Optional[BundleRecords]:
+    """Zero-copy records of a CVE year when the bundle holds a fresh copy of its file."""
+    segment = bundle_segment(f"cve/{cve_file.stem}", cve_file)
+    derived = bundle_derived(f"cve/{cve_file.stem}", cve_file) if segment is not None else None
+    if derived is None:
+        return None
+    return BundleRecords(segment, derived[0]["offsets"])
+
+
+def read_cve_year_file(cve_file: Path) -> Union[List[Dict[str, Any]], BundleRecords]:
+    """
+    Filtered, newest-first CVEs of one year file. A fresh bundle copy is served as
+    BundleRecords, so every worker shares the mapped year instead of decoding its own.
+    """
+    year_data = bundle_cve_year(cve_file)
+    if year_data is not None:
+        count_cache_event("data_bundle", "hit")
+        return year_data
+    count_cache_event("data_bundle", "miss")
+    cve_year_bytes_parsed["total"] += cve_file.stat().st_size
+    with open(cve_file, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    return _filter_cve_items(raw)
+
+
+def cve_year_record_count(year: str) -> int:
+    """
+    Number of filtered CVEs in a year without decoding it: from the held list, the
+    bundle, or the year's rollup, which is cached per file version (so a year is only
+    parsed for its count once after each change).
+    """
+    if not LOW_MEMORY_MODE:
+        return len(cve_year_records(year))
+    if year in cve_year_cache and cve_year_is_current(year):
+        return len(cve_year_cache[year])
+    files = get_cve_files(year=year)
+    info = bundle_segment_info(f"cve/{year}", files[0])
+    if info is not None:
+        return info["count"]
+    return ensure_cve_year_summary(files[0])["total"]
+
+
+def cve_year_records(year: str) -> Union[List[Dict[str, Any]], BundleRecords]:
+    """Filtered CVEs of a year from whichever cache the current memory mode uses."""
+    if LOW_MEMORY_MODE:
+        return load_cve_year_data(year)
+    if year in cve_cache["data"] and not cve_year_is_current(year):
+        reload_cve_year(year)
+    return cve_cache["data"].get(year, [])
+
+
+def cve_year_is_current(year: str) -> bool:
+    """Whether the cached list of a year still matches its file; one stat() per call."""
+    try:
+        return file_version(get_feed_root_dir() / "cve" / f"{year}.json") == cve_year_versions.get(year)
+    except OSError:
+        # A vanished file keeps serving the last good copy until the next full refresh.
+        return True
+
+
+def reload_cve_year(year: str) -> None:
+    """Re-read one year into the full-memory cache, leaving every other year untouched."""
+    cve_file = get_feed_root_dir() / "cve" / f"{year}.json"
+    version = file_version(cve_file)
+    year_data = read_cve_year_file(cve_file)
+    ensure_cve_year_summary(cve_file, year_data)
+
+    data = dict(cve_cache["data"])
+    if year_data:
+        data[year] = year_data
+    else:
+        data.pop(year, None)
+    sorted_years = sorted(data.keys(), reverse=True)
+    cve_cache["data"] = {y: data[y] for y in sorted_years}
+    cve_cache["total_records"] = sum(len(d) for d in cve_cache["data"].values())
+    cve_cache["available_years"] = sorted_years
+    cve_year_versions[year] = version
+    prune_cve_search_years()
+    load_cve_search_year(year, cve_file, year_data)
+    logger.info(f"Reloaded CVE year {year} with {len(year_data)} records")
+
+
+def invalidate_cve_year(year: str) -> None:
+    """Drop a rewritten year from the CVE caches; full-memory mode reloads it right away."""
+    if LOW_MEMORY_MODE:
+        cve_year_cache.pop(year, None)
+        if year in cve_year_cache_order:
+            cve_year_cache_order.remove(year)
+        cve_year_versions.pop(year, None)
+        years = cve_cache.get("available_years")
+        if years is not None and year not in years:
+            cve_cache["available_years"] = sorted(years + [year], reverse=True)
+    elif cve_cache["data"] is not None:
+        reload_cve_year(year)
+
+
+def held_cve_year_list(year: str) -> Optional[Union[List[Dict[str, Any]], BundleRecords]]:
+    """The records of a year (a list, or BundleRecords) if the current memory mode holds them."""
+    if LOW_MEMORY_MODE:
+        return cve_year_cache.get(year)
+    if cve_cache["data"] is None:
+        return None
+    return cve_cache["data"].get(year)
+
+
+def cve_snapshot_entry(item: Dict[str, Any]) -> Tuple[Optional[str], Tuple[str, str]]:
+    return item.get("lastModifiedDate"), cve_sort_key(item)
+
+
+def merge_cve_year_update(
+    year: str,
+    cve_file: Path,
+    raw_items: Any,
+    replaced_version: Optional[Tuple[int, int]] = None,
+) -> Optional[Tuple[List[Dict[str, Any]], List[str]]]:
+    """
+    Apply a freshly synced year file as a diff against the previous snapshot.
+
+    CVEs are matched by cve_id and compared by lastModifiedDate. Only inserted or
+    updated items are filtered; removals and insertions go through binary search in
+    the held newest-first list, and the year rollup is adjusted by the same delta.
+    The previous snapshot (or held list) is only trusted when it was taken from the
+    file version this sync replaced (replaced_version); anything else falls back to
+    invalidation, as do years not held in memory or without a usable rollup.
+    The same delta feeds the cves change log; without a previous snapshot it resets.
+    Returns that delta as (inserted or updated items, removed or superseded cve_ids),
+    or None when there was no previous snapshot to diff against.
+    """
+    if not isinstance(raw_items, list):
+        raw_items = [raw_items]
+    new_items = {item["cve_id"]: item for item in raw_items if isinstance(item, dict) and item.get("cve_id")}
+    year_data = held_cve_year_list(year)
+    held_version = cve_year_versions.get(year)
+    if held_version is None or replaced_version is None or tuple(held_version) != tuple(replaced_version):
+        # The held list describes some other copy of the file.
+        year_data = None
+    snapshot = cve_year_snapshots.get(year)
+    previous = None
+    if snapshot is not None and replaced_version is not None and snapshot["version"] == tuple(replaced_version):
+        previous = snapshot["items"]
+    elif year_data is not None:
+        previous = {item["cve_id"]: cve_snapshot_entry(item) for item in year_data if item.get("cve_id")}
+    cve_year_snapshots[year] = {
+        "version": file_version(cve_file),
+        "items": {cve_id: cve_snapshot_entry(item) for cve_id, item in new_items.items()}
+    }
+
+    delta = None
+    if previous is None:
+        reset_feed_changes("cves")
+    else:
+        removed = [cve_id for cve_id, entry in previous.items()
+                   if cve_id not in new_items or cve_snapshot_entry(new_items[cve_id])[0] != entry[0]]
+        added = _filter_cve_items([item for cve_id, item in new_items.items()
+                                   if cve_id not in previous or cve_snapshot_entry(item)[0] != previous[cve_id][0]])
+        kept = {item["cve_id"] for item in added}
+        log_feed_changes(
+            "cves",
+            added={item["cve_id"]: item for item in added if item["cve_id"] not in previous},
+            changed={item["cve_id"]: item for item in added if item["cve_id"] in previous},
+            removed=[cve_id for cve_id in removed if cve_id not in kept],
+        )
+        delta = (added, removed)
+
+    # The held list and rollup must both describe the file this sync replaced.
+    summary = cve_summary_cache.get(year)
+    if (year_data is None or previous is None or summary is None or held_version is None
+            or summary["source_version"] != list(held_version) or len(new_items) != len(raw_items)):
+        store_cve_year_summary(cve_file, _filter_cve_items(raw_items))
+        invalidate_cve_year(year)
+        return delta
+
+    if isinstance(year_data, BundleRecords):
+        # The shared mapped copy is read-only; this worker's own list starts here, at the
+        # first change that makes the year diverge from the bundle.
+        year_data = list(year_data)
+        (cve_year_cache if LOW_MEMORY_MODE else cve_cache["data"])[year] = year_data
+    for cve_id in removed:
+        # The held item sits just before the first key below its snapshot key.
+        index = cve_resume_index(year_data, previous[cve_id][1]) - 1
+        if index >= 0 and year_data[index].get("cve_id") == cve_id:
+            count_cve_in_summary(summary, year_data.pop(index), -1)
+    for item in added:
+        year_data.insert(cve_resume_index(year_data, cve_sort_key(item)), item)
+        count_cve_in_summary(summary, item, 1)
+
+    persist_cve_year_summary(cve_file, summary)
+    cve_year_versions[year] = file_version(cve_file)
+    if not LOW_MEMORY_MODE:
+        cve_cache["total_records"] = sum(len(d) for d in cve_cache["data"].values())
+    logger.info(f"Merged CVE year {year}: {len(removed)} removed or superseded, {len(added)} inserted")
+    return delta
+
+
+def load_cve_year_data(year: str) -> Union[List[Dict[str, Any]], BundleRecords]:
     if year in cve_year_cache:
-        return cve_year_cache[year]
+        if cve_year_is_current(year):
+            count_cache_event("cve_year_cache", "hit")
+            return cve_year_cache[year]
+        cve_year_cache.pop(year, None)
+        cve_year_cache_order.remove(year)
+        count_cache_event("cve_year_cache", "eviction")
+    count_cache_event("cve_year_cache", "miss")
 
     files = get_cve_files(year=year)
-    with open(files[0], 'r', encoding='utf-8') as f:
-        raw = json.load(f)
-    year_data = _filter_cve_items(raw)
+    version = file_version(files[0])
+    year_data = read_cve_year_file(files[0])
+    ensure_cve_year_summary(files[0], year_data)
 
     cve_year_cache[year] = year_data
+    cve_year_versions[year] = version
     cve_year_cache_order.append(year)
     if len(cve_year_cache_order) > MAX_CVE_YEARS_IN_MEMORY:
         evicted = cve_year_cache_order.pop(0)
         cve_year_cache.pop(evicted, None)
+        cve_year_versions.pop(evicted, None)
+        count_cache_event("cve_year_cache", "eviction")
 
     return year_data
 
+
+CVE_SCORE_BUCKETS = 10
+
+
+def compute_cve_year_summary(year_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counts by severity_en, a unit-width score histogram and publications per month."""
+    summary = {
+        "total": 0,
+        "by_severity": {},
+        "score_histogram": [0] * CVE_SCORE_BUCKETS,
+        "unscored": 0,
+        "monthly": {},
+    }
+    for item in year_data:
+        count_cve_in_summary(summary, item, 1)
+    return summary
+
+
+def count_cve_in_summary(summary: Dict[str, Any], item: Dict[str, Any], delta: int) -> None:
+    """Add (delta=1) or remove (delta=-1) one CVE's contribution to a year rollup."""
+    summary["total"] += delta
+
+    by_severity = summary["by_severity"]
+    severity = item.get("severity_en") or "unknown"
+    by_severity[severity] = by_severity.get(severity, 0) + delta
+    if not by_severity[severity]:
+        del by_severity[severity]
+
+    score = item.get("score")
+    if isinstance(score, (int, float)) and not isinstance(score, bool) and 0 <= score <= 10:
+        summary["score_histogram"][min(int(score), CVE_SCORE_BUCKETS - 1)] += delta
+    else:
+        summary["unscored"] += delta
+
+    published = item.get("publishedDate")
+    if isinstance(published, str) and len(published) >= 7:
+        monthly = summary["monthly"]
+        month = published[:7]
+        monthly[month] = monthly.get(month, 0) + delta
+        if not monthly[month]:
+            del monthly[month]
+
+
+def cve_summary_path(cve_file: Path) -> Path:
+    return cve_file.with_name(f"{cve_file.stem}.summary.json")
+
+
+def store_cve_year_summary(cve_file: Path, year_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compute a year's rollup, cache it and persist it tagged with the year file's version."""
+    return persist_cve_year_summary(cve_file, compute_cve_year_summary(year_data))
+
+
+def persist_cve_year_summary(cve_file: Path, summary: Dict[str, Any]) -> Dict[str, Any]:
+    summary["source_version"] = list(file_version(cve_file))
+    cve_summary_cache[cve_file.stem] = summary
+
+    target = cve_summary_path(cve_file)
+    tmp_path = target.with_name(target.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, separators=(",", ":"))
+        os.replace(tmp_path, target)
+    except OSError as e:
+        logger.warning(f"Could not persist CVE summary {target}: {str(e)}")
+    return summary
+
+
+def ensure_cve_year_summary(cve_file: Path, year_data: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Rollup of one CVE year, recomputed only when the year file changed.
+
+    Lookup order is memory, then the persisted summary file, then the year data
+    (read from disk unless the caller already holds it).
+    """
+    summary = cached_cve_year_summary(cve_file)
+    if summary is not None:
+        return summary
+    count_cache_event("cve_summary_cache", "miss")
+
+    if year_data is None:
+        year_data = read_cve_year_file(cve_file)
+    return store_cve_year_summary(cve_file, year_data)
+
+
+def cached_cve_year_summary(cve_file: Path) -> Optional[Dict[str, Any]]:
+    """A year's rollup from memory or its persisted file, if it matches the year file."""
+    version = list(file_version(cve_file))
+    summary = cve_summary_cache.get(cve_file.stem)
+    if summary is not None and summary["source_version"] == version:
+        count_cache_event("cve_summary_cache", "hit")
+        return summary
+
+    try:
+        with open(cve_summary_path(cve_file), "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        if summary.get("source_version") == version:
+            cve_summary_cache[cve_file.stem] = summary
+            count_cache_event("cve_summary_cache", "disk_hit")
+            return summary
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def current_cve_year_list(year: str) -> Optional[Union[List[Dict[str, Any]], BundleRecords]]:
+    """The held records of a year, only while they still match its file."""
+    year_data = held_cve_year_list(year)
+    return year_data if year_data is not None and cve_year_is_current(year) else None
+
+
+def merge_cve_summaries(summaries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    total = 0
+    unscored = 0
+    by_severity: Dict[str, int] = {}
+    score_histogram = [0] * CVE_SCORE_BUCKETS
+    monthly: Dict[str, int] = {}
+    for summary in summaries.values():
+        total += summary["total"]
+        unscored += summary["unscored"]
+        for severity, count in summary["by_severity"].items():
+            by_severity[severity] = by_severity.get(severity, 0) + count
+        for bucket, count in enumerate(summary["score_histogram"]):
+            score_histogram[bucket] += count
+        for month, count in summary["monthly"].items():
+            monthly[month] = monthly.get(month, 0) + count
+    return {
+        "total": total,
+        "by_severity": dict(sorted(by_severity.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "score_histogram": [
+            {"min": bucket, "max": bucket + 1, "count": count}
+            for bucket, count in enumerate(score_histogram)
+        ],
+        "unscored": unscored,
+        "monthly": [{"month": month, "count": monthly[month]} for month in sorted(monthly)],
+    }
+
 def get_web3_releases_file():
     """Get the Web3 releases JSON file"""
     try:
@@ -723,15 +3171,30 @@ def get_web3_releases_file():
         logger.error(f"Error in get_web3_releases_file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error finding Web3 releases file: {str(e)}")
 
+@instrument_refresh("web3-releases", web3_releases_cache)
 async def refresh_web3_releases_data():
     """Refresh the Web3 releases data cache"""
     try:
         releases_file = get_web3_releases_file()
         logger.info(f"Refreshing Web3 releases cache from file: {releases_file}")
         
-        with open(releases_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            logger.info(f"Loaded JSON data: {str(data.keys())}")
+        bundled = bundle_feed("web3_releases", releases_file)
+        if bundled is not None:
+            releases_data = bundled["records"]
+            web3_releases_cache["data"] = releases_data
+            web3_releases_cache["last_updated"] = bundled["meta"]["last_updated"]
+            web3_releases_cache["last_file"] = releases_file
+            web3_releases_cache["total_records"] = len(releases_data)
+            web3_releases_cache["encoded"] = bundled["body"]
+            web3_releases_cache["sort_orders"] = bundled["sort"]
+            search_indexes["web3-releases"] = bundled["search"]
+            record_feed_changes("web3-releases", releases_data, bundled)
+            logger.info(f"Web3 releases cache refreshed with {len(releases_data)} records from data bundle")
+            return
+        else:
+            with open(releases_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                logger.info(f"Loaded JSON data: {str(data.keys())}")
         
         if not data:
             logger.error("Invalid data format in Web3 releases JSON file - data is empty")
@@ -745,6 +3208,10 @@ async def refresh_web3_releases_data():
             web3_releases_cache["last_updated"] = datetime.now().isoformat()
             web3_releases_cache["last_file"] = releases_file
             web3_releases_cache["total_records"] = data.get("total_records", len(releases_data))
+            web3_releases_cache["encoded"] = None
+            web3_releases_cache["sort_orders"] = build_sort_orders(releases_data, WEB3_RELEASES_SORT_FIELDS)
+            update_search_index("web3-releases", releases_data)
+            record_feed_changes("web3-releases", releases_data)
             
             logger.info(f"Web3 releases cache refreshed with {web3_releases_cache['total_records']} records")
         else:
@@ -754,24 +3221,480 @@ async def refresh_web3_releases_data():
     except Exception as e:
         logger.error(f"Error refreshing Web3 releases cache: {str(e)}")
         logger.exception("Full traceback:")
+        raise
+
+async def build_data_bundle(target: Path = DATA_BUNDLE_PATH) -> Dict[str, Any]:
+    """
+    Normalize every feed from its raw files and write one versioned bundle.
+
+    Layout: magic, 8-byte aligned segments, JSON header, fixed-size trailer. Each
+    segment records the (mtime_ns, size) of its source so readers can skip stale ones.
+    """
+    data_bundle["disabled"] = True
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + ".tmp")
+        segments: Dict[str, Dict[str, Any]] = {}
+
+        with open(tmp_path, "wb") as out:
+            out.write(DATA_BUNDLE_MAGIC)
+
+            def add_segment(name: str, payload: bytes, source: Optional[Path], count: int, **extra):
+                out.write(b"\0" * (-out.tell() % 8))
+                segments[name] = {
+                    "offset": out.tell(),
+                    "length": len(payload),
+                    "source": source.as_posix() if source is not None else None,
+                    "source_version": list(file_version(source)) if source is not None else None,
+                    "count": count,
+                    **extra
+                }
+                out.write(payload)
+
+            def add_derived(name: str, tree: Dict[str, Any], source: Optional[Path], meta: Any = None, **extra):
+                """Arrays of tree in one segment; bundle_derived maps them back without copying."""
+                payload = bytearray()
+                layout = bundle_array_layout(tree, payload)
+                add_segment(f"{name}/derived", bytes(payload), source, 0, layout=layout, meta=meta or {}, **extra)
+
+            def add_feed(name: str, feed: str, cache: Dict[str, Any], tree: Dict[str, Any], meta: Any = None, **extra):
+                """Full response with per-record offsets, change-feed digests and precomputed structures."""
+                body, offsets = encode_bundle_feed(
+                    {"last_updated": cache["last_updated"], "total_records": cache["total_records"]},
+                    cache["data"]
+                )
+                add_segment(name, body, cache["last_file"], len(cache["data"]), **extra)
+                tree = {"offsets": offsets, **feed_digest_arrays(feed), **tree}
+                if feed in search_indexes:
+                    tree["search"] = postings_arrays(search_indexes[feed]["postings"])
+                add_derived(name, tree, cache["last_file"], meta, **extra)
+
+            async def refreshed(refresh) -> bool:
+                """Run a refresh; a feed that fails to load is left out of the bundle."""
+                try:
+                    await refresh()
+                    return True
+                except Exception as e:
+                    logger.warning(f"Leaving {refresh.__name__} out of the data bundle: {str(e)}")
+                    return False
+
+            # Every feed is refreshed from its raw files, then stored as its response body
+            # plus the sort orders, indexes and digests a worker would otherwise rebuild.
+            if await refreshed(refresh_rekt_data) and rekt_cache["data"] is not None:
+                add_feed("rekt", "web3-threats", rekt_cache, {
+                    "sort": rekt_cache["sort_orders"],
+                    "indexes": {param: postings_arrays(index) for param, index in rekt_cache["indexes"].items()},
+                    "date_keys": rekt_cache["date_keys"],
+                }, {"stats": rekt_cache["stats"]})
+
+            if await refreshed(refresh_eol_data) and eol_cache["data"] is not None:
+                add_segment("eol", feed_response_body(eol_cache), eol_cache["last_file"], eol_cache["total_records"])
+                add_derived("eol", {"sort": eol_cache["sort_orders"], **feed_digest_arrays("eol")}, eol_cache["last_file"])
+
+            if await refreshed(refresh_leaks_data) and leaks_cache["data"] is not None:
+                add_feed("leaks", "leaks", leaks_cache, {"sort": leaks_cache["sort_orders"]})
+
+            # News is stored after the future-date filter, so it expires when the first
+            # dropped item falls due (fresh_until).
+            if await refreshed(refresh_news_data) and news_cache["data"] is not None:
+                add_feed(
+                    "news", "news", news_cache,
+                    {"sort": news_cache["sort_orders"], "time_index": news_cache["time_index"]},
+                    news_cache["collapse_stats"], fresh_until=news_cache["fresh_until"]
+                )
+
+            if await refreshed(refresh_web3_releases_data) and web3_releases_cache["data"] is not None:
+                add_feed(
+                    "web3_releases", "web3-releases", web3_releases_cache,
+                    {"sort": web3_releases_cache["sort_orders"]},
+                    {"last_updated": web3_releases_cache["last_updated"]}
+                )
+
+            # One year at a time keeps peak memory at the size of the largest year.
+            try:
+                cve_files = sorted(get_cve_files())
+            except HTTPException:
+                cve_files = []
+            primary, secondary, _ = SEARCH_FIELDS["cves"]
+            for cve_file in cve_files:
+                year_data = read_cve_year_file(cve_file)
+                body, offsets = encode_bundle_records(year_data, b"[", b"]")
+                add_segment(f"cve/{cve_file.stem}", body, cve_file, len(year_data))
+                postings = build_search_index(year_data, primary, secondary)["postings"]
+                add_derived(f"cve/{cve_file.stem}", {"offsets": offsets, "search": postings_arrays(postings)}, cve_file)
+                del year_data, body, postings
+
+            # Phishing domains become a sorted blob plus uint32 offsets for binary search.
+            try:
+                phishing_file = get_phishing_file()
+                domains = sorted({
+                    d.strip().lower() for d in load_phishing_domains_from_disk()
+                    if isinstance(d, str) and d.strip()
+                })
+            except HTTPException:
+                domains = []
+            if domains:
+                blob = bytearray()
+                offsets = array("I")
+                for domain in domains:
+                    offsets.append(len(blob))
+                    blob += domain.encode("utf-8") + b"\n"
+                offsets.append(len(blob))
+                add_segment("phishing/domains", bytes(blob), phishing_file, len(domains))
+                add_segment("phishing/offsets", offsets.tobytes(), phishing_file, len(domains))
+
+            # The reputation table has several sources; its change token is their versions.
+            if await refreshed(refresh_domain_reputation) and domain_reputation_cache["table"] is not None:
+                table = domain_reputation_cache["table"]
+                add_segment("domains", table.slots.tobytes(), None, table.count, meta={
+                    "source_tokens": domain_reputation_cache["source_tokens"],
+                    "sources": domain_reputation_cache["sources"],
+                })
+
+            sources = {name: info["source_version"] for name, info in segments.items()}
+            header = {
+                "format": DATA_BUNDLE_FORMAT_VERSION,
+                "code_version": DATA_BUNDLE_CODE_VERSION,
+                "bundle_version": hashlib.sha256(
+                    (DATA_BUNDLE_CODE_VERSION + json.dumps(sources, sort_keys=True)).encode("utf-8")
+                ).hexdigest()[:16],
+                "built_at": datetime.now().isoformat(),
+                "segments": segments
+            }
+            header_bytes = encode_json(header)
+            header_offset = out.tell()
+            out.write(header_bytes)
+            out.write(DATA_BUNDLE_TRAILER.pack(header_offset, len(header_bytes), DATA_BUNDLE_MAGIC))
+
+        os.replace(tmp_path, target)
+        logger.info(f"Wrote data bundle {header['bundle_version']} with {len(segments)} segments to {target}")
+        return header
+    finally:
+        data_bundle["disabled"] = False
+
+HEAVY_MEMORY_BUDGET_MB = int(os.getenv("HEAVY_MEMORY_BUDGET_MB", "160"))
+HEAVY_QUEUE_TIMEOUT_SECONDS = float(os.getenv("HEAVY_QUEUE_TIMEOUT_SECONDS", "10"))
+HEAVY_MAX_WAITERS = int(os.getenv("HEAVY_MAX_WAITERS", "16"))
+# Rough in-memory size of parsed JSON relative to its file size (dicts, strs, lists).
+JSON_PARSE_EXPANSION = 6
+
+
+class MemoryBudget:
+    """
+    Admission control for requests that materialize large datasets.
+
+    Each admitted request holds its estimated cost until it finishes. Requests that do
+    not fit wait in FIFO order for up to HEAVY_QUEUE_TIMEOUT_SECONDS and are shed with
+    503 + Retry-After after that, or straight away when HEAVY_MAX_WAITERS are already
+    queued. A single request larger than the whole budget still runs, alone.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self.in_use = 0
+        self.waiters = 0
+        self.condition = asyncio.Condition()
+        self.outcomes = {"admitted": 0, "queued": 0, "shed": 0}
+
+    def fits(self, cost: int) -> bool:
+        return self.in_use == 0 or self.in_use + cost <= self.budget
+
+    def shed(self, name: str) -> HTTPException:
+        self.outcomes["shed"] += 1
+        retry_after = max(1, int(HEAVY_QUEUE_TIMEOUT_SECONDS))
+        logger.warning(f"Shedding {name}: {self.in_use} of {self.budget} budget bytes in use, {self.waiters} waiting")
+        return HTTPException(
+            status_code=503,
+            detail="Server is busy with memory-heavy requests, retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def acquire(self, cost: int, name: str) -> None:
+        async with self.condition:
+            if not self.fits(cost) or self.waiters:
+                if self.waiters >= HEAVY_MAX_WAITERS:
+                    raise self.shed(name)
+                self.outcomes["queued"] += 1
+                self.waiters += 1
+                try:
+                    await asyncio.wait_for(self.condition.wait_for(lambda: self.fits(cost)), HEAVY_QUEUE_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    raise self.shed(name)
+                finally:
+                    self.waiters -= 1
+            self.in_use += cost
+            self.outcomes["admitted"] += 1
+
+    async def release(self, cost: int) -> None:
+        async with self.condition:
+            self.in_use -= cost
+            self.condition.notify_all()
+
+
+memory_budget = MemoryBudget(HEAVY_MEMORY_BUDGET_MB * 2**20)
+
+
+def heavy_endpoint(cost_fn):
+    """Run an endpoint under memory_budget when cost_fn(**params) estimates a non-zero cost."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cost = cost_fn(**kwargs)
+            if not cost:
+                return await func(*args, **kwargs)
+            await memory_budget.acquire(cost, func.__name__)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                await memory_budget.release(cost)
+        return wrapper
+    return decorator
+
+
+def json_parse_cost(path: Path) -> int:
+    try:
+        return path.stat().st_size * JSON_PARSE_EXPANSION
+    except OSError:
+        return 0
+
+
+def cve_request_cost(year: str = None, **_) -> int:
+    """Parse cost of the CVE years a request may have to load; resident data costs nothing."""
+    if not LOW_MEMORY_MODE:
+        return 0
+    try:
+        files = get_cve_files(year=year) if year else get_cve_files()
+    except HTTPException:
+        return 0
+    # Years are parsed one after another, so the largest unloaded year bounds the peak.
+    return max((json_parse_cost(f) for f in files if f.stem not in cve_year_cache), default=0)
+
+
+def cve_stats_request_cost(year: str = None, **_) -> int:
+    """Parse cost of the CVE years /cves/stats has to summarize; current rollups cost nothing."""
+    try:
+        files = get_cve_files(year=year) if year else get_cve_files()
+    except HTTPException:
+        return 0
+    # Years are summarized one after another, so the largest unsummarized one bounds the peak.
+    return max((
+        json_parse_cost(f) for f in files
+        if cached_cve_year_summary(f) is None and current_cve_year_list(f.stem) is None
+    ), default=0)
+
+
+def phishing_request_cost(**_) -> int:
+    """Loading the phishing JSON per request is only needed without the bundle or cache."""
+    if phishing_cache["data"] is not None or bundle_phishing_index() is not None:
+        return 0
+    try:
+        return json_parse_cost(get_phishing_file())
+    except HTTPException:
+        return 0
+
+
+# Held for the life of the leader process; the OS drops the lock if it dies.
+refresh_leader: Dict[str, Any] = {
+    "file": None,
+    "since": None
+}
+
+
+def is_refresh_leader() -> bool:
+    """Take or keep the cross-worker refresh lock. Every process leads unless SHARED_REFRESH is set."""
+    if not SHARED_REFRESH or fcntl is None:
+        return True
+    if refresh_leader["file"] is not None:
+        return True
+    try:
+        REFRESH_LEADER_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(REFRESH_LEADER_LOCK_PATH, "a+")
+    except OSError as e:
+        logger.warning(f"Could not open refresh lock {REFRESH_LEADER_LOCK_PATH}, refreshing locally: {str(e)}")
+        return True
+    try:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    lock_file.truncate(0)
+    lock_file.write(f"{os.getpid()}\n")
+    lock_file.flush()
+    refresh_leader["file"] = lock_file
+    refresh_leader["since"] = datetime.now().isoformat()
+    logger.info(f"Worker {os.getpid()} is now the refresh leader")
+    return True
+
+
+# Bundle segment -> function returning the raw file it should currently be built from.
+BUNDLE_SOURCE_FILES = {
+    "rekt": get_latest_rekt_file,
+    "eol": get_latest_eol_file,
+    "leaks": get_leaks_file,
+    "news": get_news_file,
+    "web3_releases": get_web3_releases_file,
+    "phishing/domains": get_phishing_file,
+}
+
+
+def data_bundle_is_stale() -> bool:
+    """True when the bundle is missing, unusable, or any feed file changed since it was built."""
+    bundle = get_data_bundle()
+    if bundle is None:
+        return True
+    segments = bundle["header"]["segments"]
+    expected = {}
+    for name, get_source in BUNDLE_SOURCE_FILES.items():
+        try:
+            expected[name] = get_source()
+        except HTTPException:
+            continue
+    try:
+        for cve_file in get_cve_files():
+            expected[f"cve/{cve_file.stem}"] = cve_file
+    except HTTPException:
+        pass
+    for name, source in expected.items():
+        info = segments.get(name)
+        if info is None or info["source"] != source.as_posix():
+            return True
+        try:
+            if list(file_version(source)) != info["source_version"]:
+                return True
+        except OSError:
+            return True
+    if any(info.get("fresh_until") is not None and time.time() >= info["fresh_until"] for info in segments.values()):
+        return True
+    domains = segments.get("domains")
+    return domains is None or domains["meta"]["source_tokens"] != domain_source_tokens()
+
+
+BUILD_DATA_BUNDLE_SCRIPT = Path(__file__).resolve().with_name("build_data_bundle.py")
+
+
+async def publish_data_bundle() -> None:
+    """
+    Rebuild the bundle in a child process, so the leader's event loop keeps serving and
+    its caches never hold the fully decoded feeds the build needs.
+    """
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, str(BUILD_DATA_BUNDLE_SCRIPT), "--output", str(DATA_BUNDLE_PATH),
+        stdout=asyncio.subprocess.DEVNULL
+    )
+    if await process.wait() != 0:
+        raise RuntimeError(f"{BUILD_DATA_BUNDLE_SCRIPT.name} exited with status {process.returncode}")
+
+
+async def sync_and_publish() -> None:
+    """Leader-only part of a refresh cycle: pull upstream data and republish the bundle."""
+    if not is_refresh_leader():
+        return
+    sync_cve_year_file(datetime.now().year)
+    if SHARED_REFRESH and data_bundle_is_stale():
+        try:
+            # Written to a temp file and renamed, so followers never map a partial bundle.
+            await publish_data_bundle()
+        except Exception as e:
+            logger.error(f"Error publishing data bundle: {str(e)}")
+
+
+# Feed name -> refresh coroutine, in startup order.
+REFRESH_FUNCTIONS = {
+    "rekt": refresh_rekt_data,
+    "eol": refresh_eol_data,
+    "leaks": refresh_leaks_data,
+    "news": refresh_news_data,
+    "phishing": refresh_phishing_data,
+    # Built from the leaks cache, so it runs after leaks.
+    "domains": refresh_domain_reputation,
+    "cves": refresh_cve_data,
+    "web3-releases": refresh_web3_releases_data,
+}
+REFRESH_DEBOUNCE_SECONDS = float(os.getenv("REFRESH_DEBOUNCE_SECONDS", "2"))
+
+
+class RefreshCoordinator:
+    """
+    One refresh job per feed at a time.
+
+    A request while a job is waiting out its debounce delay merges into it; a request
+    while the refresh is running marks the feed pending, and the job runs exactly one
+    more refresh afterwards so data written mid-refresh is still picked up.
+    """
+
+    def __init__(self, functions: Dict[str, Any]):
+        self.functions = functions
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.status: Dict[str, Dict[str, Any]] = {
+            feed: {
+                "state": "idle",
+                "pending": False,
+                "runs": 0,
+                "coalesced": 0,
+                "last_requested": None,
+                "last_started": None,
+                "last_finished": None,
+                "last_duration_ms": None,
+                "last_error": None,
+            }
+            for feed in functions
+        }
+
+    def request(self, feed: str, debounce: float = REFRESH_DEBOUNCE_SECONDS) -> Tuple[asyncio.Task, bool]:
+        """Schedule a refresh of feed; returns its job and whether this request was merged into it."""
+        status = self.status[feed]
+        status["last_requested"] = datetime.now().isoformat()
+        task = self.tasks.get(feed)
+        if task is not None and not task.done():
+            status["coalesced"] += 1
+            if status["state"] == "running":
+                status["pending"] = True
+            return task, True
+        status["state"] = "scheduled"
+        task = self.tasks[feed] = asyncio.create_task(self._run(feed, debounce))
+        return task, False
+
+    async def _run(self, feed: str, debounce: float) -> None:
+        status = self.status[feed]
+        while True:
+            if debounce > 0:
+                await asyncio.sleep(debounce)
+            status["state"] = "running"
+            status["pending"] = False
+            status["last_started"] = datetime.now().isoformat()
+            started = time.perf_counter()
+            try:
+                await self.functions[feed]()
+                status["last_error"] = None
+            except Exception as e:
+                status["last_error"] = str(e)
+                logger.error(f"Refresh job {feed} failed: {str(e)}")
+            status["runs"] += 1
+            status["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            status["last_finished"] = datetime.now().isoformat()
+            if not status["pending"]:
+                status["state"] = "idle"
+                return
+
+    async def refresh(self, feed: str) -> None:
+        """Refresh now (or join the job already underway) and wait for it."""
+        task, _ = self.request(feed, debounce=0)
+        await asyncio.shield(task)
+
+
+refresh_coordinator = RefreshCoordinator(REFRESH_FUNCTIONS)
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize cache on startup"""
-    sync_cve_year_file(datetime.now().year)
-    await refresh_rekt_data()
-    await refresh_eol_data()
-    await refresh_leaks_data()
-    await refresh_news_data()
-    if PRELOAD_HEAVY_DATA:
-        await refresh_phishing_data()
-        await refresh_cve_data()
-    else:
+    await sync_and_publish()
+    if not PRELOAD_HEAVY_DATA:
         logger.info("Skipping heavy cache preload (phishing/cve) to reduce memory usage")
-        # Still initialize metadata to keep endpoint responses consistent.
-        await refresh_phishing_data()
-        await refresh_cve_data()
-    await refresh_web3_releases_data()
+    # In low-memory mode phishing/cve refreshes only initialize metadata, which keeps
+    # endpoint responses consistent.
+    for feed in REFRESH_FUNCTIONS:
+        await refresh_coordinator.refresh(feed)
     # Start background task to refresh cache periodically (every 5 minutes)
     asyncio.create_task(periodic_refresh())
 
@@ -779,67 +3702,331 @@ async def periodic_refresh():
     """Periodically refresh the cache"""
     while True:
         await asyncio.sleep(300)  # 5 minutes
-        sync_cve_year_file(datetime.now().year)
-        await refresh_rekt_data()
-        await refresh_eol_data()
-        await refresh_leaks_data()
-        await refresh_news_data()
-        if PRELOAD_HEAVY_DATA:
-            await refresh_phishing_data()
-        await refresh_cve_data()
-        await refresh_web3_releases_data()
+        await sync_and_publish()
+        for feed in REFRESH_FUNCTIONS:
+            if feed == "phishing" and not PRELOAD_HEAVY_DATA:
+                continue
+            await refresh_coordinator.refresh(feed)
 
 @app.get("/web3-threats")
-async def get_rekt_data():
-    """Get the latest rekt database data from cache"""
+async def get_rekt_data(
+    page: int = None,
+    page_size: int = None,
+    fields: str = None,
+    sort: str = None,
+    chain: str = None,
+    scam_type: str = None,
+    token_address: str = None,
+    project: str = None,
+    date_from: str = None,
+    date_to: str = None,
+):
+    """
+    Get the latest rekt database data from cache.
+
+    Without query parameters the full feed is returned unchanged. page/page_size
+    paginate, fields=a,b projects each record and sort=field or sort=-field orders it.
+    chain, scam_type, token_address and project (normalized exact matches) and the
+    inclusive date_from/date_to range are answered from indexes built on refresh.
+    """
     if rekt_cache["data"] is None:
         raise HTTPException(status_code=503, detail="Data not yet loaded")
+
+    filters = {"chain": chain, "scam_type": scam_type, "token_address": token_address, "project": project}
+    if any(v is not None for v in filters.values()) or date_from is not None or date_to is not None:
+        positions = query_rekt_index(filters, date_from, date_to)
+        return feed_page_response(rekt_cache, page, page_size, fields, sort, positions=positions)
     
+    if page is None and page_size is None and fields is None and sort is None:
+        return encoded_feed_response(rekt_cache)
+    return feed_page_response(rekt_cache, page, page_size, fields, sort)
+
+@app.get("/web3-threats/stats")
+async def get_rekt_stats(top: int = 10):
+    """Precomputed loss aggregates of the current rekt snapshot"""
+    if rekt_cache.get("stats") is None:
+        raise HTTPException(status_code=503, detail="Data not yet loaded")
+    if top < 0 or top > REKT_STATS_TOP_MAX:
+        raise HTTPException(status_code=400, detail=f"top must be between 0 and {REKT_STATS_TOP_MAX}")
+
+    stats = rekt_cache["stats"]
     return {
         "last_updated": rekt_cache["last_updated"],
-        "total_records": rekt_cache["total_records"],
-        "data": rekt_cache["data"]
+        **stats,
+        "top_projects": stats["top_projects"][:top]
     }
 
 @app.get("/eol")
-async def get_eol_data():
-    """Get the latest EOL data from cache"""
+async def get_eol_data(page: int = None, page_size: int = None, fields: str = None, sort: str = None):
+    """
+    Get the latest EOL data from cache.
+
+    Without query parameters the full feed is returned unchanged. Otherwise products are
+    paginated (sort=product or -product) and fields=a,b projects every release cycle.
+    """
     if eol_cache["data"] is None:
         raise HTTPException(status_code=503, detail="EOL data not yet loaded")
     
+    if page is None and page_size is None and fields is None and sort is None:
+        return encoded_feed_response(eol_cache)
+
+    selected_fields = parse_fields_param(fields)
+    selected, meta = paginate_records(eol_cache["products"], eol_cache["sort_orders"], page, page_size, sort)
+    return Response(
+        content=encode_json({
+            "last_updated": eol_cache["last_updated"],
+            **meta,
+            "data": {
+                product: [project_record(cycle, selected_fields) for cycle in cycles]
+                for product, cycles in selected
+            }
+        }),
+        media_type="application/json"
+    )
+
+@app.get("/eol/expiring")
+async def get_expiring_eol(days: int = 30, include_expired_days: int = 0):
+    """
+    Release cycles reaching end of life within the next N days, soonest first.
+    include_expired_days=M also lists cycles that expired in the last M days.
+    """
+    if eol_cache.get("index") is None:
+        raise HTTPException(status_code=503, detail="EOL data not yet loaded")
+    if days < 0 or days > 3650 or include_expired_days < 0 or include_expired_days > 3650:
+        raise HTTPException(status_code=400, detail="days and include_expired_days must be between 0 and 3650")
+
+    today = datetime.now(timezone.utc).date()
+    start = bisect_left(eol_cache["eol_dates"], (today - timedelta(days=include_expired_days)).isoformat())
+    stop = bisect_right(eol_cache["eol_dates"], (today + timedelta(days=days)).isoformat())
+    cycles = [eol_cycle_view(product, cycle, today) for product, cycle in eol_cache["eol_date_refs"][start:stop]]
+
+    return {
+        "last_updated": eol_cache["last_updated"],
+        "as_of": today.isoformat(),
+        "days": days,
+        "total_records": len(cycles),
+        "data": cycles
+    }
+
+@app.get("/eol/status")
+async def get_eol_products_status(products: str):
+    """
+    Current status for a comma-separated list of products in one call.
+    A product counts as expired when its newest release cycle is expired.
+    """
+    if eol_cache.get("index") is None:
+        raise HTTPException(status_code=503, detail="EOL data not yet loaded")
+    requested = [p.strip() for p in products.split(",") if p.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="products must list at least one product")
+    if len(requested) > 1000:
+        raise HTTPException(status_code=400, detail="At most 1000 products per request")
+
+    today = datetime.now(timezone.utc).date()
+    results = []
+    for name in requested:
+        entry = lookup_eol_product(name)
+        if entry is None or not entry["cycles"]:
+            results.append({"query": name, "found": False})
+            continue
+        cycles = [eol_cycle_view(entry["product"], cycle, today) for cycle in entry["cycles"]]
+        latest = cycles[0]
+        results.append({
+            "query": name,
+            "found": True,
+            "product": entry["product"],
+            "latest_cycle": latest.get("cycle"),
+            "status": latest["status"],
+            "days_left": latest["days_left"],
+            "expired_cycles": [c.get("cycle") for c in cycles if c["status"] == "expired"],
+            "active_cycles": [c.get("cycle") for c in cycles if c["status"] == "active"],
+        })
+
+    return {
+        "last_updated": eol_cache["last_updated"],
+        "as_of": today.isoformat(),
+        "total_records": len(results),
+        "expired": [r["query"] for r in results if r.get("status") == "expired"],
+        "not_found": [r["query"] for r in results if not r["found"]],
+        "data": results
+    }
+
+MAX_INVENTORY_ROWS = 100000
+INVENTORY_CHUNK_ROWS = 500
+
+
+@app.post("/eol/inventory")
+async def check_eol_inventory(items: List[Any] = Body(...), format: str = "json"):
+    """
+    Check a software inventory (list of {"product", "cycle" or "version"} rows) against
+    the EOL index. Results are streamed in input order, as one JSON document or as
+    NDJSON lines with format=ndjson.
+    """
+    if eol_cache.get("cycle_index") is None:
+        raise HTTPException(status_code=503, detail="EOL data not yet loaded")
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+    if len(items) > MAX_INVENTORY_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_INVENTORY_ROWS} inventory rows per request")
+
+    today = datetime.now(timezone.utc).date()
+    last_updated = eol_cache["last_updated"]
+
+    def generate_ndjson():
+        for start in range(0, len(items), INVENTORY_CHUNK_ROWS):
+            chunk = items[start:start + INVENTORY_CHUNK_ROWS]
+            yield b"".join(encode_json(match_inventory_row(row, today)) + b"\n" for row in chunk)
+
+    def generate_json():
+        counts = {"found": 0, "not_found": 0, "expired": 0, "active": 0}
+        yield encode_json({"last_updated": last_updated, "as_of": today.isoformat()})[:-1] + b',"data":['
+        for start in range(0, len(items), INVENTORY_CHUNK_ROWS):
+            rows = []
+            for row in items[start:start + INVENTORY_CHUNK_ROWS]:
+                result = match_inventory_row(row, today)
+                counts["found" if result["found"] else "not_found"] += 1
+                if result.get("status") in counts:
+                    counts[result["status"]] += 1
+                rows.append(encode_json(result))
+            yield (b"," if start else b"") + b",".join(rows)
+        yield b'],"summary":' + encode_json({"total_records": len(items), **counts}) + b"}"
+
+    if format == "ndjson":
+        return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+    return StreamingResponse(generate_json(), media_type="application/json")
+
+@app.get("/eol/product/{product}")
+async def get_eol_product(product: str):
+    """All release cycles of one product with status computed at query time"""
+    if eol_cache.get("index") is None:
+        raise HTTPException(status_code=503, detail="EOL data not yet loaded")
+    entry = lookup_eol_product(product)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"No EOL data found for product {product}")
+
+    today = datetime.now(timezone.utc).date()
     return {
         "last_updated": eol_cache["last_updated"],
-        "total_records": eol_cache["total_records"],
-        "data": eol_cache["data"]
+        "as_of": today.isoformat(),
+        "product": entry["product"],
+        "data": [eol_cycle_view(entry["product"], cycle, today) for cycle in entry["cycles"]]
     }
 
 @app.get("/leaks")
-async def get_leaks_data():
-    """Get the latest leaks data from cache"""
+async def get_leaks_data(page: int = None, page_size: int = None, fields: str = None, sort: str = None):
+    """
+    Get the latest leaks data from cache.
+
+    Without query parameters the full feed is returned unchanged. page/page_size
+    paginate, fields=a,b projects each record and sort=field or sort=-field orders it.
+    """
     if leaks_cache["data"] is None:
         raise HTTPException(status_code=503, detail="Leaks data not yet loaded")
     
-    return {
-        "last_updated": leaks_cache["last_updated"],
-        "total_records": leaks_cache["total_records"],
-        "data": leaks_cache["data"]
-    }
+    if page is None and page_size is None and fields is None and sort is None:
+        return encoded_feed_response(leaks_cache)
+    return feed_page_response(leaks_cache, page, page_size, fields, sort)
 
 @app.get("/news")
-async def get_news_data():
-    """Get the latest news data from cache"""
+async def get_news_data(
+    page: int = None,
+    page_size: int = None,
+    fields: str = None,
+    sort: str = None,
+    since: str = None,
+    source: str = None,
+    limit: int = None,
+):
+    """
+    Get the latest news data from cache, newest first.
+
+    Without query parameters the full feed is returned unchanged. page/page_size
+    paginate, fields=a,b projects each record and sort=field or sort=-field orders it.
+    since= (ISO, RFC 2822 or epoch seconds), source= and limit= answer from the time
+    index instead: items published strictly after since, newest first, at most limit.
+    When more than limit items are newer than since, the oldest of them are returned
+    with has_more=true, so following next_since pages forward without skipping any.
+    Without since, has_more tells whether items older than the newest limit exist.
+    """
     if news_cache["data"] is None:
         raise HTTPException(status_code=503, detail="News data not yet loaded")
     
-    return {
-        "last_updated": news_cache["last_updated"],
-        "total_records": news_cache["total_records"],
-        "data": news_cache["data"]
-    }
+    if since is None and source is None and limit is None:
+        if page is None and page_size is None and fields is None and sort is None:
+            return encoded_feed_response(news_cache)
+        return feed_page_response(news_cache, page, page_size, fields, sort)
+
+    if page is not None or page_size is not None or sort is not None:
+        raise HTTPException(status_code=400, detail="Use limit instead of page/page_size/sort with since or source")
+    limit = 100 if limit is None else limit
+    if limit < 1 or limit > 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    selected_fields = parse_fields_param(fields)
+
+    if source is None:
+        keys, positions = news_cache["time_index"]["all"]
+    else:
+        keys, positions = news_cache["time_index"]["sources"].get(source.lower(), (array("d"), array("I")))
+
+    matched = len(keys)
+    start = 0
+    if since is not None:
+        since_dt = parse_news_since(since)
+        matched = bisect_left(keys, -since_dt.timestamp())
+        if matched > limit:
+            # Take the limit items just after since, but never split items sharing the
+            # newest returned timestamp, or the next since= would skip the rest of them.
+            # A page that is a single timestamp is returned whole, even beyond limit.
+            start = matched - limit
+            if keys[start - 1] == keys[start]:
+                start = bisect_right(keys, keys[start], 0, matched)
+                if start == matched:
+                    start = bisect_left(keys, keys[matched - limit], 0, matched)
+    stop = matched if since is not None else min(matched, limit)
+    # With since the page ends at since and older items were cut; without it, newer ones.
+    has_more = start > 0 if since is not None else stop < matched
+
+    data = [project_record(news_cache["data"][positions[i]], selected_fields) for i in range(start, stop)]
+    next_since = datetime.fromtimestamp(-keys[start], timezone.utc).isoformat() if stop > start else since
+    return Response(
+        content=encode_json({
+            "last_updated": news_cache["last_updated"],
+            "total_records": matched,
+            "since": since,
+            "source": source,
+            "limit": limit,
+            "next_since": next_since,
+            "has_more": has_more,
+            "data": data
+        }),
+        media_type="application/json"
+    )
+
+
+def parse_news_since(since: str) -> datetime:
+    raw = since.strip()
+    if re.fullmatch(r"\d+(\.\d+)?", raw):
+        return datetime.fromtimestamp(float(raw), timezone.utc)
+    parsed = parse_news_datetime(raw)
+    if parsed is None:
+        raise HTTPException(status_code=400, detail="since must be an ISO 8601, RFC 2822 or epoch timestamp")
+    return parsed
 
 @app.get("/get-web3-scam-domains")
+@heavy_endpoint(phishing_request_cost)
 async def get_web3_scam_domains():
     """Get 5 random domains from phishing scam database"""
+    index = bundle_phishing_index()
+    if index is not None:
+        total = len(index[1]) - 1
+        positions = random.sample(range(total), min(5, total))
+        domains = [bundle_phishing_domain(index, pos).decode("utf-8") for pos in positions]
+        return {
+            "last_updated": phishing_cache["last_updated"],
+            "total_records": len(domains),
+            "data": domains
+        }
+
     domains_source = phishing_cache["data"] if phishing_cache["data"] is not None else load_phishing_domains_from_disk()
     if not domains_source:
         raise HTTPException(status_code=503, detail="Phishing data not yet loaded")
@@ -853,8 +4040,17 @@ async def get_web3_scam_domains():
     }
 
 @app.get("/search")
+@heavy_endpoint(phishing_request_cost)
 async def search_domain(domain: str):
     """Search for a domain in the phishing scam database"""
+    index = bundle_phishing_index()
+    if index is not None:
+        return {
+            "domain": domain,
+            "exists": bundle_phishing_contains(index, domain),
+            "last_updated": phishing_cache["last_updated"]
+        }
+
     domains_source = phishing_cache["data"] if phishing_cache["data"] is not None else load_phishing_domains_from_disk()
     if not domains_source:
         raise HTTPException(status_code=503, detail="Phishing data not yet loaded")
@@ -867,27 +4063,376 @@ async def search_domain(domain: str):
         "last_updated": phishing_cache["last_updated"]
     }
 
+@app.get("/search/all")
+async def search_all(q: str, feeds: str = None, limit: int = 20):
+    """
+    Search CVEs, leaks, news, web3 threats and releases at once. Every word of q must
+    match (the last one as a prefix); hits are ranked by idf with title-like fields
+    weighted double. facets counts all matches per feed; feeds= restricts the search.
+    In low-memory mode only the newest SEARCH_CVE_YEARS CVE years are searchable.
+    """
+    if limit < 1 or limit > 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    selected = list(SEARCH_FIELDS) if feeds is None else [f.strip() for f in feeds.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in SEARCH_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"feeds must be a subset of: {', '.join(SEARCH_FIELDS)}")
+    words = SEARCH_TOKEN_RE.findall(q.lower())
+    terms = [word for word in words if word not in SEARCH_STOPWORDS]
+    if not terms:
+        raise HTTPException(status_code=400, detail="q must contain at least one searchable word")
+    # The last word is still being typed unless q ends in a space or a stopword.
+    prefix = None if q[-1:].isspace() or words[-1] in SEARCH_STOPWORDS else terms.pop()
+
+    facets = {feed: 0 for feed in selected}
+    candidates = []
+    for name, index in list(search_indexes.items()):
+        feed = name.split("/", 1)[0]
+        if feed not in facets:
+            continue
+        matches = search_index_matches(index, terms, prefix)
+        facets[feed] += len(matches)
+        # Within a feed earlier positions are newer, which breaks score ties.
+        candidates.extend(heapq.nlargest(limit, ((score, -position, name) for position, score in matches.items())))
+
+    results = [
+        {"feed": name.split("/", 1)[0], "relevance": round(score, 3), **search_hit(name, search_indexes[name], -neg_position)}
+        for score, neg_position, name in heapq.nlargest(limit, candidates)
+    ]
+    return Response(
+        content=encode_json({
+            "query": q,
+            "total": sum(facets.values()),
+            "facets": facets,
+            "cve_years": sorted((n.split("/", 1)[1] for n in search_indexes if n.startswith("cves/")), reverse=True),
+            "results": results
+        }),
+        media_type="application/json"
+    )
+
+@app.get("/domain/{host:path}")
+async def get_domain_reputation(host: str):
+    """
+    Every reputation source listing host or one of its parent domains, checked one
+    label suffix at a time (login.evil.com, evil.com). A URL is accepted as well; on a
+    shared host (docs.google.com, ipfs.io, ...) the URL itself is checked too, since
+    phishing URLs there are listed per URL and never by host.
+    """
+    table = domain_reputation_cache["table"]
+    if table is None:
+        raise HTTPException(status_code=503, detail="Domain reputation data not yet loaded")
+    normalized = normalize_host(host)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail="host must be a domain name or URL")
+
+    labels = normalized.split(".")
+    matches = []
+    combined = 0
+    url_key = normalize_url_key(host)
+    mask = table.get(url_key) if url_key is not None else 0
+    if mask:
+        combined |= mask
+        matches.append({
+            "domain": normalized,
+            "url": url_key,
+            "exact": True,
+            "sources": [name for bit, name in enumerate(DOMAIN_SOURCES) if mask & (1 << bit)]
+        })
+    # The bare TLD is never listed on its own.
+    for i in range(len(labels) - 1):
+        candidate = ".".join(labels[i:])
+        mask = table.get(candidate)
+        if mask:
+            combined |= mask
+            matches.append({
+                "domain": candidate,
+                "exact": i == 0,
+                "sources": [name for bit, name in enumerate(DOMAIN_SOURCES) if mask & (1 << bit)]
+            })
+
+    return {
+        "host": host,
+        "normalized": normalized,
+        "listed": bool(matches),
+        "sources": [name for bit, name in enumerate(DOMAIN_SOURCES) if combined & (1 << bit)],
+        "matches": matches,
+        "last_updated": domain_reputation_cache["last_updated"]
+    }
+
 @app.post("/web3-threats/refresh")
-async def refresh_data(background_tasks: BackgroundTasks):
+async def refresh_data():
     """Manually trigger a cache refresh"""
-    background_tasks.add_task(refresh_rekt_data)
-    return {"message": "Cache refresh initiated"}
+    _, merged = refresh_coordinator.request("rekt")
+    return {"message": "Cache refresh initiated", "jobs": {"rekt": "coalesced" if merged else "scheduled"}}
 
 @app.post("/refresh/all")
-async def refresh_all_data(background_tasks: BackgroundTasks):
-    """Manually trigger a refresh of all data caches"""
-    background_tasks.add_task(refresh_rekt_data)
-    background_tasks.add_task(refresh_eol_data)
-    background_tasks.add_task(refresh_leaks_data)
-    background_tasks.add_task(refresh_news_data)
-    background_tasks.add_task(refresh_phishing_data)
-    background_tasks.add_task(refresh_cve_data)
-    background_tasks.add_task(refresh_web3_releases_data)
-    return {"message": "All cache refreshes initiated"}
+async def refresh_all_data():
+    """Manually trigger a refresh of all data caches; repeated calls merge into pending jobs"""
+    jobs = {}
+    for feed in REFRESH_FUNCTIONS:
+        _, merged = refresh_coordinator.request(feed)
+        jobs[feed] = "coalesced" if merged else "scheduled"
+    return {"message": "All cache refreshes initiated", "jobs": jobs}
+
+@app.get("/refresh/status")
+async def get_refresh_status():
+    """State, timing and merge counts of every feed's refresh job"""
+    return {
+        "debounce_seconds": REFRESH_DEBOUNCE_SECONDS,
+        "worker": {
+            "pid": os.getpid(),
+            "shared_refresh": SHARED_REFRESH,
+            # Reported without trying to take the lock from a read-only request.
+            "leader": not SHARED_REFRESH or fcntl is None or refresh_leader["file"] is not None,
+            "leader_since": refresh_leader["since"],
+            "bundle_version": data_bundle["header"]["bundle_version"] if data_bundle["header"] else None
+        },
+        "jobs": refresh_coordinator.status
+    }
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+ADMIN_PROFILE_TOP_MAX = 100
+# Per-cache bounds of the /admin/memory walk; it reports truncated when one is hit.
+ADMIN_MEMORY_MAX_OBJECTS = int(os.getenv("ADMIN_MEMORY_MAX_OBJECTS", "200000"))
+ADMIN_MEMORY_MAX_SECONDS = float(os.getenv("ADMIN_MEMORY_MAX_SECONDS", "0.5"))
+# Containers longer than this are sized from an evenly spaced sample of their items.
+ADMIN_MEMORY_SAMPLE_ITEMS = 256
+
+admin_profile_lock = asyncio.Lock()
+admin_memory_lock = asyncio.Lock()
+
+
+def require_admin(token: Optional[str]) -> None:
+    """Admin endpoints need ADMIN_TOKEN; without one configured they do not exist."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Admin-Token header")
+
+
+def deep_sizeof(
+    root: Any,
+    max_objects: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    sample_items: Optional[int] = None,
+) -> Tuple[int, int, bool]:
+    """
+    Approximate retained size of an object graph: (bytes, objects, truncated).
+
+    Each object is counted once per call, so structures shared inside one cache are not
+    double-counted; mmaps and memoryviews only count their header since their pages
+    belong to the page cache rather than the heap. Instances are followed through their
+    __dict__ and __slots__ (DomainTable, a StreamClient's asyncio.Queue); classes,
+    modules, callables and event loops are counted but not descended into.
+
+    With sample_items, the items of a longer container are still sized one by one, but
+    only that many evenly spaced ones are walked into, and what they hold is scaled up. The walk stops early (truncated=True, bytes a
+    lower bound) after max_objects objects or max_seconds.
+    """
+    deadline = time.perf_counter() + max_seconds if max_seconds is not None else None
+    seen = set()
+    # (object, weight, sized): weight is how many objects one sampled here stands for;
+    # sized means its own size was already added with its container's items.
+    stack = [(root, 1.0, False)]
+    total = 0.0
+    objects = 0
+    while stack:
+        if (max_objects is not None and objects >= max_objects) or (
+                deadline is not None and objects % 1024 == 0 and time.perf_counter() > deadline):
+            return int(total), objects, True
+        obj, weight, sized = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if not sized:
+            total += sys.getsizeof(obj) * weight
+        objects += 1
+        sampled = False
+        try:
+            if isinstance(obj, (dict, list, tuple, set, frozenset, deque)):
+                items = obj.items() if isinstance(obj, dict) else obj
+                if sample_items is not None and len(obj) > sample_items:
+                    # Items vary wildly in size (postings of common terms), so all of them
+                    # are sized; only every stride-th one is walked into.
+                    if isinstance(obj, dict):
+                        total += (sum(map(sys.getsizeof, obj.keys())) + sum(map(sys.getsizeof, obj.values()))) * weight
+                    else:
+                        total += sum(map(sys.getsizeof, obj)) * weight
+                    children = list(itertools.islice(items, 0, None, -(-len(obj) // sample_items)))
+                    weight *= len(obj) / len(children)
+                    sampled = True
+                else:
+                    children = list(items)
+                if isinstance(obj, dict):
+                    # The (key, value) pair tuples themselves are not retained.
+                    children = [value for item in children for value in item]
+            elif not (isinstance(obj, (type, asyncio.AbstractEventLoop)) or callable(obj) or inspect.ismodule(obj)):
+                children = [obj.__dict__] if hasattr(obj, "__dict__") else []
+                for cls in type(obj).__mro__:
+                    names = cls.__dict__.get("__slots__", ())
+                    for name in (names,) if isinstance(names, str) else names:
+                        if hasattr(obj, name) and name not in ("__dict__", "__weakref__"):
+                            children.append(getattr(obj, name))
+            else:
+                continue
+        except RuntimeError:
+            # Resized by a refresh while this walk runs in a thread; size it shallowly.
+            continue
+        stack.extend((child, weight, sampled) for child in children)
+    return int(total), objects, False
+
+
+def admin_memory_targets() -> Dict[str, Any]:
+    return {
+        "rekt_cache": rekt_cache,
+        "eol_cache": eol_cache,
+        "leaks_cache": leaks_cache,
+        "news_cache": news_cache,
+        "phishing_cache": phishing_cache,
+        "domain_reputation_cache": domain_reputation_cache,
+        "cve_cache": cve_cache,
+        "cve_year_cache": cve_year_cache,
+        "cve_year_snapshots": cve_year_snapshots,
+        "cve_summary_cache": cve_summary_cache,
+        "web3_releases_cache": web3_releases_cache,
+        "search_indexes": search_indexes,
+        "feed_changes": feed_changes,
+        "stream_state": stream_state,
+    }
+
+
+@app.get("/admin/memory")
+async def get_admin_memory(x_admin_token: str = Header(None)):
+    """
+    Deep-size estimate of every global cache plus process RSS.
+
+    Sizes are computed per cache, in a worker thread, from a sample of each large
+    container; objects shared between caches appear in each of them. A cache whose walk
+    hit ADMIN_MEMORY_MAX_OBJECTS or ADMIN_MEMORY_MAX_SECONDS is marked truncated.
+    One walk runs at a time.
+    """
+    require_admin(x_admin_token)
+    if admin_memory_lock.locked():
+        raise HTTPException(status_code=409, detail="A memory walk is already running")
+
+    def walk(targets: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        caches = {}
+        for name, target in targets.items():
+            started = time.perf_counter()
+            size, objects, truncated = deep_sizeof(
+                target, ADMIN_MEMORY_MAX_OBJECTS, ADMIN_MEMORY_MAX_SECONDS, ADMIN_MEMORY_SAMPLE_ITEMS
+            )
+            caches[name] = {
+                "bytes": size,
+                "objects": objects,
+                "truncated": truncated,
+                "walk_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+        return caches
+
+    async with admin_memory_lock:
+        caches = await asyncio.to_thread(walk, admin_memory_targets())
+    rss, peak_rss = process_rss_bytes()
+    bundle_map = data_bundle.get("mmap")
+    return {
+        "rss_bytes": rss,
+        "peak_rss_bytes": peak_rss,
+        "low_memory_mode": LOW_MEMORY_MODE,
+        "bundle_mapped_bytes": len(bundle_map) if bundle_map is not None else 0,
+        "caches": dict(sorted(caches.items(), key=lambda kv: -kv[1]["bytes"])),
+    }
+
+
+@app.post("/admin/memory/profile")
+async def profile_refresh_memory(feed: str, top: int = 20, x_admin_token: str = Header(None)):
+    """
+    Run one feed refresh under tracemalloc and report its top allocation sites.
+
+    Sites are ranked by net growth between snapshots taken before and after the refresh;
+    peak is tracemalloc's high-water mark during the refresh. One profile runs at a time.
+    The refresh goes through the coordinator, so a job of that feed already underway is
+    joined (joined_running_job) rather than run twice at once.
+    """
+    require_admin(x_admin_token)
+    if feed not in REFRESH_FUNCTIONS:
+        raise HTTPException(status_code=400, detail=f"feed must be one of: {', '.join(REFRESH_FUNCTIONS)}")
+    if top < 1 or top > ADMIN_PROFILE_TOP_MAX:
+        raise HTTPException(status_code=400, detail=f"top must be between 1 and {ADMIN_PROFILE_TOP_MAX}")
+    if admin_profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A memory profile is already running")
+
+    async with admin_profile_lock:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(1)
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            started = time.perf_counter()
+            task, joined = refresh_coordinator.request(feed, debounce=0)
+            await asyncio.shield(task)
+            elapsed = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    return {
+        "feed": feed,
+        "refresh_ms": round(elapsed * 1000, 2),
+        "joined_running_job": joined,
+        "error": refresh_coordinator.status[feed]["last_error"],
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "top": [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff_bytes": stat.size_diff,
+                "size_bytes": stat.size,
+                "count_diff": stat.count_diff,
+            }
+            for stat in diff[:top]
+        ],
+    }
+
+@app.get("/cves/stats")
+@heavy_endpoint(cve_stats_request_cost)
+async def get_cve_stats(year: str = None):
+    """
+    CVE counts by severity, score histogram and monthly publication trend.
+
+    Merges the per-year rollups (all years, or just year=YYYY); year data is only
+    read for years whose persisted summary is missing or older than the year file,
+    in a worker thread and under the heavy-request memory budget.
+    """
+    if cve_cache.get("available_years") is None and cve_cache["data"] is None:
+        raise HTTPException(status_code=503, detail="CVE data not yet loaded")
+
+    cve_files = get_cve_files(year=year) if year else get_cve_files()
+    summaries = await asyncio.to_thread(lambda: {
+        f.stem: ensure_cve_year_summary(f, current_cve_year_list(f.stem)) for f in sorted(cve_files, reverse=True)
+    })
+    stats = merge_cve_summaries(summaries)
+    stats["by_year"] = {y: summary["total"] for y, summary in summaries.items()}
+    return {
+        "last_updated": cve_cache["last_updated"],
+        "data": stats,
+    }
 
 @app.get("/get-cves")
-async def get_cves_data(year: str = None, page: int = 1, page_size: int = 100):
-    """Get CVE data from cache, optionally filtered by year and paginated"""
+@heavy_endpoint(cve_request_cost)
+async def get_cves_data(year: str = None, page: int = 1, page_size: int = 100, cursor: str = None):
+    """
+    Get CVE data from cache, optionally filtered by year and paginated.
+
+    Every response carries next_cursor. Passing it back as cursor= resumes right after
+    the last returned record with a binary search, so deep pages cost O(page_size).
+    An empty cursor= starts from the beginning. Across all years, cursor responses
+    leave out total_records, so only the years a page walks are counted.
+    """
     current_year = str(datetime.now().year)
     # Keep current year file fresh enough for daily updates.
     if year == current_year or year is None:
@@ -901,6 +4446,8 @@ async def get_cves_data(year: str = None, page: int = 1, page_size: int = 100):
         raise HTTPException(status_code=400, detail="Page number must be greater than 0")
     if page_size < 1 or page_size > 1000:
         raise HTTPException(status_code=400, detail="Page size must be between 1 and 1000")
+
+    resume = decode_cve_cursor(cursor) if cursor else None
     
     if year:
         if LOW_MEMORY_MODE:
@@ -914,12 +4461,27 @@ async def get_cves_data(year: str = None, page: int = 1, page_size: int = 100):
         else:
             if year not in cve_cache["data"]:
                 raise HTTPException(status_code=404, detail=f"No CVE data found for year {year}")
-            year_data = cve_cache["data"][year]
+            year_data = cve_year_records(year)
 
         if len(year_data) == 0:
             raise HTTPException(status_code=404, detail=f"No CVE data found for year {year}")
         total_records = len(year_data)
         total_pages = (total_records + page_size - 1) // page_size
+
+        if cursor is not None:
+            if resume is not None and resume[0] != year:
+                raise HTTPException(status_code=400, detail=f"Cursor does not belong to year {year}")
+            start_idx = cve_resume_index(year_data, resume[1]) if resume else 0
+            end_idx = min(start_idx + page_size, total_records)
+            paginated_data = year_data[start_idx:end_idx]
+            return {
+                "last_updated": cve_cache["last_updated"],
+                "year": year,
+                "total_records": total_records,
+                "page_size": page_size,
+                "next_cursor": encode_cve_cursor(year, paginated_data[-1]) if end_idx < total_records else None,
+                "data": paginated_data
+            }
         
         if page > total_pages:
             raise HTTPException(status_code=400, detail=f"Page {page} does not exist. Total pages: {total_pages}")
@@ -935,52 +4497,72 @@ async def get_cves_data(year: str = None, page: int = 1, page_size: int = 100):
             "total_pages": total_pages,
             "current_page": page,
             "page_size": page_size,
+            "next_cursor": encode_cve_cursor(year, paginated_data[-1]) if end_idx < total_records else None,
             "data": paginated_data
         }
     
     if LOW_MEMORY_MODE:
         years = sorted([f.stem for f in get_cve_files()], reverse=True)
         cve_cache["available_years"] = years
-        offset = (page - 1) * page_size
-        remaining_skip = offset
-        paginated_data: List[Dict[str, Any]] = []
-        total_records = 0
+    else:
+        years = cve_cache["available_years"]
 
-        for y in years:
-            year_data = load_cve_year_data(y)
-            year_len = len(year_data)
-            total_records += year_len
+    # Years are walked newest first; years outside the requested window only
+    # contribute their record count and are never materialized or concatenated.
+    if cursor is None:
+        year_counts = [(y, cve_year_record_count(y)) for y in years]
+        total_records = sum(count for _, count in year_counts)
+    else:
+        # Counted on demand below: a cursor page only needs the years it reaches.
+        year_counts = [(y, None) for y in years]
+    paginated_data: List[Dict[str, Any]] = []
+    last_year = None
+    has_more = False
 
-            if len(paginated_data) >= page_size:
-                continue
+    if cursor is not None:
+        remaining_skip = 0
+    else:
+        remaining_skip = (page - 1) * page_size
 
-            if remaining_skip >= year_len:
-                remaining_skip -= year_len
-                continue
+    for y, year_len in year_counts:
+        if len(paginated_data) >= page_size:
+            if year_len is None:
+                year_len = cve_year_record_count(y)
+            if year_len:
+                has_more = True
+                break
+            continue
+        if resume is not None and y > resume[0]:
+            continue
+        if year_len is not None and remaining_skip >= year_len:
+            remaining_skip -= year_len
+            continue
 
-            start = remaining_skip
-            take = min(page_size - len(paginated_data), year_len - start)
+        year_data = cve_year_records(y)
+        start = remaining_skip
+        if resume is not None and y == resume[0]:
+            start = cve_resume_index(year_data, resume[1])
+        take = min(page_size - len(paginated_data), len(year_data) - start)
+        if take > 0:
             paginated_data.extend(year_data[start:start + take])
-            remaining_skip = 0
-
-        total_pages = (total_records + page_size - 1) // page_size if total_records else 0
-        if page > max(total_pages, 1):
-            raise HTTPException(status_code=400, detail=f"Page {page} does not exist. Total pages: {total_pages}")
-    else:
-        # Handle pagination for all years
-        all_data = []
-        for year_data in cve_cache["data"].values():
-            all_data.extend(year_data)
+            last_year = y
+            has_more = start + take < len(year_data)
+        remaining_skip = 0
 
-        total_records = len(all_data)
-        total_pages = (total_records + page_size - 1) // page_size
+    next_cursor = encode_cve_cursor(last_year, paginated_data[-1]) if has_more and paginated_data else None
 
-        if page > total_pages:
-            raise HTTPException(status_code=400, detail=f"Page {page} does not exist. Total pages: {total_pages}")
+    if cursor is not None:
+        return {
+            "last_updated": cve_cache["last_updated"],
+            "page_size": page_size,
+            "available_years": cve_cache.get("available_years", []),
+            "next_cursor": next_cursor,
+            "data": paginated_data
+        }
 
-        start_idx = (page - 1) * page_size
-        end_idx = min(start_idx + page_size, total_records)
-        paginated_data = all_data[start_idx:end_idx]
+    total_pages = (total_records + page_size - 1) // page_size if total_records else 0
+    if page > max(total_pages, 1):
+        raise HTTPException(status_code=400, detail=f"Page {page} does not exist. Total pages: {total_pages}")
     
     return {
         "last_updated": cve_cache["last_updated"],
@@ -989,21 +4571,425 @@ async def get_cves_data(year: str = None, page: int = 1, page_size: int = 100):
         "current_page": page,
         "page_size": page_size,
         "available_years": cve_cache.get("available_years", []),
+        "next_cursor": next_cursor,
         "data": paginated_data
     }
 
 @app.get("/web3-releases")
-async def get_web3_releases():
-    """Get Web3 framework release data"""
+async def get_web3_releases(page: int = None, page_size: int = None, fields: str = None, sort: str = None):
+    """
+    Get Web3 framework release data.
+
+    Without query parameters the full feed is returned unchanged. page/page_size
+    paginate, fields=a,b projects each record and sort=field or sort=-field orders it.
+    """
     if web3_releases_cache["data"] is None:
         raise HTTPException(status_code=503, detail="Web3 releases data not yet loaded")
     
+    if page is None and page_size is None and fields is None and sort is None:
+        return encoded_feed_response(web3_releases_cache, total_records=len(web3_releases_cache["data"]))
+    return feed_page_response(web3_releases_cache, page, page_size, fields, sort)
+
+BATCH_MAX_QUERIES = 10
+BATCH_CACHE_TTL_SECONDS = float(os.getenv("BATCH_CACHE_TTL_SECONDS", "10"))
+BATCH_CACHE_MAX_ENTRIES = 128
+BATCH_INT_PARAMS = {"page", "page_size", "limit"}
+# Feed name -> (endpoint function, query parameters a batch query may pass through).
+BATCH_FEEDS = {
+    "web3-threats": (get_rekt_data, {
+        "page", "page_size", "fields", "sort", "chain", "scam_type",
+        "token_address", "project", "date_from", "date_to"
+    }),
+    "eol": (get_eol_data, {"page", "page_size", "fields", "sort"}),
+    "leaks": (get_leaks_data, {"page", "page_size", "fields", "sort"}),
+    "news": (get_news_data, {"page", "page_size", "fields", "sort", "since", "source", "limit"}),
+    "cves": (get_cves_data, {"year", "page", "page_size", "cursor"}),
+    "web3-releases": (get_web3_releases, {"page", "page_size", "fields", "sort"}),
+}
+# Landing page feeds, newest records first where the feed supports it.
+DASHBOARD_QUERIES = (
+    {"feed": "news"},
+    {"feed": "leaks", "sort": "-breach_date"},
+    {"feed": "web3-threats", "sort": "-date"},
+    {"feed": "cves"},
+    {"feed": "web3-releases", "sort": "-created_at"},
+)
+
+# Query set (canonical JSON) -> (expires at, encoded body)
+batch_cache: Dict[str, Tuple[float, bytes]] = {}
+
+
+async def batch_slice(query: Any) -> Tuple[Union[bytes, memoryview], bool]:
+    """
+    Encoded response of one batch query and whether it may be cached. Errors are
+    reported in place as {"error": {"status_code", "detail"}}.
+    """
+    try:
+        if not isinstance(query, dict) or query.get("feed") not in BATCH_FEEDS:
+            raise HTTPException(status_code=400, detail=f"Each query needs a feed: {', '.join(BATCH_FEEDS)}")
+        handler, allowed = BATCH_FEEDS[query["feed"]]
+        params = {k: v for k, v in query.items() if k != "feed"}
+        # limit means "first N records" everywhere; only news has a native limit.
+        if "limit" in params and "limit" not in allowed:
+            if "page_size" in params:
+                raise HTTPException(status_code=400, detail="Pass either limit or page_size, not both")
+            params["page_size"] = params.pop("limit")
+        unknown = sorted(set(params) - allowed)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported {query['feed']} parameters: {', '.join(unknown)}")
+        for name, value in params.items():
+            expected = int if name in BATCH_INT_PARAMS else str
+            if not isinstance(value, expected) or isinstance(value, bool):
+                raise HTTPException(status_code=400, detail=f"{name} must be {'an integer' if expected is int else 'a string'}")
+
+        result = await handler(**params)
+        if isinstance(result, Response):
+            return result.body, True
+        return encode_json(result), True
+    except HTTPException as e:
+        # Not-yet-loaded feeds (503) should not stick in the cache.
+        return encode_json({"error": {"status_code": e.status_code, "detail": e.detail}}), e.status_code < 500
+
+
+async def batch_response(queries: List[Any]) -> Response:
+    """Responses of several feed queries in one body, spliced from their encoded slices."""
+    if not queries:
+        raise HTTPException(status_code=400, detail="Provide at least one query")
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_QUERIES} queries per batch")
+
+    key = json.dumps(queries, sort_keys=True, separators=(",", ":"))
+    now = time.monotonic()
+    cached = batch_cache.get(key)
+    if cached is not None and cached[0] > now:
+        count_cache_event("batch", "hit")
+        return Response(content=cached[1], media_type="application/json", headers={"X-Cache": "hit"})
+    count_cache_event("batch", "miss")
+
+    slices = []
+    cacheable = True
+    for query in queries:
+        body, ok = await batch_slice(query)
+        slices.append(body)
+        cacheable = cacheable and ok
+    body = b'{"results":[' + b",".join(slices) + b"]}"
+
+    if cacheable and BATCH_CACHE_TTL_SECONDS > 0:
+        batch_cache.pop(key, None)
+        batch_cache[key] = (now + BATCH_CACHE_TTL_SECONDS, body)
+        while len(batch_cache) > BATCH_CACHE_MAX_ENTRIES:
+            del batch_cache[next(iter(batch_cache))]
+            count_cache_event("batch", "eviction")
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "miss"})
+
+
+@app.post("/batch")
+async def post_batch(queries: List[Any] = Body(...)):
+    """
+    Run several feed queries in one round trip. The body is a JSON array of objects
+    like {"feed": "news", "limit": 10, "fields": "title,link"}; any other key is passed
+    to that feed's endpoint as a query parameter. Results come back in query order
+    under "results", each the body that endpoint would have returned, and identical
+    batches are served from a short-lived cache.
+    """
+    return await batch_response(queries)
+
+
+@app.get("/dashboard")
+async def get_dashboard(limit: int = 10):
+    """Newest limit records of each landing page feed (news, leaks, web3-threats, cves, web3-releases)."""
+    if limit < 1 or limit > 100:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 100")
+    return await batch_response([{**query, "limit": limit} for query in DASHBOARD_QUERIES])
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of request, refresh, cache and process metrics."""
+    lines = REQUEST_LATENCY.render() + RESPONSE_SIZE.render() + REFRESH_DURATION.render()
+
+    for metric, key, help_text in (
+        ("menaxa_refresh_records", "records", "Records held after the last refresh."),
+        ("menaxa_refresh_source_bytes", "source_bytes", "Size of the source file parsed by the last refresh."),
+    ):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [f'{metric}{{feed="{feed}"}} {values[key]}' for feed, values in sorted(refresh_gauges.items())]
+
+    lines += [
+        "# HELP menaxa_cve_year_bytes_parsed_total Bytes of CVE year files parsed from disk.",
+        "# TYPE menaxa_cve_year_bytes_parsed_total counter",
+        f"menaxa_cve_year_bytes_parsed_total {cve_year_bytes_parsed['total']}",
+        "# HELP menaxa_cache_events_total Cache lookups by outcome (hit, miss, eviction).",
+        "# TYPE menaxa_cache_events_total counter",
+    ]
+    lines += [
+        f'menaxa_cache_events_total{{cache="{cache}",event="{event}"}} {count}'
+        for (cache, event), count in sorted(cache_events.items())
+    ]
+    lines += [
+        "# HELP menaxa_cache_entries Entries currently held by bounded caches.",
+        "# TYPE menaxa_cache_entries gauge",
+        f'menaxa_cache_entries{{cache="cve_year_cache"}} {len(cve_year_cache)}',
+        f'menaxa_cache_entries{{cache="cve_summary_cache"}} {len(cve_summary_cache)}',
+        "# HELP menaxa_heavy_budget_bytes_in_use Estimated bytes held by admitted heavy requests.",
+        "# TYPE menaxa_heavy_budget_bytes_in_use gauge",
+        f"menaxa_heavy_budget_bytes_in_use {memory_budget.in_use}",
+        "# HELP menaxa_heavy_requests_total Heavy request admission outcomes.",
+        "# TYPE menaxa_heavy_requests_total counter",
+        *[f'menaxa_heavy_requests_total{{outcome="{k}"}} {v}' for k, v in memory_budget.outcomes.items()],
+        "# HELP menaxa_stream_clients Connected /stream clients.",
+        "# TYPE menaxa_stream_clients gauge",
+        f"menaxa_stream_clients {len(stream_state['clients'])}",
+    ]
+
+    rss, peak_rss = process_rss_bytes()
+    lines += [
+        "# HELP process_resident_memory_bytes Resident set size.",
+        "# TYPE process_resident_memory_bytes gauge",
+        f"process_resident_memory_bytes {rss}",
+        "# HELP process_peak_resident_memory_bytes Peak resident set size.",
+        "# TYPE process_peak_resident_memory_bytes gauge",
+        f"process_peak_resident_memory_bytes {peak_rss}",
+    ]
+    return Response(content="\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/stream")
+async def stream_feed_events(request: Request, feeds: str = None, last_event_id: str = Header(None)):
+    """
+    Server-Sent Events announcing new records as refreshes detect them.
+
+    feeds=a,b limits the stream to some feeds. A reconnecting EventSource sends
+    Last-Event-ID and gets the missed events replayed from a bounded ring buffer, or a
+    resync event when they are no longer buffered. Idle connections get heartbeat
+    comments; a client whose queue fills up is disconnected and resumes the same way.
+    """
+    selected = None
+    if feeds:
+        selected = {feed.strip() for feed in feeds.split(",") if feed.strip()}
+        unknown = selected - set(feed_changes)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown feeds: {', '.join(sorted(unknown))}")
+
+    resume_from = None
+    if last_event_id:
+        try:
+            resume_from = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer event id")
+
+    client = StreamClient(selected)
+    # Registered before replaying, so nothing published in between is lost.
+    stream_state["clients"].add(client)
+    if resume_from is not None:
+        backlog = [
+            payload for event_id, feed, payload in stream_state["ring"]
+            if event_id > resume_from and (selected is None or feed in selected)
+        ]
+        needs_resync = resume_from < stream_state["floor"]
+    else:
+        backlog, needs_resync = [], False
+
+    async def events():
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n".encode("utf-8")
+            if needs_resync:
+                yield b"event: resync\ndata: {}\n\n"
+            for payload in backlog:
+                yield payload
+            while not client.overflowed:
+                try:
+                    yield await asyncio.wait_for(client.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": heartbeat\n\n"
+        finally:
+            stream_state["clients"].discard(client)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/changes/{feed}")
+async def get_feed_changes(feed: str, since_version: int):
+    """
+    Records added, changed and removed (by key) since a feed version.
+
+    Responds with resync=true when the bounded change log no longer reaches back to
+    since_version; the client then re-downloads the feed and continues from version.
+    """
+    if feed not in feed_changes:
+        raise HTTPException(status_code=404, detail=f"Unknown feed {feed}. Available: {', '.join(feed_changes)}")
+    state = feed_changes[feed]
+    if not state["version"]:
+        raise HTTPException(status_code=503, detail="Data not yet loaded")
+    if since_version > state["version"]:
+        raise HTTPException(status_code=400, detail=f"since_version is ahead of the current version {state['version']}")
+
+    response = {"feed": feed, "since_version": since_version, "version": state["version"]}
+    if since_version < state["base_version"]:
+        return {**response, "resync": True}
+
+    # Net effect per key across the covered entries, e.g. added-then-removed cancels out.
+    ops: Dict[str, Tuple[str, Any]] = {}
+    for entry in state["log"]:
+        if entry["version"] <= since_version:
+            continue
+        for key, record in entry["added"].items():
+            ops[key] = ("changed" if ops.get(key, ("",))[0] == "removed" else "added", record)
+        for key, record in entry["changed"].items():
+            ops[key] = ("added" if ops.get(key, ("",))[0] == "added" else "changed", record)
+        for key in entry["removed"]:
+            if ops.get(key, ("",))[0] == "added":
+                del ops[key]
+            else:
+                ops[key] = ("removed", None)
+
     return {
-        "last_updated": web3_releases_cache["last_updated"],
-        "total_records": len(web3_releases_cache["data"]),
-        "data": web3_releases_cache["data"]
+        **response,
+        "resync": False,
+        "added": [record for op, record in ops.values() if op == "added"],
+        "changed": [record for op, record in ops.values() if op == "changed"],
+        "removed": [key for key, (op, _) in ops.items() if op == "removed"],
     }
 
+EXPORT_CHUNK_RECORDS = 1000
+# Record field compared against since= for each exportable feed; None means no time field.
+EXPORT_FEEDS = {
+    "web3-threats": "date",
+    "eol": None,
+    "leaks": "breach_date",
+    "news": "pubDate",
+    "cves": "lastModifiedDate",
+    "web3-releases": "created_at",
+    "phishing": None,
+}
+
+
+def export_feed_records(feed: str):
+    """
+    Yield a feed's records one by one without materializing a copy of the feed.
+
+    List feeds are walked from their cache. CVEs go one year at a time (held years are
+    reused while they match their file, other years are read and dropped), and phishing
+    domains come from the bundle's mmapped index when there is one.
+    """
+    if feed == "cves":
+        if cve_cache.get("available_years") is None and cve_cache["data"] is None:
+            raise HTTPException(status_code=503, detail="CVE data not yet loaded")
+        for cve_file in sorted(get_cve_files(), key=lambda f: f.stem, reverse=True):
+            year_data = current_cve_year_list(cve_file.stem)
+            if year_data is None:
+                year_data = read_cve_year_file(cve_file)
+            elif not isinstance(year_data, BundleRecords):
+                # Held lists can be merged in place by a sync; iterate over a shallow copy.
+                year_data = list(year_data)
+            yield from year_data
+        return
+
+    if feed == "phishing":
+        index = bundle_phishing_index()
+        if index is not None:
+            for position in range(len(index[1]) - 1):
+                yield {"domain": bundle_phishing_domain(index, position).decode("utf-8")}
+            return
+        domains = phishing_cache["data"] if phishing_cache["data"] is not None else load_phishing_domains_from_disk()
+        for domain in domains:
+            yield {"domain": domain}
+        return
+
+    cache = {
+        "web3-threats": rekt_cache,
+        "eol": eol_cache,
+        "leaks": leaks_cache,
+        "news": news_cache,
+        "web3-releases": web3_releases_cache,
+    }[feed]
+    data = cache["data"]
+    if data is None:
+        raise HTTPException(status_code=503, detail="Data not yet loaded")
+    if feed == "eol":
+        yield from eol_cycle_records(data)
+        return
+    yield from data
+
+
+def export_ndjson_chunks(records, time_field: Optional[str], since: Optional[datetime]):
+    """Encode records as NDJSON, EXPORT_CHUNK_RECORDS lines per chunk."""
+    lines = []
+    for record in records:
+        if since is not None:
+            stamp = parse_news_datetime(record.get(time_field))
+            if stamp is None or stamp < since:
+                continue
+        lines.append(encode_json(record))
+        if len(lines) >= EXPORT_CHUNK_RECORDS:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@app.get("/export/{feed}.ndjson")
+async def export_feed(feed: str, since: str = None, gzip: bool = False):
+    """
+    Stream a whole feed as NDJSON, one record per line.
+
+    since= (ISO 8601, RFC 2822 or epoch) keeps records whose time field is at or after
+    it; gzip=true compresses the stream with Content-Encoding: gzip. Records are encoded
+    and compressed in fixed-size chunks, so server memory does not grow with the export.
+    """
+    if feed not in EXPORT_FEEDS:
+        raise HTTPException(status_code=404, detail=f"Unknown feed {feed}. Available: {', '.join(EXPORT_FEEDS)}")
+    time_field = EXPORT_FEEDS[feed]
+    since_dt = None
+    if since is not None:
+        if time_field is None:
+            raise HTTPException(status_code=400, detail=f"Feed {feed} has no time field to filter with since")
+        since_dt = parse_news_since(since)
+
+    # The budget is held until the stream ends, not just until this handler returns.
+    cost = {"cves": cve_request_cost, "phishing": phishing_request_cost}.get(feed, lambda: 0)()
+    if cost:
+        await memory_budget.acquire(cost, "export_feed")
+    try:
+        records = export_feed_records(feed)
+        # Run the generator up to its first record so 503/404s surface before streaming
+        # starts; for CVEs that step reads a whole year, so it runs off the loop too.
+        first = await run_in_threadpool(next, records, None)
+    except BaseException:
+        if cost:
+            await memory_budget.release(cost)
+        raise
+    if first is not None:
+        records = itertools.chain([first], records)
+    chunks = export_ndjson_chunks(records, time_field, since_dt)
+    headers = {"Content-Disposition": f'attachment; filename="{feed}.ndjson"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        chunks = gzip_chunks(chunks)
+
+    async def budgeted_chunks():
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                yield chunk
+        finally:
+            if cost:
+                await memory_budget.release(cost)
+
+    return StreamingResponse(budgeted_chunks(), media_type="application/x-ndjson", headers=headers)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
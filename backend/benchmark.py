@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Benchmark api.py against a synthetic dataset.
+
+Generates feed files in the layout api.py reads (data/rekt_db, data/external_feed,
+data/phishing-scam-db.json, data/phishing_urls, ...), then imports api from inside that
+tree and measures startup, every coroutine in api.REFRESH_FUNCTIONS, RSS and
+per-endpoint latency percentiles through an in-process ASGI client. The same --seed
+and --scale always produce the same data.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows: RSS falls back to 0 when /proc is missing too
+    resource = None
+
+# Record counts at --scale 1.0.
+BASE_SIZES = {
+    "phishing": 500_000,
+    "phishing_urls": 200_000,
+    "phishing_url_collector": 50_000,
+    "cves": 300_000,
+    "cve_years": 25,
+    "leaks": 10_000,
+    "news": 50_000,
+    "rekt": 5_000,
+    "eol_products": 400,
+    "web3_releases": 2_000,
+}
+
+WORDS = (
+    "remote attacker crafted request allows arbitrary code execution via buffer overflow in the "
+    "authentication module when processing malformed input leading to privilege escalation and "
+    "information disclosure through improper validation of user supplied data in web interface"
+).split()
+TLDS = ("com", "net", "org", "io", "xyz", "app", "finance", "claims", "online", "site")
+SEVERITIES = ((4.0, "low", "niska"), (7.0, "medium", "średnia"), (9.0, "high", "wysoka"), (10.1, "critical", "krytyczna"))
+NEWS_SOURCES = ("NCSC UK", "DarkReading", "TheHackerNews", "NIST US", "Google Security Blog", "BleepingComputer")
+# Every 10th collected phishing URL is hosted on one of these shared platforms.
+SHARED_URL_PREFIXES = ("https://docs.google.com/forms/d/e/", "https://ipfs.io/ipfs/", "https://t.co/", "https://sites.google.com/view/")
+SCAM_TYPES = ("Rugpull", "Other", "Access Control", "Flash Loan Attack", "Phishing", "Oracle Issue")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark api.py startup, refreshes and endpoints on synthetic data')
+    parser.add_argument('--scale', type=float, default=0.1,
+                      help='Dataset size relative to 500k domains / 300k CVEs / 10k leaks / 50k news (default: 0.1)')
+    parser.add_argument('--seed', type=int, default=1337, help='Random seed for the generated dataset')
+    parser.add_argument('--requests', type=int, default=30, help='Requests per endpoint (default: 30)')
+    parser.add_argument('--data-dir', help='Reuse or keep the generated tree here instead of a temp dir')
+    parser.add_argument('--reuse', action='store_true', help='Skip generation when --data-dir already has data')
+    parser.add_argument('--full-memory', action='store_true', help='Run with LOW_MEMORY_MODE=false')
+    parser.add_argument('--bundle', action='store_true', help='Build and use the prebuilt data bundle')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    return parser.parse_args()
+
+
+def scaled_sizes(scale: float) -> dict:
+    sizes = {name: max(1, int(count * scale)) for name, count in BASE_SIZES.items()}
+    sizes["cve_years"] = BASE_SIZES["cve_years"]
+    return sizes
+
+
+def write_json_array(path: Path, records, wrapper: dict = None) -> int:
+    """Stream records into a JSON array (optionally under wrapper["data"]) without building it in memory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        if wrapper is not None:
+            f.write(json.dumps(wrapper)[:-1] + (', ' if wrapper else '') + '"data": ')
+        f.write("[")
+        for record in records:
+            if count:
+                f.write(",")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("]")
+        if wrapper is not None:
+            f.write("}")
+    return count
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def domain_name(rng: random.Random, i: int) -> str:
+    label = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 12)))
+    return f"{label}{i}.{rng.choice(TLDS)}"
+
+
+def iso_day(start: date, rng: random.Random, span_days: int) -> date:
+    return start + timedelta(days=rng.randrange(max(1, span_days)))
+
+
+def generate_phishing_urls(rng: random.Random, count: int):
+    for i in range(count):
+        if i % 10 == 0:
+            yield f"{rng.choice(SHARED_URL_PREFIXES)}{rng.getrandbits(64):x}\n"
+        else:
+            yield f"https://{rng.choice(('', 'login.', 'secure.'))}{domain_name(rng, i)}/{rng.choice(('wallet', 'claim', 'verify'))}\n"
+
+
+def generate_cves(rng: random.Random, year: int, count: int):
+    for i in range(count):
+        published = datetime(year, 1, 1) + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        modified = published + timedelta(days=rng.randrange(400))
+        description = sentence(rng, rng.randint(15, 40))
+        if rng.random() < 0.02:
+            description = "Rejected reason: " + description
+        score = round(rng.uniform(1.5, 10.0), 1)
+        severity_en, severity_pl = next((en, pl) for bound, en, pl in SEVERITIES if score < bound)
+        yield {
+            "cve_id": f"CVE-{year}-{i:05d}",
+            "description": description,
+            "description_pl": description,
+            "publishedDate": published.strftime("%Y-%m-%dT%H:%MZ"),
+            "lastModifiedDate": modified.strftime("%Y-%m-%dT%H:%MZ"),
+            "score": score,
+            "severity": severity_pl,
+            "severity_en": severity_en,
+        }
+
+
+def generate_leaks(rng: random.Random, count: int):
+    for i in range(count):
+        domain = domain_name(rng, i)
+        description = (
+            f'In {rng.randint(2010, 2025)}, <a href="https://{domain}/" target="_blank" rel="noopener">{domain}</a> '
+            f'suffered a data breach. {sentence(rng, 25)} See <a href="https://example.org/report/{i}">the report</a>.'
+        )
+        yield {
+            "domain": domain,
+            "breach_date": iso_day(date(2010, 1, 1), rng, 5800).isoformat(),
+            "data_leaked": "Email addresses, Passwords, Usernames",
+            "data_leaked_pl": "Adresy e-mail, hasła, nazwy użytkowników",
+            "leak_count": rng.randint(100, 50_000_000),
+            "description": description,
+            "description_pl": description,
+            "name": f"Leak{i}",
+        }
+
+
+def generate_news(rng: random.Random, count: int):
+    now = datetime.now()
+    titles = []
+    for i in range(count):
+        # Every 20th item re-reports an earlier story with a slightly edited title.
+        if titles and i % 20 == 0:
+            title = rng.choice(titles) + " (updated)"
+        else:
+            title = sentence(rng, rng.randint(6, 12))[:-1] + f" {i}"
+            titles.append(title)
+        yield {
+            "title": title,
+            "link": f"https://news.example/{i}",
+            "pubDate": (now - timedelta(minutes=rng.randrange(365 * 24 * 60))).strftime("%Y-%m-%dT%H:%M:%S"),
+            "source": rng.choice(NEWS_SOURCES),
+        }
+
+
+def generate_rekt(rng: random.Random, count: int):
+    records = []
+    for i in range(count):
+        records.append({
+            "project_name": f"Project {i}",
+            "name_categories": rng.choice(SCAM_TYPES),
+            "token_name": f"TKN{i}",
+            "proof_link": f"https://x.com/status/{i}",
+            "token_address": "0x" + "".join(rng.choice("0123456789abcdefABCDEF") for _ in range(40)) if rng.random() < 0.8 else None,
+            "website_link": None,
+            "funds_lost": rng.randint(1_000, 300_000_000) if rng.random() < 0.9 else None,
+            "scam_type": rng.choice(SCAM_TYPES),
+            "date": iso_day(date(2016, 1, 1), rng, 3650).isoformat() if rng.random() < 0.97 else None,
+        })
+    records.sort(key=lambda r: r["date"] or "", reverse=True)
+    return records
+
+
+def generate_eol(rng: random.Random, count: int) -> dict:
+    data = {}
+    for i in range(count):
+        cycles = []
+        for major in range(rng.randint(3, 15), 0, -1):
+            released = iso_day(date(2008, 1, 1), rng, 6000)
+            cycles.append({
+                "cycle": f"{major}.{rng.randint(0, 9)}",
+                "releaseDate": released.isoformat(),
+                "eol": (released + timedelta(days=rng.randint(300, 2500))).isoformat() if rng.random() < 0.85 else False,
+                "latest": f"{major}.{rng.randint(0, 9)}.{rng.randint(0, 40)}",
+                "lts": rng.random() < 0.2,
+            })
+        data[f"Product {i}"] = cycles
+    return data
+
+
+def generate_web3_releases(rng: random.Random, count: int):
+    for i in range(count):
+        yield {
+            "name": f"Framework {i % 50} Release v{i // 50}.{i % 10}.0",
+            "author": f"org{i % 50}",
+            "created_at": (datetime(2022, 1, 1) + timedelta(hours=rng.randrange(4 * 365 * 24))).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "days_since_launch": rng.randint(0, 1000),
+            "html_url": f"https://github.com/org{i % 50}/repo/releases/tag/v{i}",
+        }
+
+
+def generate_dataset(root: Path, sizes: dict, seed: int) -> dict:
+    """Write the synthetic tree under root/data and return the record counts written."""
+    rng = random.Random(seed)
+    data = root / "data"
+    feed = data / "external_feed"
+    counts = {}
+
+    first_year = date.today().year - sizes["cve_years"] + 1
+    # Later years carry more CVEs, roughly like the real corpus.
+    weights = [i + 1 for i in range(sizes["cve_years"])]
+    counts["cves"] = 0
+    for offset, weight in enumerate(weights):
+        year = first_year + offset
+        year_count = max(1, sizes["cves"] * weight // sum(weights))
+        counts["cves"] += write_json_array(feed / "cve" / f"{year}.json", generate_cves(rng, year, year_count))
+
+    counts["phishing"] = write_json_array(data / "phishing-scam-db.json", (domain_name(rng, i) for i in range(sizes["phishing"])))
+    url_file = data / "phishing_urls" / "urls.txt"
+    url_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(url_file, "w", encoding="utf-8") as f:
+        f.writelines(generate_phishing_urls(rng, sizes["phishing_urls"]))
+    counts["phishing_urls"] = sizes["phishing_urls"]
+    # Legacy collector output: newest URLs, a blank separator line, then the rest.
+    collected = list(generate_phishing_urls(rng, sizes["phishing_url_collector"]))
+    newest = len(collected) // 10
+    with open(data / "phishing_url_collector.txt", "w", encoding="utf-8") as f:
+        f.writelines(collected[:newest] + ["\n"] + collected[newest:])
+    counts["phishing_url_collector"] = len(collected)
+    counts["leaks"] = write_json_array(feed / "leak.json", generate_leaks(rng, sizes["leaks"]))
+    counts["news"] = write_json_array(feed / "newsen.json", generate_news(rng, sizes["news"]))
+    rekt = generate_rekt(rng, sizes["rekt"])
+    counts["rekt"] = write_json_array(data / "rekt_db" / "rekt_db.json", rekt, {"last_updated": datetime.now().isoformat(), "total_records": len(rekt)})
+    eol = generate_eol(rng, sizes["eol_products"])
+    feed.mkdir(parents=True, exist_ok=True)
+    with open(feed / "eol.json", "w", encoding="utf-8") as f:
+        json.dump(eol, f)
+    counts["eol_products"] = len(eol)
+    counts["web3_releases"] = write_json_array(
+        feed / "web3-releases.json", generate_web3_releases(rng, sizes["web3_releases"]), {"last_updated": datetime.now().isoformat(), "total_records": sizes["web3_releases"]}
+    )
+    return counts
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+async def asgi_request(app, method: str, url: str, body: bytes = b"", headers=None, stream: bool = False):
+    """
+    Minimal in-process ASGI client: returns (status, response headers, body). With
+    stream=True the client disconnects after the first body chunk, for endpoints such
+    as /stream that never finish on their own.
+    """
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode("utf-8"),
+        "query_string": parts.query.encode("utf-8"),
+        "root_path": "",
+        "headers": [(b"host", b"bench")] + [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+                   + ([(b"content-type", b"application/json")] if body else []),
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    received = {"sent": False}
+    response = {"status": None, "headers": [], "body": []}
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if not received["sent"]:
+            received["sent"] = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+            if stream:
+                disconnected.set()
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], b"".join(response["body"])
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def middle_page(total: int, page_size: int) -> int:
+    """A page past the first that still exists for total records (1 when there is only one)."""
+    pages = max(1, -(-total // page_size))
+    return max(1, (pages + 1) // 2)
+
+
+def endpoint_plan(root: Path, api) -> list:
+    """
+    Requests to time as (method, url, JSON body, stream), with sample values taken from
+    the generated data and the loaded api module. Pages, years and product names come
+    from what was actually loaded, so every request is answerable at any --scale.
+    """
+    with open(root / "data" / "external_feed" / "leak.json", "r", encoding="utf-8") as f:
+        first_leak_domain = json.load(f)[0]["domain"]
+    cve_years = sorted(p.stem for p in (root / "data" / "external_feed" / "cve").glob("*.json") if p.stem.isdigit())
+    middle_year = cve_years[len(cve_years) // 2]
+    cve_total = sum(api.cve_year_record_count(year) for year in cve_years)
+    middle_year_total = api.cve_year_record_count(middle_year)
+    rekt_total = len(api.rekt_cache["data"] or [])
+    leaks_total = len(api.leaks_cache["data"] or [])
+    products = [name for name, _ in api.eol_cache.get("products") or []]
+    known = ",".join(quote(name.lower().replace(" ", "-")) for name in products[:2])
+    inventory = [
+        {"product": products[i % len(products)], "version": f"{i % 9}.1.3"}
+        for i in range(500)
+    ] if products else []
+    since = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%S")
+    batch = [
+        {"feed": "news", "limit": 20, "fields": "title,link,pubDate"},
+        {"feed": "leaks", "page_size": 20, "sort": "-leak_count"},
+        {"feed": "cves", "year": middle_year, "page_size": 20},
+    ]
+    plan = [
+        ("GET", "/web3-threats", None),
+        ("GET", f"/web3-threats?page={middle_page(rekt_total, 50)}&page_size=50&sort=-funds_lost", None),
+        ("GET", "/web3-threats?scam_type=rugpull&date_from=2020-01-01&date_to=2021-12-31&page_size=20", None),
+        ("GET", "/web3-threats/stats", None),
+        ("GET", "/eol", None),
+        ("GET", "/eol?page=1&page_size=20&fields=product", None),
+        ("GET", "/eol/expiring?days=90", None),
+        ("GET", f"/eol/status?products={known + ',' if known else ''}unknown", None),
+        ("POST", "/eol/inventory", inventory),
+        ("GET", "/leaks", None),
+        ("GET", f"/leaks?page={middle_page(leaks_total, 100)}&page_size=100&sort=-leak_count", None),
+        ("GET", "/news", None),
+        ("GET", f"/news?since={since}&limit=100", None),
+        ("GET", "/get-cves", None),
+        ("GET", f"/get-cves?page={middle_page(cve_total, 100)}&page_size=100", None),
+        ("GET", f"/get-cves?year={middle_year}&page={middle_page(middle_year_total, 100)}", None),
+        ("GET", "/cves/stats", None),
+        ("GET", f"/search?domain={first_leak_domain}", None),
+        ("GET", "/get-web3-scam-domains", None),
+        ("GET", f"/domain/login.{first_leak_domain}", None),
+        ("GET", "/domain/https://docs.google.com/forms/d/e/unlisted/viewform", None),
+        ("GET", "/domain/not-listed.example", None),
+        ("GET", "/web3-releases", None),
+        ("GET", "/search/all?q=remote%20code%20exec&limit=20", None),
+        ("GET", "/search/all?q=buffer%20overflow&feeds=cves,news", None),
+        ("POST", "/batch", batch),
+        ("GET", "/dashboard", None),
+        ("GET", "/refresh/status", None),
+        ("GET", "/admin/memory", None),
+        ("GET", "/export/leaks.ndjson", None),
+        ("GET", "/metrics", None),
+    ]
+    plan = [(method, url, payload, False) for method, url, payload in plan]
+    # The oldest version each change log still reaches back to is its largest answer.
+    for feed, state in api.feed_changes.items():
+        if state["version"]:
+            plan.append(("GET", f"/changes/{feed}?since_version={state['base_version']}", None, False))
+    plan.append(("GET", "/stream", None, True))
+    plan.append(("GET", "/stream?feeds=news,cves", None, True))
+    return plan
+
+
+async def run_benchmark(args, root: Path) -> dict:
+    results = {"rss_mb": {"before_import": round(rss_mb(), 1)}}
+
+    started = time.perf_counter()
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    api = importlib.import_module("api")
+    results["import_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if args.bundle:
+        started = time.perf_counter()
+        await api.build_data_bundle(api.DATA_BUNDLE_PATH)
+        results["bundle_build_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    # Same order as startup_event, without its periodic refresh task.
+    results["refresh_ms"] = {}
+    startup_started = time.perf_counter()
+    for name, refresh in api.REFRESH_FUNCTIONS.items():
+        started = time.perf_counter()
+        await refresh()
+        results["refresh_ms"][name] = round((time.perf_counter() - started) * 1000, 1)
+    results["startup_ms"] = round((time.perf_counter() - startup_started) * 1000 + results["import_ms"], 1)
+    results["rss_mb"]["after_startup"] = round(rss_mb(), 1)
+
+    results["endpoints"] = {}
+    for method, url, payload, stream in endpoint_plan(root, api):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        timings = []
+        size = 0
+        status = None
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            status, _, content = await asgi_request(
+                api.app, method, url, body, headers={"X-Admin-Token": api.ADMIN_TOKEN}, stream=stream
+            )
+            timings.append((time.perf_counter() - started) * 1000)
+            size = len(content)
+        timings.sort()
+        results["endpoints"][f"{method} {url}"] = {
+            "status": status,
+            "bytes": size,
+            "p50_ms": round(percentile(timings, 0.50), 2),
+            "p90_ms": round(percentile(timings, 0.90), 2),
+            "p99_ms": round(percentile(timings, 0.99), 2),
+            "max_ms": round(timings[-1], 2),
+            "mean_ms": round(statistics.fmean(timings), 2),
+        }
+
+    results["rss_mb"]["after_requests"] = round(rss_mb(), 1)
+    results["rss_mb"]["peak"] = round(peak_rss_mb(), 1)
+    return results
+
+
+def failed_endpoints(results: dict) -> list:
+    return [endpoint for endpoint, stats in results["endpoints"].items() if not 200 <= stats["status"] < 300]
+
+
+def print_report(results: dict) -> None:
+    print(f"\nStartup {results['startup_ms']} ms (import {results['import_ms']} ms)")
+    for name, ms in results["refresh_ms"].items():
+        print(f"  refresh {name:<14} {ms:>10.1f} ms")
+    print("RSS (MB): " + ", ".join(f"{k}={v}" for k, v in results["rss_mb"].items()))
+    print(f"\n{'endpoint':<90} {'status':>6} {'bytes':>10} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    failed = failed_endpoints(results)
+    for endpoint, stats in results["endpoints"].items():
+        status = f"!{stats['status']}" if endpoint in failed else str(stats["status"])
+        print(
+            f"{endpoint[:90]:<90} {status:>6} {stats['bytes']:>10} "
+            f"{stats['p50_ms']:>8.2f} {stats['p90_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['max_ms']:>8.2f}"
+        )
+    if failed:
+        print(f"\n{len(failed)} endpoint(s) answered non-2xx; their timings measure the error path:")
+        for endpoint in failed:
+            print(f"  {results['endpoints'][endpoint]['status']} {endpoint}")
+
+
+def main() -> int:
+    args = parse_arguments()
+    sizes = scaled_sizes(args.scale)
+
+    temp_dir = None
+    if args.data_dir:
+        root = Path(args.data_dir).resolve()
+    else:
+        temp_dir = tempfile.mkdtemp(prefix="menaxa-bench-")
+        root = Path(temp_dir)
+
+    try:
+        if args.reuse and (root / "data").exists():
+            counts = None
+            print(f"Reusing dataset in {root}")
+        else:
+            started = time.perf_counter()
+            counts = generate_dataset(root, sizes, args.seed)
+            print(f"Generated dataset in {root} in {time.perf_counter() - started:.1f}s: {counts}")
+
+        # api.py resolves data/ relative to the working directory and reads its
+        # configuration at import time.
+        os.chdir(root)
+        os.environ["LOW_MEMORY_MODE"] = "false" if args.full_memory else "true"
+        os.environ["UPSTREAM_DATA_BASE_URL"] = ""
+        # Admin endpoints do not exist without a token.
+        os.environ.setdefault("ADMIN_TOKEN", "benchmark")
+        os.environ.setdefault("DATA_BUNDLE_PATH", str(root / "data" / "bundle" / "menaxa.bundle"))
+
+        results = asyncio.run(run_benchmark(args, root))
+        results["config"] = {
+            "scale": args.scale,
+            "seed": args.seed,
+            "requests": args.requests,
+            "low_memory_mode": not args.full_memory,
+            "bundle": args.bundle,
+            "records": counts,
+        }
+        print_report(results)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            print(f"\nResults written to {args.json}")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return 1 if failed_endpoints(results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
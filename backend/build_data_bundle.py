@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+from pathlib import Path
+
+import api
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Compile the local data/ tree into the prebuilt bundle read by api.py')
+    parser.add_argument('-o', '--output', default=str(api.DATA_BUNDLE_PATH),
+                      help=f'Output bundle path (default: {api.DATA_BUNDLE_PATH})')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    output = Path(args.output)
+
+    header = asyncio.run(api.build_data_bundle(output))
+    segments = header["segments"]
+    total_bytes = sum(info["length"] for info in segments.values())
+
+    print(f"Bundle {header['bundle_version']} written to {output}")
+    for name, info in sorted(segments.items()):
+        print(f"  {name:<20} {info['count']:>8} records  {info['length']:>10} bytes")
+    print(f"{len(segments)} segments, {total_bytes} bytes of payload")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
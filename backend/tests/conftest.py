@@ -0,0 +1,62 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import api  # noqa: E402
+
+
+def make_cve(number: int, year: int = 2016, modified: str = "2025-01-01T00:00Z", score: float = 7.5):
+    return {
+        "cve_id": f"CVE-{year}-{number:05d}",
+        "description": f"Example vulnerability {number}",
+        "publishedDate": f"{year}-01-{1 + number % 28:02d}T00:00Z",
+        "lastModifiedDate": modified,
+        "score": score,
+        "severity": "wysoka",
+        "severity_en": "high",
+    }
+
+
+def write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Empty data/ tree as the working directory, with the CVE caches reset."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data" / "external_feed" / "cve").mkdir(parents=True)
+    for cache in (api.cve_year_cache, api.cve_year_versions, api.cve_year_snapshots, api.cve_summary_cache):
+        cache.clear()
+    api.cve_year_cache_order.clear()
+    for key in list(api.search_indexes):
+        if key.startswith("cves/"):
+            del api.search_indexes[key]
+    api.cve_cache.update({"data": None, "last_updated": None, "last_file": None,
+                          "total_records": None, "available_years": None})
+    api.feed_changes["cves"]["version"] = 0
+    return tmp_path
+
+
+class UpstreamResponse:
+    status_code = 200
+
+    def __init__(self, items):
+        self.items = items
+
+    def json(self):
+        return self.items
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Serve whatever list is stored in upstream["items"] as the synced year file."""
+    served = {"items": []}
+    monkeypatch.setattr(api, "UPSTREAM_DATA_BASE_URL", "http://upstream.test")
+    monkeypatch.setattr(api.requests, "get", lambda url, timeout, headers: UpstreamResponse(served["items"]))
+    return served
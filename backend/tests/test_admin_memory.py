@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import write_json
+
+TOKEN = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "secret")
+    return TestClient(api.app)
+
+
+def test_deep_sizeof_follows_instance_attributes():
+    async def queued_client():
+        client = api.StreamClient(None)
+        client.offer("news", b"x" * 100_000)
+        return client
+
+    client = asyncio.run(queued_client())
+    size, _, truncated = api.deep_sizeof(client)
+    assert size > 100_000 and not truncated
+
+
+def test_deep_sizeof_samples_and_truncates():
+    records = [{"id": n, "text": "x" * (100 + n % 7)} for n in range(20_000)]
+    exact, exact_objects, _ = api.deep_sizeof(records)
+    sampled, sampled_objects, truncated = api.deep_sizeof(records, sample_items=500)
+    assert not truncated and sampled_objects < exact_objects / 10
+    assert abs(sampled - exact) < exact * 0.05
+    assert api.deep_sizeof(records, max_objects=1000)[1:] == (1000, True)
+
+
+def test_admin_endpoints_need_a_configured_token(monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", None)
+    client = TestClient(api.app)
+    assert client.get("/admin/memory").status_code == 404
+    assert client.post("/admin/memory/profile", params={"feed": "leaks"}).status_code == 404
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/memory", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_admin_memory_reports_every_target(admin):
+    body = admin.get("/admin/memory", headers=TOKEN).json()
+    assert set(api.admin_memory_targets()) <= set(body["caches"])
+    assert all("truncated" in cache for cache in body["caches"].values())
+    assert body["peak_rss_bytes"] > 0
+
+
+def test_profile_runs_through_the_coordinator(admin, data_dir):
+    write_json(data_dir / "data" / "external_feed" / "leak.json", [{"name": "Leak", "domain": "leak.test", "leak_count": 1}])
+    runs = api.refresh_coordinator.status["leaks"]["runs"]
+    body = admin.post("/admin/memory/profile", params={"feed": "leaks"}, headers=TOKEN).json()
+    assert body["joined_running_job"] is False and body["error"] is None
+    assert api.refresh_coordinator.status["leaks"]["runs"] == runs + 1
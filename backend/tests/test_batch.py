@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+LEAKS = [{"name": f"Leak {i}", "leak_count": i, "breach_date": f"2024-01-{i + 1:02d}"} for i in range(5)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(api.leaks_cache, "data", LEAKS)
+    monkeypatch.setitem(api.leaks_cache, "last_updated", "2025-01-01T00:00:00")
+    monkeypatch.setitem(api.leaks_cache, "sort_orders", api.build_sort_orders(LEAKS, api.LEAKS_SORT_FIELDS))
+    monkeypatch.setitem(api.news_cache, "data", None)
+    monkeypatch.setattr(api, "batch_cache", {})
+    return TestClient(api.app)
+
+
+def test_results_match_the_single_feed_endpoints(client):
+    batch = client.post("/batch", json=[
+        {"feed": "leaks", "page_size": 2, "sort": "-leak_count", "fields": "name"},
+        {"feed": "leaks", "limit": 1},
+    ]).json()["results"]
+    assert batch[0] == client.get("/leaks", params={"page_size": 2, "sort": "-leak_count", "fields": "name"}).json()
+    assert batch[1] == client.get("/leaks", params={"page_size": 1}).json()
+
+
+def test_bad_queries_fail_in_place(client):
+    results = client.post("/batch", json=[
+        {"feed": "leaks", "limit": 1, "page_size": 1},
+        {"feed": "leaks", "search": "x"},
+        {"feed": "leaks", "page": "2"},
+        {"feed": "phishing"},
+        {"feed": "leaks", "limit": 1},
+    ]).json()["results"]
+    assert [r.get("error", {}).get("status_code") for r in results] == [400, 400, 400, 400, None]
+    assert results[1]["error"]["detail"] == "Unsupported leaks parameters: search"
+
+
+def test_identical_batches_are_cached_unless_a_feed_is_not_loaded(client):
+    queries = [{"feed": "leaks", "limit": 2}]
+    assert client.post("/batch", json=queries).headers["x-cache"] == "miss"
+    assert client.post("/batch", json=queries).headers["x-cache"] == "hit"
+
+    queries.append({"feed": "news", "limit": 2})
+    first = client.post("/batch", json=queries)
+    assert first.json()["results"][1]["error"]["status_code"] == 503
+    assert client.post("/batch", json=queries).headers["x-cache"] == "miss"
+
+
+def test_batch_and_dashboard_limits(client):
+    assert client.post("/batch", json=[]).status_code == 400
+    assert client.post("/batch", json=[{"feed": "leaks"}] * 11).status_code == 400
+    assert client.get("/dashboard", params={"limit": 101}).status_code == 400
+    dashboard = client.get("/dashboard", params={"limit": 2}).json()["results"]
+    assert [record["name"] for record in dashboard[1]["data"]] == ["Leak 4", "Leak 3"]
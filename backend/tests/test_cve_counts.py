@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+YEARS = range(2010, 2016)
+
+
+@pytest.fixture
+def years(data_dir, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", True)
+    monkeypatch.setitem(api.data_bundle, "disabled", True)
+    for year in YEARS:
+        write_json(data_dir / "data" / "external_feed" / "cve" / f"{year}.json",
+                   [make_cve(n, year=year) for n in range(3)])
+    asyncio.run(api.refresh_cve_data())
+    # Warm the per-version counts, then forget every held year.
+    assert TestClient(api.app).get("/get-cves", params={"page_size": 2}).json()["total_records"] == 18
+    api.cve_year_cache.clear()
+    api.cve_year_cache_order.clear()
+    api.cve_year_versions.clear()
+    return data_dir
+
+
+def test_offset_page_counts_years_without_parsing_them(years, monkeypatch):
+    parsed = []
+    read = api.read_cve_year_file
+    monkeypatch.setattr(api, "read_cve_year_file", lambda path: parsed.append(path.stem) or read(path))
+
+    page = TestClient(api.app).get("/get-cves", params={"page": 2, "page_size": 2}).json()
+    assert page["total_records"] == 18
+    assert [item["cve_id"][:8] for item in page["data"]] == ["CVE-2015", "CVE-2014"]
+    assert parsed == ["2015", "2014"]
+
+
+def test_cursor_page_only_counts_years_it_reaches(years, monkeypatch):
+    counted = []
+    count = api.cve_year_record_count
+    monkeypatch.setattr(api, "cve_year_record_count", lambda year: counted.append(year) or count(year))
+
+    page = TestClient(api.app).get("/get-cves", params={"cursor": "", "page_size": 3}).json()
+    assert "total_records" not in page
+    assert page["next_cursor"] is not None
+    assert counted == ["2014"]
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+
+@pytest.fixture
+def cve_years(data_dir, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", True)
+    monkeypatch.setitem(api.data_bundle, "disabled", True)
+    cve_dir = data_dir / "data" / "external_feed" / "cve"
+    write_json(cve_dir / "2015.json", [make_cve(n, year=2015, score=n * 2.5) for n in range(5)])
+    write_json(cve_dir / "2016.json", [make_cve(n, score=9.9) for n in range(3)])
+    asyncio.run(api.refresh_cve_data())
+    return cve_dir
+
+
+def stats(params=None):
+    return TestClient(api.app).get("/cves/stats", params=params).json()["data"]
+
+
+def test_stats_merge_every_year(cve_years):
+    data = stats()
+    assert data["total"] == 8
+    assert data["by_year"] == {"2016": 3, "2015": 5}
+    assert [bucket["count"] for bucket in data["score_histogram"]] == [1, 0, 1, 0, 0, 1, 0, 1, 0, 4]
+    assert data["by_severity"] == {"high": 8}
+    assert stats({"year": "2015"})["total"] == 5
+
+
+def test_persisted_summaries_are_reused_until_the_year_changes(cve_years, monkeypatch):
+    stats()
+    assert (cve_years / "2016.summary.json").exists()
+    api.cve_summary_cache.clear()
+    read = api.read_cve_year_file
+    parsed = []
+    monkeypatch.setattr(api, "read_cve_year_file", lambda path: parsed.append(path.stem) or read(path))
+    monkeypatch.setattr(api, "current_cve_year_list", lambda year: None)
+
+    assert stats()["total"] == 8
+    assert parsed == []
+
+    write_json(cve_years / "2016.json", [make_cve(n) for n in range(4)])
+    assert stats()["by_year"]["2016"] == 4
+    assert parsed == ["2016"]
+
+
+def test_incremental_sync_matches_a_full_recount(data_dir, upstream, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", False)
+    year_file = data_dir / "data" / "external_feed" / "cve" / "2016.json"
+    base = [make_cve(n, score=9.9) for n in range(3)]
+    write_json(year_file, base)
+    asyncio.run(api.refresh_cve_data())
+    upstream["items"] = base
+    assert api.sync_cve_year_file(2016, force=True)
+    api.ensure_cve_year_summary(year_file)
+
+    recounted = []
+    monkeypatch.setattr(api, "store_cve_year_summary", lambda *args: recounted.append(args))
+    upstream["items"] = [make_cve(1, modified="2025-06-01T00:00Z", score=3.0), base[2], make_cve(7, score=None)]
+    assert api.sync_cve_year_file(2016, force=True)
+    assert recounted == []
+
+    summary = api.ensure_cve_year_summary(year_file)
+    expected = api.compute_cve_year_summary(api.read_cve_year_file(year_file))
+    assert {k: v for k, v in summary.items() if k != "source_version"} == expected
+    assert (summary["total"], summary["unscored"]) == (3, 1)
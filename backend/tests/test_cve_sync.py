@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+import api
+from conftest import make_cve, write_json
+
+
+def held_year(year: str):
+    return api.cve_year_records(year)
+
+
+@pytest.mark.parametrize("low_memory", [True, False])
+def test_sync_after_external_rewrite_does_not_duplicate(data_dir, upstream, monkeypatch, low_memory):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", low_memory)
+    year_file = data_dir / "data" / "external_feed" / "cve" / "2016.json"
+    base = [make_cve(n) for n in range(10)]
+    write_json(year_file, base)
+    asyncio.run(api.refresh_cve_data())
+    assert len(held_year("2016")) == 10
+
+    # First sync records a snapshot of what it wrote.
+    upstream["items"] = base + [make_cve(10)]
+    assert api.sync_cve_year_file(2016, force=True)
+    assert len(held_year("2016")) == 11
+
+    # Another tool rewrites the year with one more CVE and the caches reload it.
+    rewritten = base + [make_cve(10), make_cve(11)]
+    write_json(year_file, rewritten)
+    asyncio.run(api.refresh_cve_data())
+    assert len(held_year("2016")) == 12
+
+    # The next sync must diff against the rewritten file, not the stale snapshot.
+    upstream["items"] = rewritten + [make_cve(12)]
+    assert api.sync_cve_year_file(2016, force=True)
+    records = held_year("2016")
+    assert len(records) == 13
+    assert len({item["cve_id"] for item in records}) == 13
+    assert api.ensure_cve_year_summary(year_file)["total"] == 13
+
+
+def test_sync_merges_changes_against_matching_snapshot(data_dir, upstream, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", False)
+    year_file = data_dir / "data" / "external_feed" / "cve" / "2016.json"
+    base = [make_cve(n) for n in range(5)]
+    write_json(year_file, base)
+    asyncio.run(api.refresh_cve_data())
+
+    upstream["items"] = base[1:] + [make_cve(0, modified="2025-06-01T00:00Z", score=9.8), make_cve(5)]
+    assert api.sync_cve_year_file(2016, force=True)
+    records = held_year("2016")
+    assert sorted(item["cve_id"] for item in records) == [make_cve(n)["cve_id"] for n in range(6)]
+    assert next(item for item in records if item["cve_id"] == make_cve(0)["cve_id"])["score"] == 9.8
+    summary = api.ensure_cve_year_summary(year_file)
+    assert summary["total"] == 6
+    assert summary["score_histogram"][9] == 1
+
+
+def test_followers_never_sync(data_dir, upstream, monkeypatch):
+    fcntl = pytest.importorskip("fcntl")
+    lock_path = data_dir / "refresh.lock"
+    monkeypatch.setattr(api, "SHARED_REFRESH", True)
+    monkeypatch.setattr(api, "REFRESH_LEADER_LOCK_PATH", lock_path)
+    monkeypatch.setitem(api.refresh_leader, "file", None)
+    calls = []
+    monkeypatch.setattr(api.requests, "get", lambda *args, **kwargs: calls.append(args))
+
+    with open(lock_path, "a+") as leader:
+        fcntl.flock(leader.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert not api.sync_cve_year_file(2016, force=True)
+    assert calls == []
+
+
+def test_sync_replaces_year_file_atomically(data_dir, upstream):
+    upstream["items"] = [make_cve(n) for n in range(3)]
+    assert api.sync_cve_year_file(2016, force=True)
+    cve_dir = data_dir / "data" / "external_feed" / "cve"
+    assert sorted(p.name for p in cve_dir.iterdir() if not p.name.endswith(".summary.json")) == ["2016.json"]
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+
+def year_ids(client, year):
+    return [item["cve_id"] for item in client.get("/get-cves", params={"year": year}).json()["data"]]
+
+
+@pytest.mark.parametrize("low_memory", [True, False])
+def test_rewritten_year_is_reread_without_a_refresh(data_dir, monkeypatch, low_memory):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", low_memory)
+    monkeypatch.setitem(api.data_bundle, "disabled", True)
+    cve_dir = data_dir / "data" / "external_feed" / "cve"
+    write_json(cve_dir / "2015.json", [make_cve(n, year=2015) for n in range(2)])
+    write_json(cve_dir / "2016.json", [make_cve(n) for n in range(2)])
+    asyncio.run(api.refresh_cve_data())
+    client = TestClient(api.app)
+    assert len(year_ids(client, "2016")) == 2
+    other_year = api.cve_year_records("2015")
+
+    write_json(cve_dir / "2016.json", [make_cve(n) for n in range(3)])
+    assert year_ids(client, "2016") == [make_cve(n)["cve_id"] for n in (2, 1, 0)]
+    assert api.cve_year_records("2015") is other_year
+
+
+def test_unchanged_year_is_served_from_the_cache(data_dir, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", True)
+    monkeypatch.setitem(api.data_bundle, "disabled", True)
+    write_json(data_dir / "data" / "external_feed" / "cve" / "2016.json", [make_cve(n) for n in range(2)])
+    asyncio.run(api.refresh_cve_data())
+    api.load_cve_year_data("2016")
+
+    parsed = []
+    monkeypatch.setattr(api, "read_cve_year_file", lambda path: parsed.append(path.stem) or [])
+    assert len(api.load_cve_year_data("2016")) == 2
+    assert parsed == []
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+QUERIES = [
+    "/news",
+    "/news?limit=2",
+    "/news?page=1&page_size=2&sort=-title",
+    "/leaks",
+    "/leaks?page=1&page_size=2&sort=-leak_count",
+    "/search/all?q=example&limit=5",
+]
+
+
+@pytest.fixture
+def feeds(data_dir):
+    now = datetime.now(timezone.utc)
+    feed_dir = data_dir / "data" / "external_feed"
+    news = [
+        {"title": f"Story {n}", "link": f"https://news.test/{n}", "source": "Wire",
+         "pubDate": (now - timedelta(hours=n)).isoformat()}
+        for n in range(5)
+    ]
+    # Dropped until it is less than a day ahead.
+    news.append({"title": "Scheduled", "link": "https://news.test/later", "source": "Wire",
+                 "pubDate": (now + timedelta(days=3)).isoformat()})
+    write_json(feed_dir / "newsen.json", news)
+    write_json(feed_dir / "leak.json", [
+        {"name": f"Leak {n}", "domain": f"leak{n}.test", "breach_date": f"2024-01-0{n + 1}", "leak_count": n * 10}
+        for n in range(4)
+    ])
+    write_json(feed_dir / "cve" / "2016.json", [make_cve(n) for n in range(6)])
+    return data_dir
+
+
+async def refresh_all():
+    # Feeds without files in the fixture just record their error.
+    for feed in api.REFRESH_FUNCTIONS:
+        await api.refresh_coordinator.refresh(feed)
+
+
+def responses():
+    client = TestClient(api.app)
+    return {url: client.get(url).json() for url in QUERIES}
+
+
+def test_bundle_serves_same_responses_as_raw_files(feeds, monkeypatch):
+    asyncio.run(api.build_data_bundle())
+    with monkeypatch.context() as patch:
+        patch.setitem(api.data_bundle, "disabled", True)
+        asyncio.run(refresh_all())
+        assert isinstance(api.news_cache["data"], list)
+        raw = responses()
+
+    asyncio.run(refresh_all())
+    assert isinstance(api.news_cache["data"], api.BundleRecords)
+    assert isinstance(api.leaks_cache["encoded"], memoryview)
+    assert responses() == raw
+    assert api.news_cache["total_records"] == 5
+
+
+def test_news_segment_expires_when_dropped_item_is_due(feeds, monkeypatch):
+    asyncio.run(api.build_data_bundle())
+    news_file = api.get_news_file()
+    info = api.bundle_segment_info("news", news_file)
+    assert info is not None and info["fresh_until"] is not None
+
+    monkeypatch.setattr(api.time, "time", lambda: info["fresh_until"] + 1)
+    assert api.bundle_segment_info("news", news_file) is None
+    assert api.data_bundle_is_stale()
+
+
+def test_leader_publishes_bundle_from_child_process(feeds, monkeypatch):
+    monkeypatch.setattr(api, "SHARED_REFRESH", True)
+    monkeypatch.setattr(api, "is_refresh_leader", lambda: True)
+    monkeypatch.setattr(api, "sync_cve_year_file", lambda year: False)
+
+    def build_in_process(target=api.DATA_BUNDLE_PATH):
+        raise AssertionError("the bundle must not be built on the leader's event loop")
+    monkeypatch.setattr(api, "build_data_bundle", build_in_process)
+
+    assert api.data_bundle_is_stale()
+    asyncio.run(api.sync_and_publish())
+    assert api.get_data_bundle() is not None
+    assert not api.data_bundle_is_stale()
+
+
+def test_full_memory_cve_years_stay_in_the_mapping(feeds, upstream, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", False)
+    write_json(feeds / "data" / "external_feed" / "cve" / "2015.json", [make_cve(n, year=2015) for n in range(4)])
+    asyncio.run(api.build_data_bundle())
+    client = TestClient(api.app)
+
+    def cve_responses():
+        pages = [client.get(url).json() for url in ("/get-cves?page_size=3", "/get-cves?year=2016&page=2&page_size=2")]
+        return [{**page, "last_updated": None} for page in pages] + [client.get("/export/cves.ndjson").content]
+
+    with monkeypatch.context() as patch:
+        patch.setitem(api.data_bundle, "disabled", True)
+        asyncio.run(api.refresh_cve_data())
+        raw = cve_responses()
+
+    asyncio.run(api.refresh_cve_data())
+    assert all(isinstance(year, api.BundleRecords) for year in api.cve_cache["data"].values())
+    assert cve_responses() == raw
+
+    # A sync gives only the changed year a list of this worker's own.
+    upstream["items"] = [make_cve(n) for n in range(6)]
+    assert api.sync_cve_year_file(2016, force=True)
+    upstream["items"] = [make_cve(n) for n in range(7)]
+    assert api.sync_cve_year_file(2016, force=True)
+    assert isinstance(api.cve_cache["data"]["2016"], list)
+    assert len(api.cve_cache["data"]["2016"]) == 7
+    assert isinstance(api.cve_cache["data"]["2015"], api.BundleRecords)
+
+
+def test_refresh_status_does_not_take_the_leader_lock(data_dir, monkeypatch):
+    monkeypatch.setattr(api, "SHARED_REFRESH", True)
+    monkeypatch.setitem(api.refresh_leader, "file", None)
+    monkeypatch.setattr(api, "is_refresh_leader", lambda: pytest.fail("a GET took the leader lock"))
+    assert TestClient(api.app).get("/refresh/status").json()["worker"]["leader"] is (api.fcntl is None)
@@ -0,0 +1,59 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import api
+from conftest import write_json
+
+
+def lookup(host):
+    return TestClient(api.app).get(f"/domain/{host}").json()
+
+
+def test_shared_hosts_are_listed_per_url(data_dir, monkeypatch):
+    monkeypatch.setitem(api.data_bundle, "disabled", True)
+    monkeypatch.setitem(api.leaks_cache, "data", None)
+    url_file = data_dir / "data" / "phishing_urls" / "urls.txt"
+    url_file.parent.mkdir(parents=True)
+    url_file.write_text(
+        "https://docs.google.com/forms/d/e/phish/viewform\n"
+        "https://ipfs.io/ipfs/QmPhish\n"
+        "https://t.co/AbC123\n"
+        "https://login.evil.test/wallet\n",
+        encoding="utf-8",
+    )
+    asyncio.run(api.refresh_domain_reputation())
+
+    for host in ("google.com", "docs.google.com", "ipfs.io", "t.co", "docs.google.com/forms/d/e/other"):
+        assert not lookup(host)["listed"], host
+    hit = lookup("https://docs.google.com/forms/d/e/phish/viewform?usp=sf_link")
+    assert hit["matches"] == [{"domain": "docs.google.com", "url": "docs.google.com/forms/d/e/phish/viewform",
+                               "exact": True, "sources": ["phishing_urls"]}]
+    assert lookup("ipfs.io/ipfs/QmPhish")["listed"]
+    assert lookup("t.co/AbC123")["listed"]
+    assert lookup("https://login.evil.test/other")["listed"]
+
+
+def test_memory_accounting_includes_domain_table(data_dir, monkeypatch):
+    table = api.DomainTable()
+    monkeypatch.setitem(api.domain_reputation_cache, "table", table)
+    size, _, _ = api.deep_sizeof(api.domain_reputation_cache)
+    assert size > len(table.slots) * table.slots.itemsize
+
+
+def test_table_built_from_stale_leaks_is_rebuilt(data_dir, monkeypatch):
+    monkeypatch.setitem(api.data_bundle, "disabled", True)
+    leak_file = data_dir / "data" / "external_feed" / "leak.json"
+    write_json(leak_file, [{"name": "Old", "domain": "old-leak.test", "leak_count": 1}])
+    asyncio.run(api.refresh_leaks_data())
+    asyncio.run(api.refresh_domain_reputation())
+
+    # leak.json changes and the domains job runs before the leaks job has caught up.
+    write_json(leak_file, [{"name": "New", "domain": "new-leak.test", "leak_count": 2, "padding": "x"}])
+    asyncio.run(api.refresh_domain_reputation())
+    assert not lookup("new-leak.test")["listed"]
+
+    asyncio.run(api.refresh_leaks_data())
+    asyncio.run(api.refresh_domain_reputation())
+    assert lookup("new-leak.test")["listed"]
+    assert not lookup("old-leak.test")["listed"]
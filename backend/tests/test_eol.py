@@ -0,0 +1,115 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+def days_from_today(days):
+    return (datetime.now(timezone.utc).date() + timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def eol(monkeypatch):
+    # Newest cycle first, as in the feed; "status" is stale on purpose.
+    data = {
+        "Apache Kafka": [
+            {"cycle": "3.7", "eol": days_from_today(20), "status": "expired"},
+            {"cycle": "3.6", "eol": days_from_today(-5)},
+        ],
+        "Node.js": [
+            {"cycle": "20", "eol": days_from_today(200)},
+            {"cycle": "18", "eol": True},
+        ],
+        "Legacy OS": [
+            {"cycle": "2", "eol": days_from_today(-400)},
+        ],
+    }
+    pairs = api.eol_product_pairs(data)
+    index, eol_dates, eol_date_refs = api.build_eol_index(pairs)
+    aliases, cycle_index = api.build_eol_inventory_index(index)
+    for key, value in {
+        "data": data,
+        "last_updated": "2025-01-01T00:00:00",
+        "products": pairs,
+        "index": index,
+        "eol_dates": eol_dates,
+        "eol_date_refs": eol_date_refs,
+        "product_aliases": aliases,
+        "cycle_index": cycle_index,
+    }.items():
+        monkeypatch.setitem(api.eol_cache, key, value)
+    return TestClient(api.app)
+
+
+def test_expiring_lists_cycles_in_the_window_soonest_first(eol):
+    body = eol.get("/eol/expiring", params={"days": 30, "include_expired_days": 10}).json()
+    assert [(c["product"], c["cycle"], c["status"]) for c in body["data"]] == [
+        ("Apache Kafka", "3.6", "expired"),
+        ("Apache Kafka", "3.7", "active"),
+    ]
+    assert body["data"][1]["days_left"] == 20
+    assert eol.get("/eol/expiring", params={"days": 365}).json()["total_records"] == 2
+
+
+def test_a_cycle_is_active_through_its_eol_date():
+    today = datetime.now(timezone.utc).date()
+    assert api.eol_cycle_status({"eol": today.isoformat()}, today) == ("active", 0)
+    assert api.eol_cycle_status({"eol": days_from_today(-1)}, today) == ("expired", -1)
+    assert api.eol_cycle_status({"eol": False}, today) == ("active", None)
+    assert api.eol_cycle_status({"eol": "soon"}, today) == ("unknown", None)
+
+
+def test_status_matches_product_names_loosely(eol):
+    body = eol.get("/eol/status", params={"products": "apache-kafka, NODEJS,legacy os,unknown"}).json()
+    by_query = {row["query"]: row for row in body["data"]}
+    assert by_query["apache-kafka"]["status"] == "active"
+    assert by_query["apache-kafka"]["expired_cycles"] == ["3.6"]
+    assert by_query["NODEJS"]["product"] == "Node.js"
+    assert by_query["NODEJS"]["expired_cycles"] == ["18"]
+    assert body["expired"] == ["legacy os"]
+    assert body["not_found"] == ["unknown"]
+
+
+def test_status_rejects_an_empty_product_list(eol):
+    assert eol.get("/eol/status", params={"products": " , "}).status_code == 400
+
+
+def test_inventory_matches_versions_to_release_cycles(eol):
+    rows = [
+        {"product": "Kafka", "version": "3.6.2"},
+        {"product": "nodejs", "cycle": "v20"},
+        {"product": "Node.js", "version": "16.0.1"},
+        {"product": "Unknown", "version": "1.0"},
+        {"version": "1.0"},
+        "not a row",
+    ]
+    body = eol.post("/eol/inventory", json=rows).json()
+    kafka, node, old_node, unknown, no_product, not_a_row = body["data"]
+    assert (kafka["matched_product"], kafka["matched_cycle"], kafka["status"]) == ("Apache Kafka", "3.6", "expired")
+    assert (node["matched_cycle"], node["status"]) == ("20", "active")
+    assert old_node["found"] is False and old_node["matched_product"] == "Node.js"
+    assert unknown == {"product": "Unknown", "cycle": "1.0", "found": False}
+    assert no_product["error"] == "missing product"
+    assert not_a_row["found"] is False
+    assert body["summary"] == {"total_records": 6, "found": 2, "not_found": 4, "expired": 1, "active": 1}
+
+
+def test_inventory_streams_ndjson_in_input_order(eol, monkeypatch):
+    monkeypatch.setattr(api, "INVENTORY_CHUNK_ROWS", 2)
+    rows = [{"product": "Legacy OS", "version": str(i)} for i in range(5)]
+    response = eol.post("/eol/inventory", params={"format": "ndjson"}, json=rows)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["cycle"] for line in lines] == ["0", "1", "2", "3", "4"]
+    assert [line["found"] for line in lines] == [False, False, True, False, False]
+
+
+def test_vendor_aliases_are_dropped_when_ambiguous():
+    index = {"apachekafka": {"product": "Apache Kafka", "cycles": []},
+             "confluentkafka": {"product": "Confluent Kafka", "cycles": []},
+             "awslambda": {"product": "AWS Lambda", "cycles": []},
+             "azurelambda": {"product": "Azure Lambda", "cycles": []}}
+    aliases, _ = api.build_eol_inventory_index(index)
+    assert aliases == {"kafka": "apachekafka"}
@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+
+def exported_ids(client):
+    lines = client.get("/export/cves.ndjson").text.splitlines()
+    return [json.loads(line)["cve_id"] for line in lines]
+
+
+def test_export_rereads_a_held_year_that_changed(data_dir, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", True)
+    year_file = data_dir / "data" / "external_feed" / "cve" / "2016.json"
+    write_json(year_file, [make_cve(n) for n in range(3)])
+    asyncio.run(api.refresh_cve_data())
+    client = TestClient(api.app)
+    assert len(client.get("/get-cves", params={"year": "2016"}).json()["data"]) == 3
+    assert "2016" in api.cve_year_cache
+
+    write_json(year_file, [make_cve(n) for n in range(4)])
+    assert exported_ids(client) == [make_cve(n)["cve_id"] for n in (3, 2, 1, 0)]
+
+
+def test_export_starts_the_feed_off_the_event_loop(data_dir, monkeypatch):
+    first_step = {}
+
+    def records(feed):
+        try:
+            asyncio.get_running_loop()
+            first_step["on_loop"] = True
+        except RuntimeError:
+            first_step["on_loop"] = False
+        yield {"name": "Leak"}
+    monkeypatch.setattr(api, "export_feed_records", records)
+
+    assert TestClient(api.app).get("/export/leaks.ndjson").text == '{"name":"Leak"}\n'
+    assert first_step == {"on_loop": False}
@@ -0,0 +1,75 @@
+from collections import deque
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+def leak(name, count=1):
+    return {"name": name, "domain": f"{name.lower()}.test", "leak_count": count}
+
+
+@pytest.fixture
+def leaks_log(monkeypatch):
+    monkeypatch.setitem(api.feed_changes, "leaks", {
+        "version": 0, "base_version": 0, "log": deque(maxlen=3), "digests": None
+    })
+    monkeypatch.setitem(api.stream_state, "ring", deque(maxlen=api.STREAM_REPLAY_EVENTS))
+    return TestClient(api.app)
+
+
+def changes(client, since):
+    return client.get("/changes/leaks", params={"since_version": since}).json()
+
+
+def test_delta_lists_added_changed_and_removed_keys(leaks_log):
+    first = api.record_feed_changes("leaks", [leak("A"), leak("B"), leak("C")])
+    assert changes(leaks_log, first) == {
+        "feed": "leaks", "since_version": first, "version": first,
+        "resync": False, "added": [], "changed": [], "removed": [],
+    }
+
+    second = api.record_feed_changes("leaks", [leak("A", 2), leak("C"), leak("D")])
+    body = changes(leaks_log, first)
+    assert body["version"] == second > first
+    assert body["added"] == [leak("D")]
+    assert body["changed"] == [leak("A", 2)]
+    assert body["removed"] == ["B"]
+    assert changes(leaks_log, second)["added"] == []
+    assert api.record_feed_changes("leaks", [leak("A", 2), leak("C"), leak("D")]) is None
+
+
+def test_changes_net_out_across_versions(leaks_log):
+    first = api.record_feed_changes("leaks", [leak("A")])
+    api.record_feed_changes("leaks", [leak("A"), leak("B")])
+    api.record_feed_changes("leaks", [leak("A")])
+    api.record_feed_changes("leaks", [leak("B", 5)])
+    body = changes(leaks_log, first)
+    assert body["added"] == [leak("B", 5)]
+    assert body["changed"] == []
+    assert body["removed"] == ["A"]
+
+
+def test_versions_older_than_the_log_resync(leaks_log):
+    first = api.record_feed_changes("leaks", [leak("A")])
+    for count in range(2, 6):
+        api.record_feed_changes("leaks", [leak("A", count)])
+    assert changes(leaks_log, first)["resync"] is True
+    base = api.feed_changes["leaks"]["base_version"]
+    assert changes(leaks_log, base)["changed"] == [leak("A", 5)]
+
+
+def test_oversized_refresh_starts_a_new_log(leaks_log, monkeypatch):
+    monkeypatch.setattr(api, "CHANGE_LOG_MAX_KEYS", 2)
+    first = api.record_feed_changes("leaks", [leak("A")])
+    api.record_feed_changes("leaks", [leak(name) for name in "ABCD"])
+    assert changes(leaks_log, first)["resync"] is True
+    assert len(api.feed_changes["leaks"]["log"]) == 0
+
+
+def test_invalid_requests(leaks_log):
+    assert leaks_log.get("/changes/leaks", params={"since_version": 0}).status_code == 503
+    version = api.record_feed_changes("leaks", [leak("A")])
+    assert leaks_log.get("/changes/leaks", params={"since_version": version + 1}).status_code == 400
+    assert leaks_log.get("/changes/phishing", params={"since_version": 0}).status_code == 404
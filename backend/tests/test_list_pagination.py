@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+LEAKS = [
+    {"name": "Beta", "domain": "beta.test", "leak_count": 30, "description": "long text"},
+    {"name": "alpha", "domain": "alpha.test", "leak_count": None, "description": "long text"},
+    {"name": "Gamma", "domain": "gamma.test", "leak_count": 10, "description": "long text"},
+    {"name": "Delta", "domain": "delta.test", "leak_count": 20, "description": "long text"},
+    {"name": "", "domain": "empty.test", "leak_count": 5, "description": "long text"},
+]
+
+
+@pytest.fixture
+def leaks(monkeypatch):
+    monkeypatch.setitem(api.leaks_cache, "data", LEAKS)
+    monkeypatch.setitem(api.leaks_cache, "last_updated", "2025-01-01T00:00:00")
+    monkeypatch.setitem(api.leaks_cache, "sort_orders", api.build_sort_orders(LEAKS, api.LEAKS_SORT_FIELDS))
+    return TestClient(api.app)
+
+
+def names(response):
+    return [record["name"] for record in response.json()["data"]]
+
+
+def test_sorted_pages_cover_every_record_once(leaks):
+    first = leaks.get("/leaks", params={"sort": "-leak_count", "page_size": 3})
+    second = leaks.get("/leaks", params={"sort": "-leak_count", "page_size": 3, "page": 2})
+    assert names(first) == ["Beta", "Delta", "Gamma"]
+    assert names(second) == ["", "alpha"]
+    assert second.json()["total_pages"] == 2
+    assert second.json()["total_records"] == 5
+
+
+def test_records_without_a_value_sort_last_in_both_directions(leaks):
+    assert names(leaks.get("/leaks", params={"sort": "name"})) == ["alpha", "Beta", "Delta", "Gamma", ""]
+    assert names(leaks.get("/leaks", params={"sort": "-name"})) == ["Gamma", "Delta", "Beta", "alpha", ""]
+    assert names(leaks.get("/leaks", params={"sort": "leak_count"}))[-1] == "alpha"
+
+
+def test_fields_projects_each_record(leaks):
+    body = leaks.get("/leaks", params={"fields": "name,leak_count", "page_size": 2}).json()
+    assert body["data"] == [{"name": "Beta", "leak_count": 30}, {"name": "alpha", "leak_count": None}]
+
+
+@pytest.mark.parametrize("params", [
+    {"sort": "description"},
+    {"page": 4, "page_size": 2},
+    {"page": 0},
+    {"page_size": 1001},
+    {"fields": ","},
+])
+def test_invalid_page_requests_are_rejected(leaks, params):
+    assert leaks.get("/leaks", params=params).status_code == 400
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+
+@pytest.fixture
+def admitted(monkeypatch):
+    """Costs of the requests admitted through memory_budget."""
+    costs = []
+
+    async def acquire(cost, name):
+        costs.append(cost)
+
+    async def release(cost):
+        pass
+    monkeypatch.setattr(api.memory_budget, "acquire", acquire)
+    monkeypatch.setattr(api.memory_budget, "release", release)
+    return costs
+
+
+def test_cve_stats_is_budgeted_only_while_summaries_are_missing(data_dir, monkeypatch, admitted):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", True)
+    cve_dir = data_dir / "data" / "external_feed" / "cve"
+    for year in (2015, 2016):
+        write_json(cve_dir / f"{year}.json", [make_cve(n, year=year) for n in range(3)])
+    asyncio.run(api.refresh_cve_data())
+    for summary in cve_dir.glob("*.summary.json"):
+        summary.unlink()
+    api.cve_summary_cache.clear()
+
+    client = TestClient(api.app)
+    stats = client.get("/cves/stats").json()["data"]
+    assert stats["by_year"] == {"2016": 3, "2015": 3}
+    # Years are summarized one at a time: the largest one bounds the cost.
+    assert admitted == [max(api.json_parse_cost(cve_dir / f"{year}.json") for year in (2015, 2016))]
+
+    # The rollups are persisted now, so the next request costs nothing.
+    api.cve_summary_cache.clear()
+    client.get("/cves/stats")
+    assert len(admitted) == 1
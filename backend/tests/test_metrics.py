@@ -0,0 +1,56 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import api
+
+
+def metric_lines(client, prefix):
+    return [line for line in client.get("/metrics").text.splitlines() if line.startswith(prefix)]
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = api.Histogram("demo_seconds", "Demo.", "route", (0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe('/a"b', value)
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a\\"b",le="0.1"} 2',
+        'demo_seconds_bucket{route="/a\\"b",le="1"} 3',
+        'demo_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'demo_seconds_sum{route="/a\\"b"} 3.65',
+        'demo_seconds_count{route="/a\\"b"} 4',
+    ]
+
+
+def test_requests_are_labelled_by_route_template(monkeypatch):
+    monkeypatch.setitem(api.eol_cache, "index", {})
+    monkeypatch.setattr(api, "REQUEST_LATENCY", api.Histogram("latency", "", "route", (1,)))
+    monkeypatch.setattr(api, "RESPONSE_SIZE", api.Histogram("size", "", "route", (1_000_000,)))
+    client = TestClient(api.app)
+    for product in ("kafka", "nodejs"):
+        assert client.get(f"/eol/product/{product}").status_code == 404
+    client.get("/no-such-route")
+
+    assert 'latency_count{route="/eol/product/{product}"} 2' in metric_lines(client, "latency_count")
+    assert 'latency_count{route="unmatched"} 1' in metric_lines(client, "latency_count")
+    assert 'size_bucket{route="/eol/product/{product}",le="1e+06"} 2' in metric_lines(client, "size_bucket")
+
+
+def test_refresh_records_duration_and_cache_size(monkeypatch, tmp_path):
+    source = tmp_path / "feed.json"
+    source.write_text("[1, 2, 3]", encoding="utf-8")
+    cache = {"data": None, "last_file": None}
+    monkeypatch.setattr(api, "refresh_gauges", {})
+    monkeypatch.setattr(api, "REFRESH_DURATION", api.Histogram("menaxa_refresh_duration_seconds", "", "feed", (1,)))
+
+    @api.instrument_refresh("demo", cache)
+    async def refresh_demo():
+        cache.update({"data": [1, 2, 3], "last_file": source})
+
+    asyncio.run(refresh_demo())
+    assert api.refresh_gauges == {"demo": {"records": 3, "source_bytes": 9}}
+    lines = metric_lines(TestClient(api.app), "menaxa_refresh")
+    assert 'menaxa_refresh_records{feed="demo"} 3' in lines
+    assert 'menaxa_refresh_duration_seconds_count{feed="demo"} 1' in lines
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+import api
+
+WORDS = "critical flaw in widely used open source logging library lets attackers run code on servers"
+
+
+def news_items(titles_and_links):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    items = [
+        {"title": title, "link": link, "source": "Wire", "pubDate": (start + timedelta(hours=i)).isoformat()}
+        for i, (title, link) in enumerate(titles_and_links)
+    ]
+    return items, [start.timestamp() + 3600 * i for i in range(len(items))]
+
+
+def collapsed_titles(titles_and_links):
+    kept, _, collapsed = api.collapse_duplicate_news(*news_items(titles_and_links))
+    return sorted((item["title"], item["cluster_size"]) for item in kept), collapsed
+
+
+def test_links_differing_only_in_query_are_distinct_stories():
+    kept, collapsed = collapsed_titles([
+        ("First story", "https://news.test/article?id=1"),
+        ("Second story", "https://news.test/article?id=2"),
+        ("First story reposted", "https://www.news.test/article/?id=1&utm_source=feed"),
+    ])
+    assert collapsed == 1
+    assert kept == [("First story", 2), ("Second story", 1)]
+
+
+def test_near_duplicate_found_behind_many_bucket_members():
+    # Reports that only differ in their number crowd the same LSH buckets.
+    entries = [(f"{WORDS} {n}", f"https://news.test/{n}") for n in range(1, 31)]
+    entries.append((f"{WORDS} 30", "https://mirror.test/30"))
+    kept, collapsed = collapsed_titles(entries)
+    assert collapsed == 1
+    assert (f"{WORDS} 30", 2) in kept
@@ -0,0 +1,60 @@
+from array import array
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+BASE = 1_700_000_000
+
+
+@pytest.fixture
+def news(monkeypatch):
+    # Newest first; Item 7 and Item 8 share a timestamp.
+    offsets = [30, 29, 28, 27, 26, 25, 24, 23, 23, 22, 21, 20]
+    items = [{"title": f"Item {i}", "link": f"https://news.test/{i}"} for i in range(len(offsets))]
+    keys = array("d", (-(BASE + offset) for offset in offsets))
+    monkeypatch.setitem(api.news_cache, "data", items)
+    monkeypatch.setitem(api.news_cache, "time_index", {"all": (keys, array("I", range(len(items)))), "sources": {}})
+    return TestClient(api.app)
+
+
+def poll(client, since, limit):
+    return client.get("/news", params={"since": since, "limit": limit}).json()
+
+
+def test_polling_next_since_returns_every_item_once(news):
+    seen = []
+    since = str(BASE)
+    while True:
+        page = poll(news, since, 3)
+        seen.extend(item["title"] for item in reversed(page["data"]))
+        if not page["has_more"]:
+            break
+        since = page["next_since"]
+    assert seen == [f"Item {i}" for i in range(11, -1, -1)]
+
+
+def test_truncated_page_holds_the_oldest_items_after_since(news):
+    page = poll(news, str(BASE + 20), 4)
+    assert page["total_records"] == 11
+    assert page["has_more"] is True
+    assert [item["title"] for item in page["data"]] == ["Item 7", "Item 8", "Item 9", "Item 10"]
+    assert page["next_since"] == "2023-11-14T22:13:43+00:00"
+
+
+def test_items_sharing_a_timestamp_are_not_split(news):
+    # limit=3 would return Item 8 without Item 7; the page stops below both.
+    page = poll(news, str(BASE + 20), 3)
+    assert [item["title"] for item in page["data"]] == ["Item 9", "Item 10"]
+    # A page made of one timestamp is returned whole.
+    page = poll(news, str(BASE + 22), 1)
+    assert [item["title"] for item in page["data"]] == ["Item 7", "Item 8"]
+
+
+def test_limit_without_since_reports_cut_off_items(news):
+    page = news.get("/news", params={"limit": 5}).json()
+    assert [item["title"] for item in page["data"]] == [f"Item {i}" for i in range(5)]
+    assert page["total_records"] == 12
+    assert page["has_more"] is True
+    assert news.get("/news", params={"limit": 12}).json()["has_more"] is False
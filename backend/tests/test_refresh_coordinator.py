@@ -0,0 +1,18 @@
+import asyncio
+
+import api
+from conftest import write_json
+
+
+def test_failed_refresh_is_reported_until_the_next_success(data_dir):
+    leaks_file = data_dir / "data" / "external_feed" / "leak.json"
+    leaks_file.write_text("[{\"name\": ", encoding="utf-8")
+    asyncio.run(api.refresh_coordinator.refresh("leaks"))
+    status = api.refresh_coordinator.status["leaks"]
+    assert status["state"] == "idle"
+    assert status["last_error"]
+
+    write_json(leaks_file, [{"name": "Leak", "domain": "leak.test", "leak_count": 1}])
+    asyncio.run(api.refresh_coordinator.refresh("leaks"))
+    assert status["last_error"] is None
+    assert api.leaks_cache["total_records"] == 1
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+DATE_KEYS = ["2024-03-01", "2024-02-01", "2024-02-01", "2023-12-31", "", ""]
+
+
+@pytest.mark.parametrize("date_from, date_to, expected", [
+    (None, "2100-01-01", (0, 4)),
+    (None, "2024-02-01", (1, 4)),
+    ("2024-02-01", None, (0, 3)),
+    ("2024-01-01", "2024-02-15", (1, 3)),
+    ("2025-01-01", None, (0, 0)),
+])
+def test_date_range_excludes_undated_records(date_from, date_to, expected):
+    assert api.rekt_date_range(DATE_KEYS, date_from, date_to) == expected
+
+
+RECORDS = [
+    {"project_name": "A", "funds_lost": 500, "date": "2024-03-02", "chain": "Ethereum", "scam_type": "Exploit"},
+    {"project_name": "B", "funds_lost": 1500, "date": "2024-03-20", "chain": "BSC", "root_cause": "Oracle"},
+    {"project_name": "C", "funds_lost": 200, "date": "2023-11-05", "chain": "Ethereum", "scam_type": "Rugpull"},
+    {"project_name": "D", "funds_lost": None, "date": "", "chain": "Ethereum"},
+    {"project_name": "E", "funds_lost": True, "date": "2023-01-01"},
+]
+
+
+def test_stats_group_losses_and_skip_non_numeric_amounts():
+    stats = api.build_rekt_stats(RECORDS)
+    assert stats["total"] == {"funds_lost": 2200, "count": 5, "with_amount": 3}
+    assert stats["by_chain"] == [
+        {"key": "BSC", "funds_lost": 1500, "count": 1},
+        {"key": "Ethereum", "funds_lost": 700, "count": 3},
+        {"key": "unknown", "funds_lost": 0, "count": 1},
+    ]
+    assert [(row["key"], row["count"]) for row in stats["by_year"]] == [("2023", 2), ("2024", 2), ("unknown", 1)]
+    assert stats["monthly"] == [
+        {"month": "2023-01", "funds_lost": 0, "count": 1},
+        {"month": "2023-11", "funds_lost": 200, "count": 1},
+        {"month": "2024-03", "funds_lost": 2000, "count": 2},
+    ]
+    assert [row["project_name"] for row in stats["top_projects"]] == ["B", "A", "C"]
+
+
+def test_stats_endpoint_limits_top_projects(monkeypatch):
+    monkeypatch.setitem(api.rekt_cache, "stats", api.build_rekt_stats(RECORDS))
+    client = TestClient(api.app)
+    body = client.get("/web3-threats/stats", params={"top": 1}).json()
+    assert [row["project_name"] for row in body["top_projects"]] == ["B"]
+    assert body["by_root_cause"][0] == {"key": "Oracle", "funds_lost": 1500, "count": 1}
+    assert client.get("/web3-threats/stats", params={"top": 101}).status_code == 400
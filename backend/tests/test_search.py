@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from conftest import make_cve, write_json
+
+
+def search_ids(q):
+    response = TestClient(api.app).get("/search/all", params={"q": q, "feeds": "cves", "limit": 50})
+    return {hit["cve_id"] for hit in response.json()["results"]}
+
+
+@pytest.fixture
+def year_file(data_dir, monkeypatch):
+    monkeypatch.setattr(api, "LOW_MEMORY_MODE", True)
+    path = data_dir / "data" / "external_feed" / "cve" / "2016.json"
+    write_json(path, [make_cve(n) for n in range(5)])
+    asyncio.run(api.refresh_cve_data())
+    return path
+
+
+def test_refresh_keeps_index_of_unchanged_year(year_file, monkeypatch):
+    index = api.search_indexes["cves/2016"]
+    monkeypatch.setattr(api, "read_cve_year_file", lambda path: pytest.fail("unchanged year was re-read"))
+    asyncio.run(api.refresh_cve_data())
+    assert api.search_indexes["cves/2016"] is index
+
+
+def test_sync_updates_index_in_place(year_file, upstream):
+    # The first sync has no snapshot to diff against; it records one.
+    upstream["items"] = [make_cve(n) for n in range(5)]
+    assert api.sync_cve_year_file(2016, force=True)
+    index = api.search_indexes["cves/2016"]
+    upstream["items"] = [make_cve(n) for n in range(1, 5)] + [
+        make_cve(2, modified="2025-06-01T00:00Z", score=9.8),
+        make_cve(7),
+    ]
+    del upstream["items"][1]
+    assert api.sync_cve_year_file(2016, force=True)
+
+    assert api.search_indexes["cves/2016"] is index
+    assert index["count"] == 5
+    assert search_ids("vulnerability") == {make_cve(n)["cve_id"] for n in (1, 2, 3, 4, 7)}
+    hits = TestClient(api.app).get("/search/all", params={"q": make_cve(2)["cve_id"], "feeds": "cves"}).json()
+    assert [hit["score"] for hit in hits["results"]] == [9.8]
+
+
+def test_trailing_stopword_ends_the_prefix(year_file):
+    # "vuln" is a complete word once followed by "the", so it does not match "vulnerability".
+    assert search_ids("example vuln the") == set()
+    assert search_ids("example vuln") == {make_cve(n)["cve_id"] for n in range(5)}
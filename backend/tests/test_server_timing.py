@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+LEAKS = [{"name": f"Leak {i}", "leak_count": i} for i in range(5)]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(api.leaks_cache, "data", LEAKS)
+    monkeypatch.setitem(api.leaks_cache, "last_updated", None)
+    monkeypatch.setitem(api.leaks_cache, "sort_orders", api.build_sort_orders(LEAKS, api.LEAKS_SORT_FIELDS))
+    return TestClient(api.app)
+
+
+def spans(response):
+    header = response.headers["server-timing"]
+    return {name: float(dur[len("dur="):]) for name, dur in (part.split(";") for part in header.split(", "))}
+
+
+def test_header_splits_endpoint_serialization_and_inner_spans(client):
+    timings = spans(client.get("/leaks", params={"sort": "-leak_count"}))
+    assert set(timings) == {"paginate", "endpoint", "serialize", "total"}
+    assert timings["paginate"] <= timings["endpoint"] <= timings["total"]
+
+
+def test_spans_are_logged_per_request(client, monkeypatch, tmp_path):
+    logged = []
+    monkeypatch.setattr(api, "TRACE_LOG_PATH", str(tmp_path / "trace.log"))
+    monkeypatch.setattr(api.trace_logger, "info", logged.append)
+    client.get("/leaks", params={"page_size": 2})
+    client.get("/leaks", params={"page_size": 2})
+
+    first, second = (json.loads(line) for line in logged)
+    assert first["kind"] == "request" and first["name"] == "/leaks"
+    assert second["spans"]["paginate"]["calls"] == 1
+
+
+def test_spans_outside_a_request_are_ignored():
+    with api.trace_span("orphan") as span:
+        pass
+    assert span.trace is None
+
+
+def test_tracing_can_be_turned_off(client, monkeypatch):
+    monkeypatch.setattr(api, "TRACE_ENABLED", False)
+    assert "server-timing" not in client.get("/leaks", params={"page_size": 2}).headers
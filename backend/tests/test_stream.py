@@ -0,0 +1,85 @@
+import asyncio
+import json
+from collections import deque
+
+import pytest
+from fastapi import HTTPException
+
+import api
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    monkeypatch.setitem(api.stream_state, "last_id", 0)
+    monkeypatch.setitem(api.stream_state, "floor", 0)
+    monkeypatch.setitem(api.stream_state, "ring", deque(maxlen=3))
+    monkeypatch.setitem(api.stream_state, "clients", set())
+    return api.stream_state
+
+
+async def open_stream(feeds=None, last_event_id=None):
+    response = await api.stream_feed_events(None, feeds=feeds, last_event_id=last_event_id)
+    return response.body_iterator
+
+
+async def read(events, count):
+    return [await events.__anext__() for _ in range(count)]
+
+
+def reconnect(last_event_id, count):
+    async def replay():
+        return await read(await open_stream(last_event_id=last_event_id), count)
+    return asyncio.run(replay())
+
+
+def event_ids(chunks):
+    return [int(chunk.split(b"\n", 1)[0][len(b"id: "):]) for chunk in chunks if chunk.startswith(b"id: ")]
+
+
+def test_reconnect_replays_events_after_last_event_id(stream):
+    for version in range(3):
+        api.publish_stream_event("news", version, [f"https://news.test/{version}"])
+    first_id = stream["ring"][0][0]
+
+    chunks = reconnect(str(first_id), 3)
+    assert chunks[0] == b"retry: 5000\n\n"
+    assert event_ids(chunks) == [first_id + 1, first_id + 2]
+    data = json.loads(chunks[1].split(b"data: ", 1)[1])
+    assert data == {"feed": "news", "version": 1, "new_records": 1, "keys": ["https://news.test/1"]}
+
+
+def test_live_events_respect_the_feed_filter(stream):
+    async def listen():
+        events = await open_stream(feeds="cves")
+        await read(events, 1)
+        client, = stream["clients"]
+        api.publish_stream_event("news", 1, ["a"])
+        api.publish_stream_event("cves", 2, ["CVE-2016-00001"])
+        assert client.queue.qsize() == 1
+        assert b"event: cves" in (await read(events, 1))[0]
+        await events.aclose()
+    asyncio.run(listen())
+    assert stream["clients"] == set()
+
+
+def test_evicted_events_ask_the_client_to_resync(stream):
+    for version in range(5):
+        api.publish_stream_event("news", version, ["a"])
+    chunks = reconnect("1", 5)
+    assert chunks[1] == b"event: resync\ndata: {}\n\n"
+    assert len(event_ids(chunks)) == 3
+
+
+def test_a_full_queue_disconnects_the_client(stream, monkeypatch):
+    monkeypatch.setattr(api, "STREAM_CLIENT_QUEUE_SIZE", 1)
+    client = api.StreamClient(None)
+    client.offer("news", b"one")
+    client.offer("news", b"two")
+    assert client.overflowed and client.queue.qsize() == 1
+
+
+def test_unknown_feeds_and_bad_event_ids_are_rejected(stream):
+    for kwargs in ({"feeds": "news,nope"}, {"last_event_id": "abc"}):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(open_stream(**kwargs))
+        assert error.value.status_code == 400